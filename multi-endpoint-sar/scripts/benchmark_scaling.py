@@ -0,0 +1,200 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import scipy
+
+from replicaset import Endpoint, ReplicaSetBuilder
+from replicaset.expr import PROFILE as EXPR_PROFILE
+from replicaset.gspn import GSPNSteadyState, peak_rss_mb
+from replicaset.solvers import METHODS, SolverOptions
+from replicaset.sweep import SweepPoint
+
+# A e B sono gli endpoint di ReplicaSetAnalysis, C e D estendono il benchmark fino a 4 endpoint
+BENCHMARK_ENDPOINTS = [
+    Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.),
+    Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.),
+    Endpoint("C", 20. / 10., 40. / 10., 5. / 100., 5. / 100.),
+    Endpoint("D", 80. / 10., 20. / 10., 2. / 100., 2. / 100.),
+]
+
+DEFAULT_BASELINE = Path(__file__).parent / "benchmarks" / "baseline.json"
+
+# metriche confrontate con la baseline: tempi e memoria possono peggiorare al più di --tolerance
+TIMED_METRICS = ("exploration_s", "solve_s", "reward_s", "peak_rss_mb")
+EXACT_METRICS = ("tangible", "vanishing", "nonzeros")
+
+
+def parse_range(spec):
+    """'1,2,4' -> [1, 2, 4]; '1:8' -> [1, ..., 8]"""
+    try:
+        if ":" in spec:
+            first, last = spec.split(":")
+            return list(range(int(first), int(last) + 1))
+        return [int(v) for v in spec.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Valori non validi: '{spec}' (usare '1,2,4' o 'first:last')")
+
+
+def benchmark_point(point, on_the_fly, solver, repeat):
+    """Risolve un punto ``repeat`` volte misurando esplorazione, soluzione e calcolo
+    dei reward; per ogni fase si tiene il tempo minimo"""
+    timings = []
+    EXPR_PROFILE.reset()
+    for _ in range(repeat):
+        model = point.build()
+        analysis = GSPNSteadyState(on_the_fly=on_the_fly, solver=solver)
+        start = time.perf_counter()
+        model.analyze(analysis)
+        elapsed = time.perf_counter() - start
+        stats = analysis.state_space.stats
+        timings.append((stats.seconds, stats.solve.seconds, elapsed - stats.seconds - stats.solve.seconds))
+    exploration, solve, reward = (min(t) for t in zip(*timings))
+    return {
+        "endpoints": len(point.endpoints),
+        "replicas": point.num_of_replicas,
+        "tangible": stats.tangible,
+        "vanishing": stats.vanishing,
+        "nonzeros": stats.nonzeros,
+        "exploration_s": exploration,
+        "solve_s": solve,
+        "reward_s": reward,
+        "peak_rss_mb": peak_rss_mb(),
+        "iterations": stats.solve.iterations,
+        "residual": stats.solve.residual,
+        "fallback": stats.solve.fallback,
+        # valutazioni delle espressioni di tasso/reward per ripetizione
+        "scalar_evaluations": EXPR_PROFILE.scalar_calls // repeat,
+        "vector_evaluations": EXPR_PROFILE.vector_calls // repeat,
+        "vector_rows": EXPR_PROFILE.vector_rows // repeat,
+    }
+
+
+def run_benchmark(builder, endpoint_counts, replica_counts, on_the_fly, solver, max_states, time_budget, repeat):
+    """Ogni punto gira in un processo nuovo, così il picco di RSS è solo il suo.
+    Per ogni numero di endpoint ci si ferma al primo punto che supera ``time_budget``."""
+    results = []
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+        for num_endpoints in endpoint_counts:
+            over_budget = False
+            for replicas in replica_counts:
+                point = replace(SweepPoint.of(builder, *BENCHMARK_ENDPOINTS[:num_endpoints]),
+                                num_of_replicas=replicas)
+                if over_budget or point.estimated_size() > max_states:
+                    results.append({"endpoints": num_endpoints, "replicas": replicas, "skipped": True})
+                    continue
+                result = executor.submit(benchmark_point, point, on_the_fly, solver, repeat).result()
+                print(f"{num_endpoints} endpoint, {replicas:2d} repliche: {result['tangible']} tangibili, "
+                      f"{result['vanishing']} vanishing, {result['nonzeros']} nonzeri, "
+                      f"esplorazione {result['exploration_s']:.3f} s, soluzione {result['solve_s']:.3f} s, "
+                      f"reward {result['reward_s']:.3f} s, RSS {result['peak_rss_mb']:.1f} MiB, "
+                      f"{result['iterations']} iterazioni, residuo {result['residual']:.1e}")
+                results.append(result)
+                total = result["exploration_s"] + result["solve_s"] + result["reward_s"]
+                over_budget = total > time_budget
+    return results
+
+
+def environment():
+    return {"python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__,
+            "platform": platform.platform(), "processor": platform.processor()}
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """Righe del confronto con la baseline e numero di regressioni"""
+    reference = {(r["endpoints"], r["replicas"]): r for r in baseline["results"] if not r.get("skipped")}
+    lines, regressions = [], 0
+    for result in results:
+        old = reference.get((result["endpoints"], result["replicas"]))
+        if result.get("skipped") or old is None:
+            continue
+        problems = [f"{m} {old[m]} -> {result[m]}" for m in EXACT_METRICS if old[m] != result[m]]
+        changes = []
+        for metric in TIMED_METRICS:
+            ratio = result[metric] / old[metric] if old[metric] else 1.
+            changes.append(f"{metric} x{ratio:.2f}")
+            # su differenze piccole domina il rumore di misura
+            if ratio > tolerance and result[metric] - old[metric] > min_delta:
+                problems.append(f"{metric} {old[metric]:.3f} -> {result[metric]:.3f}")
+        status = "REGRESSIONE" if problems else "ok"
+        regressions += bool(problems)
+        lines.append(f"{result['endpoints']} endpoint, {result['replicas']:2d} repliche: {status:11s} "
+                     + ", ".join(problems or changes))
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark di dimensione dello spazio degli stati, tempi e memoria "
+                    "al variare di repliche ed endpoint")
+    parser.add_argument("--replicas", type=parse_range, default=parse_range("1:64"),
+                        help="Numeri di repliche: lista '1,2,4' oppure intervallo 'first:last' (default: 1:64)")
+    parser.add_argument("--endpoints", type=parse_range, default=parse_range("1:4"),
+                        help="Numeri di endpoint tra 1 e 4 (default: 1:4)")
+    parser.add_argument("--on-the-fly", action="store_true",
+                        help="Elimina le marcature vanishing durante l'esplorazione senza memorizzarle")
+    parser.add_argument("--solver", choices=METHODS, default="lu",
+                        help="Metodo per la soluzione stazionaria (default: lu)")
+    parser.add_argument("--max-states", type=float, default=1e6,
+                        help="Salta i punti con stima dello spazio degli stati oltre questa soglia (default: 1e6)")
+    parser.add_argument("--time-budget", type=float, default=10.,
+                        help="Secondi per punto oltre i quali non si provano più repliche (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Ripetizioni per punto, si tiene il tempo minimo di ogni fase (default: 3)")
+    parser.add_argument("--output-dir", default="experiment-results", help="Cartella dei risultati")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help=f"Baseline con cui confrontare i risultati (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="Rapporto massimo ammesso su tempi e memoria rispetto alla baseline (default: 1.25)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="Differenza minima (s o MiB) per segnalare una regressione (default: 0.05)")
+    parser.add_argument("--update-baseline", action="store_true", help="Salva i risultati come nuova baseline")
+    args = parser.parse_args()
+
+    if not all(1 <= n <= len(BENCHMARK_ENDPOINTS) for n in args.endpoints):
+        parser.error(f"--endpoints deve essere tra 1 e {len(BENCHMARK_ENDPOINTS)}")
+
+    builder = ReplicaSetBuilder(repair_rate=10, rejuvenation_rate=10,
+                                false_positive_prob=25. / 100., false_negative_prob=25. / 100.)
+    results = run_benchmark(builder, args.endpoints, args.replicas, args.on_the_fly, SolverOptions(args.solver),
+                            args.max_states, args.time_budget, args.repeat)
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "on_the_fly": args.on_the_fly,
+              "solver": args.solver, "repeat": args.repeat,
+              "environment": environment(), "results": results}
+
+    path = Path(args.output_dir) / f"benchmark-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    print(f"Risultati salvati in: {path}")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline aggiornata: {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"Nessuna baseline in {args.baseline} (usare --update-baseline)")
+        return
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("on_the_fly") != args.on_the_fly:
+        print("Attenzione: la baseline è stata misurata con un'esplorazione diversa (--on-the-fly)")
+    if baseline.get("solver", "lu") != args.solver:
+        print(f"Attenzione: la baseline è stata misurata con il solver {baseline.get('solver', 'lu')}")
+    lines, regressions = compare(results, baseline, args.tolerance, args.min_delta)
+    print(f"Confronto con {args.baseline}:")
+    for line in lines:
+        print("  " + line)
+    if regressions:
+        print(f"{regressions} punti in regressione")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
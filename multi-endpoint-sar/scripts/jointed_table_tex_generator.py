@@ -7,6 +7,8 @@ import sys
 import os
 from pathlib import Path
 import logging
+from sarresults.io import load_results
+from sarresults.pairs import configuration_pairs, index_results, joined_configurations, pair_records
 
 def setup_logging(verbose=False):
     """Setup logging configuration"""
@@ -27,8 +29,8 @@ def validate_csv_data(df, logger):
     if missing_columns:
         raise ValueError(f"CSV mancante delle colonne richieste: {missing_columns}")
     
-    # Check for valid endpoints
-    valid_endpoints = {'A', 'B'}
+    # Check for valid endpoints: those named by the configurations
+    valid_endpoints = {e for config in df['Configuration'].unique() for e in str(config).split('+')}
     actual_endpoints = set(df['Endpoint'].unique())
     if not actual_endpoints.issubset(valid_endpoints):
         logger.warning(f"Endpoint non standard trovati: {actual_endpoints - valid_endpoints}")
@@ -47,43 +49,29 @@ def validate_csv_data(df, logger):
     return True
 
 def find_configuration_pairs(df, target_pool_size=None, logger=None):
-    """Find configuration pairs based on pool size matching"""
+    """Find configuration pairs based on pool size matching
+
+    For every joined configuration of two endpoints (e.g. A+B), the rows of
+    the first endpoint alone are joined with those of the second alone whose
+    pool sizes add up to ``target_pool_size`` (by default the pool size of the
+    joined configuration) in one indexed lookup. Each pair is filed under the
+    configuration of its first endpoint.
+    """
+    indexed = index_results(df)
     pairs = []
-    configurations = df['Configuration'].unique()
-    
-    for config in configurations:
-        if config == 'A+B':
-            continue
-            
-        config_data = df[df['Configuration'] == config]
-        endpoint_a_data = config_data[config_data['Endpoint'] == 'A']
-        endpoint_b_data = config_data[config_data['Endpoint'] == 'B']
-        
-        # If target_pool_size is not specified, try to infer it from A+B configuration
-        if target_pool_size is None:
-            ab_config = df[df['Configuration'] == 'A+B']
-            if not ab_config.empty:
-                target_pool_size = ab_config['Pool Size'].iloc[0] * 2  # Assuming A+B has same pool size for both
-            else:
-                # Default fallback
-                target_pool_size = 10
-        
-        for _, a_row in endpoint_a_data.iterrows():
-            target_b_pool_size = target_pool_size - a_row['Pool Size']
-            b_match = endpoint_b_data[endpoint_b_data['Pool Size'] == target_b_pool_size]
-            
-            if not b_match.empty:
-                b_row = b_match.iloc[0]
-                pair_name = f"A{a_row['Pool Size']}B{b_row['Pool Size']}"
-                pairs.append({
-                    'config': config,
-                    'pair_name': pair_name,
-                    'a_data': a_row,
-                    'b_data': b_row
-                })
-                if logger:
-                    logger.debug(f"Trovata coppia: {pair_name}")
-    
+    for joined in joined_configurations(indexed):
+        first, second = joined.split('+')
+        records = pair_records(configuration_pairs(indexed, joined, target_pool_size, include_joined=False), joined)
+        for record in records:
+            pairs.append({
+                'config': first,
+                'pair_name': record['name'],
+                'a_data': record[first],
+                'b_data': record[second]
+            })
+            if logger:
+                logger.debug(f"Trovata coppia: {record['name']}")
+
     return pairs
 
 def create_reliability_plot(csv_file_path, output_path=None, figure_size=(12, 8), 
@@ -112,7 +100,7 @@ def create_reliability_plot(csv_file_path, output_path=None, figure_size=(12, 8)
     try:
         # Load data
         logger.info(f"Caricamento dati da: {csv_file_path}")
-        df = pd.read_csv(csv_file_path)
+        df = load_results(csv_file_path)
         logger.info(f"Dataset caricato: {len(df)} righe")
         
         # Validate data
@@ -136,23 +124,29 @@ def create_reliability_plot(csv_file_path, output_path=None, figure_size=(12, 8)
         logger.info(f"Configurazioni trovate: {list(configurations)}")
         
         plotted_configs = []
+
+        # AxBy pairs over the whole dataset, found once and grouped by configuration
+        pairs_by_config = {}
+        for pair in find_configuration_pairs(df, target_pool_size, logger):
+            pairs_by_config.setdefault(pair['config'], []).append(pair)
         
         for config in configurations:
             config_data = df[df['Configuration'] == config].copy()
             color = next(colors)
             marker = next(markers)
             
-            if config == 'A+B':
-                # For A+B, simply connect A and B
-                endpoint_a = config_data[config_data['Endpoint'] == 'A']
-                endpoint_b = config_data[config_data['Endpoint'] == 'B']
+            if len(str(config).split('+')) == 2:
+                # For a joined configuration (e.g. A+B), simply connect its two endpoints
+                first, second = str(config).split('+')
+                endpoint_a = config_data[config_data['Endpoint'] == first]
+                endpoint_b = config_data[config_data['Endpoint'] == second]
                 
                 if not endpoint_a.empty and not endpoint_b.empty:
                     # Plot points
                     plt.scatter(endpoint_a['Unreliability'], endpoint_a['Unavailability'], 
-                               color=color, marker=marker, s=100, label=f'{config} - A', alpha=0.8)
+                               color=color, marker=marker, s=100, label=f'{config} - {first}', alpha=0.8)
                     plt.scatter(endpoint_b['Unreliability'], endpoint_b['Unavailability'], 
-                               color=color, marker=marker, s=100, label=f'{config} - B', 
+                               color=color, marker=marker, s=100, label=f'{config} - {second}', 
                                alpha=0.8, facecolors='none', edgecolors=color, linewidth=2)
                     
                     # Connection line
@@ -161,12 +155,11 @@ def create_reliability_plot(csv_file_path, output_path=None, figure_size=(12, 8)
                             color=color, alpha=0.6, linestyle='-', linewidth=2)
                     
                     plotted_configs.append(config)
-                    logger.debug(f"Plottata configurazione A+B")
+                    logger.debug(f"Plottata configurazione {config}")
             
             else:
                 # For other configurations, pair A and B based on total pool size
-                pairs = find_configuration_pairs(df[df['Configuration'] == config], 
-                                               target_pool_size, logger)
+                pairs = pairs_by_config.get(config, [])
                 
                 config_plotted = False
                 for pair in pairs:
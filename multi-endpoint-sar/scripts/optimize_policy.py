@@ -0,0 +1,91 @@
+import argparse
+import os
+import time
+
+from replica_set_analysis import create_experiment_path, save_endpoint_info
+from replicaset import Endpoint
+from replicaset.optimize import DEFAULT_BOUNDS, METRICS, PARAMETERS, Objective, PolicyOptimizer
+from sarresults.io import POLICY_SCHEMA, ResultSink
+
+
+def parse_assignment(text):
+    name, _, value = text.partition("=")
+    if not value:
+        raise argparse.ArgumentTypeError(f"Atteso NOME=VALORE: {text}")
+    return name.strip(), value.strip()
+
+
+def parse_bounds(text):
+    name, value = parse_assignment(text)
+    low, _, high = value.partition(":")
+    try:
+        return name, (float(low), float(high))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Intervallo non valido: '{text}' (usare NOME=MIN:MAX)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ricerca della politica di ringiovanimento (repair, rejuvenation, falsi positivi/negativi) "
+                    "che minimizza un obiettivo pesato su un unico spazio degli stati")
+    parser.add_argument("--replicas", type=int, default=6, help="Numero totale di repliche (default: 6)")
+    parser.add_argument("--weight", type=parse_assignment, action="append", default=[], metavar="METRICA=PESO",
+                        help=f"Peso di una metrica nell'obiettivo ({', '.join(METRICS)}; "
+                             "default: unreliability=1 e unavailability=1)")
+    parser.add_argument("--max", type=parse_assignment, action="append", default=[], metavar="METRICA=VALORE",
+                        help="Vincolo: valore massimo di una metrica (es. resource_usage=3)")
+    parser.add_argument("--bounds", type=parse_bounds, action="append", default=[], metavar="PARAMETRO=MIN:MAX",
+                        help=f"Intervallo di un parametro ({', '.join(PARAMETERS)}; default: "
+                             + ", ".join(f"{n}={lo:g}:{hi:g}" for n, (lo, hi) in DEFAULT_BOUNDS.items()) + ")")
+    parser.add_argument("--candidates", type=int, default=16,
+                        help="Politiche iniziali (ipercubo latino) valutate in parallelo (default: 16)")
+    parser.add_argument("--refine", type=int, default=4,
+                        help="Migliori candidati raffinati con SLSQP e sensitività esatte (default: 4)")
+    parser.add_argument("--maxiter", type=int, default=50, help="Iterazioni massime di ogni raffinamento (default: 50)")
+    parser.add_argument("--seed", type=int, default=0, help="Seme dell'ipercubo latino (default: 0)")
+    parser.add_argument("--lumping", action="store_true",
+                        help="Aggrega gli endpoint con parametri identici (lumping esatto)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Processi usati per valutare i candidati (default: tutti i core)")
+    parser.add_argument("--graph-dir",
+                        help="Cartella in cui salvare e riusare il grafo di raggiungibilità esplorato")
+    parser.add_argument("--output-dir", default="experiment-results", help="Cartella dei risultati")
+    parser.add_argument("--format", choices=["csv", "ndjson", "parquet", "arrow"], default="csv",
+                        help="Formato del file dei risultati (default: csv)")
+    args = parser.parse_args()
+
+    try:
+        objective = Objective({m: float(w) for m, w in args.weight} or None, {m: float(v) for m, v in args.max})
+        endpoint_a = Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.)
+        endpoint_b = Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.)
+        optimizer = PolicyOptimizer([endpoint_a, endpoint_b], args.replicas, objective, dict(args.bounds),
+                                    lumping=args.lumping, workers=args.workers, graph_dir=args.graph_dir)
+    except ValueError as e:
+        parser.error(str(e))
+
+    experiment_path = create_experiment_path(args.output_dir)
+    save_endpoint_info(experiment_path, endpoint_a, endpoint_b)
+    start = time.perf_counter()
+    result = optimizer.optimize(args.candidates, args.refine, args.maxiter, args.seed)
+    print(f"Politiche valutate: {len(result.evaluations)} in {time.perf_counter() - start:.2f} s, "
+          f"fronte di Pareto: {len(result.front)}")
+
+    front = {id(e) for e in result.front}
+    result_file = experiment_path / f"policyResults.{args.format}"
+    parameters = {"totalNumberOfReplicas": args.replicas, "weights": objective.weights,
+                  "constraints": objective.constraints, "bounds": optimizer.bounds,
+                  "endpoints": [str(endpoint_a), str(endpoint_b)]}
+    with ResultSink(result_file, POLICY_SCHEMA, parameters) as sink:
+        for e in result.evaluations:
+            sink.add_row([e.parameters[name] for name in PARAMETERS]
+                         + [e[metric] for metric in METRICS]
+                         + [objective.value(e), int(objective.feasible(e)), int(id(e) in front)])
+    if result.best is None:
+        print("Nessuna politica rispetta i vincoli")
+    else:
+        print(f"Migliore: {result.best} (obiettivo {objective.value(result.best):.6g})")
+    print(f"Risultati salvati in: {result_file}")
+
+
+if __name__ == "__main__":
+    main()
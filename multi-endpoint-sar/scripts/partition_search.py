@@ -0,0 +1,83 @@
+import argparse
+import os
+import time
+from pathlib import Path
+
+from replica_set_analysis import analysis_parameters, create_experiment_path, report, save_endpoint_info
+from replicaset import Endpoint, ReplicaSetBuilder
+from replicaset.cache import ResultCache
+from replicaset.partition import PartitionSearch
+from replicaset.solvers import METHODS, SolverOptions
+from sarresults.io import PARTITION_SCHEMA, ResultSink
+
+
+def parse_endpoint(text):
+    """'C:3:4:0.05:0.05' -> Endpoint(id, arrival rate, service rate, healthy->aged, aged->failed)"""
+    try:
+        endpoint_id, *values = text.split(":")
+        return Endpoint(endpoint_id, *(float(v) for v in values))
+    except (TypeError, ValueError):
+        raise argparse.ArgumentTypeError(
+            f"Endpoint non valido: '{text}' (usare ID:arrivalRate:serviceRate:healthyToAged:agedToFailed)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ripartizioni Pareto-ottime delle repliche tra replica set condivisi o dedicati agli endpoint")
+    parser.add_argument("--replicas", type=int, default=6, help="Numero totale di repliche (default: 6)")
+    parser.add_argument("--endpoint", type=parse_endpoint, action="append", default=[],
+                        metavar="ID:ARRIVAL:SERVICE:H2A:A2F",
+                        help="Endpoint da distribuire (ripetibile; default: A e B di ReplicaSetAnalysis)")
+    parser.add_argument("--max-group", type=int,
+                        help="Massimo numero di endpoint che condividono un replica set (default: tutti)")
+    parser.add_argument("--output-dir", default="experiment-results", help="Cartella dei risultati")
+    parser.add_argument("--lumping", action="store_true",
+                        help="Aggrega gli endpoint con parametri identici (lumping esatto)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Processi usati per risolvere le configurazioni (default: tutti i core)")
+    parser.add_argument("--cache-dir", help="Cache dei risultati (default: <output-dir>/.cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Risolve tutte le configurazioni")
+    parser.add_argument("--graph-dir",
+                        help="Cartella in cui salvare e riusare i grafi di raggiungibilità esplorati")
+    parser.add_argument("--solver", choices=METHODS, default="lu",
+                        help="Metodo per la soluzione stazionaria (default: lu)")
+    parser.add_argument("--format", choices=["csv", "ndjson", "parquet", "arrow"], default="csv",
+                        help="Formato del file dei risultati (default: csv)")
+    args = parser.parse_args()
+
+    endpoints = args.endpoint or [Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.),
+                                  Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.)]
+    if len({e.id for e in endpoints}) != len(endpoints):
+        parser.error("Gli identificativi degli endpoint devono essere distinti")
+
+    experiment_path = create_experiment_path(args.output_dir)
+    save_endpoint_info(experiment_path, *endpoints)
+    builder = ReplicaSetBuilder(repair_rate=10, rejuvenation_rate=10,
+                                false_positive_prob=25. / 100., false_negative_prob=25. / 100.)
+    cache = None if args.no_cache else ResultCache(args.cache_dir or Path(args.output_dir) / ".cache")
+    search = PartitionSearch(builder, endpoints, args.replicas, max_group=args.max_group, workers=args.workers,
+                             cache=cache, lumping=args.lumping, graph_dir=args.graph_dir,
+                             solver=SolverOptions(args.solver))
+
+    start = time.perf_counter()
+    front = search.search(callback=report)
+    reused = f" ({cache.hits} dalla cache)" if cache is not None else ""
+    print(f"Ripartizioni degli endpoint: {search.partitions}, configurazioni: {len(search.memo)}{reused}, "
+          f"combinazioni scartate perché dominate: {search.pruned}, tempo: {time.perf_counter() - start:.2f} s")
+
+    result_file = experiment_path / f"partitionResults.{args.format}"
+    with ResultSink(result_file, PARTITION_SCHEMA, analysis_parameters(builder, endpoints, args.replicas)) as sink:
+        for deployment in front:
+            print(deployment)
+            for result in deployment.results:
+                loads = "+".join(e.id for e in result.point.endpoints)
+                for e in result.point.endpoints:
+                    sink.add_row((deployment.name, e.id, loads, result.point.num_of_replicas,
+                                  result.reliabilities[e], result.unavailabilities[e],
+                                  result.aging_contributions[e], result.resource_usage,
+                                  deployment.unreliability, deployment.unavailability))
+    print(f"Deployment Pareto-ottimi: {len(front)}, salvati in: {result_file}")
+
+
+if __name__ == "__main__":
+    main()
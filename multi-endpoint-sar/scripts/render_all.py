@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from sarresults.figures import (PARETO, RELIABILITY, RELIABILITY_LOG, TRANSIENT, at_time, reliability_pairs,
+                                render_figure, transient_configuration, workload_spec)
+from sarresults.io import load_results, result_format
+from sarresults.tex import read_rows, render_table, row_line
+
+# cambiare quando cambia il disegno delle figure, per rigenerarle tutte
+RENDER_VERSION = 1
+MANIFEST = ".render.json"
+RESULT_STEMS = ("analysisResults", "workload_reliability", "transientResults", "policyResults")
+
+# una figura per tipo in ogni processo, svuotata e ridisegnata per ogni esperimento
+_figures = {}
+
+
+def result_file(experiment):
+    """File dei risultati di un esperimento (None se non c'è)"""
+    for stem in RESULT_STEMS:
+        for path in sorted(experiment.glob(f"{stem}.*")):
+            try:
+                result_format(path)
+            except ValueError:
+                continue
+            return path
+    return None
+
+
+def input_signature(result_path, formats, table):
+    stat = result_path.stat()
+    return {"version": RENDER_VERSION, "input": result_path.name, "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns, "formats": list(formats), "table": table}
+
+
+def up_to_date(experiment, signature):
+    """Vero se il manifest corrisponde all'input attuale e tutte le uscite esistono ancora"""
+    try:
+        manifest = json.loads((experiment / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return False
+    return (manifest.get("signature") == signature
+            and all((experiment / name).exists() for name in manifest.get("outputs", [])))
+
+
+def write_manifest(experiment, signature, outputs):
+    tmp = experiment / f"{MANIFEST}.tmp"
+    tmp.write_text(json.dumps({"signature": signature, "outputs": outputs}, indent=2))
+    os.replace(tmp, experiment / MANIFEST)
+
+
+def _figure(spec):
+    if spec.name not in _figures:
+        _figures[spec.name] = plt.figure()
+    return _figures[spec.name]
+
+
+def render_experiment(experiment, formats, table=True, force=False):
+    """Tutte le figure (e la tabella) di un esperimento da un'unica lettura dei risultati
+
+    Restituisce (esperimento, file scritti, secondi); i file sono None se era già aggiornato.
+    """
+    start = time.perf_counter()
+    result_path = result_file(experiment)
+    signature = input_signature(result_path, formats, table)
+    if not force and up_to_date(experiment, signature):
+        return experiment, None, time.perf_counter() - start
+
+    df = load_results(result_path)
+    stem = result_path.stem
+    transient = "Time" in df.columns
+    policies = "Pareto" in df.columns
+    if "Arrival Rate" in df.columns:
+        figures = [(workload_spec(df), df)]
+    elif policies:
+        figures = [(PARETO, df)]
+    else:
+        # dei risultati transitori si confrontano le medie sull'intera finestra
+        pairs = reliability_pairs(at_time(df, interval=True) if transient else df)
+        figures = [(RELIABILITY, pairs), (RELIABILITY_LOG, pairs)]
+        if transient:
+            figures.append((TRANSIENT, transient_configuration(df)))
+
+    outputs = []
+    for spec, data in figures:
+        paths = [experiment / spec.output_name(stem, fmt) for fmt in formats]
+        render_figure(spec, data, _figure(spec), paths)
+        outputs += [path.name for path in paths]
+    if table and "Arrival Rate" not in df.columns and not transient and not policies:
+        headers, rows = read_rows(result_path)
+        tex_path = experiment / f"{stem}.tex"
+        tex_path.write_text(render_table(headers, [row_line(row, headers) for row in rows]), encoding="utf-8")
+        outputs.append(tex_path.name)
+    write_manifest(experiment, signature, outputs)
+    return experiment, outputs, time.perf_counter() - start
+
+
+def _render_job(job):
+    """render_experiment che non interrompe il lotto: (esperimento, file, secondi, errore o None)"""
+    start = time.perf_counter()
+    try:
+        return render_experiment(*job) + (None,)
+    except Exception as error:
+        # la figura riusata viene svuotata dal prossimo render_figure
+        return job[0], None, time.perf_counter() - start, f"{type(error).__name__}: {error}"
+
+
+def report(done):
+    """Stampa l'esito di ogni esperimento man mano che termina; restituisce (rigenerati, falliti)"""
+    rendered = failed = 0
+    for experiment, outputs, seconds, error in done:
+        if error is not None:
+            failed += 1
+            print(f"{experiment.name}: ERRORE, {error}")
+        elif outputs is None:
+            print(f"{experiment.name}: aggiornato, saltato")
+        else:
+            rendered += 1
+            print(f"{experiment.name}: {len(outputs)} file in {seconds:.2f} s ({', '.join(outputs)})")
+    return rendered, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rigenera figure e tabelle di tutti gli esperimenti (experiment-results/exp-*) in un solo comando")
+    parser.add_argument("results_dir", nargs="?", default="experiment-results",
+                        help="Cartella con le sottocartelle exp-* (default: experiment-results)")
+    parser.add_argument("--formats", default="pdf,png",
+                        help="Formati delle figure separati da virgola (default: pdf,png)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processi in parallelo, uno per esperimento (default: numero di CPU)")
+    parser.add_argument("--force", action="store_true", help="Rigenera anche gli esperimenti già aggiornati")
+    parser.add_argument("--no-table", action="store_true", help="Non genera le tabelle LaTeX")
+    args = parser.parse_args()
+
+    formats = [fmt.strip().lower() for fmt in args.formats.split(",") if fmt.strip()]
+    results_dir = Path(args.results_dir).expanduser().resolve()
+    experiments = [d for d in sorted(results_dir.glob("exp-*")) if d.is_dir() and result_file(d) is not None]
+    if not experiments:
+        print(f"Nessun esperimento con risultati in: {results_dir}")
+        return 0
+
+    jobs = [(experiment, formats, not args.no_table, args.force) for experiment in experiments]
+    workers = min(args.workers or os.cpu_count() or 1, len(jobs))
+    start = time.perf_counter()
+    if workers == 1:
+        rendered, failed = report(map(_render_job, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered, failed = report(executor.map(_render_job, jobs))
+    print(f"Esperimenti: {len(experiments)}, rigenerati: {rendered}, falliti: {failed}, "
+          f"tempo totale: {time.perf_counter() - start:.2f} s ({workers} processi)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
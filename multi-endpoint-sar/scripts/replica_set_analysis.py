@@ -0,0 +1,134 @@
+import argparse
+import os
+from datetime import datetime
+from pathlib import Path
+
+from replicaset import Endpoint, ReplicaSetBuilder, trace
+from replicaset.cache import ResultCache
+from replicaset.solvers import METHODS, SolverOptions
+from replicaset.sweep import pool_size_sweep, run_sweep
+from sarresults.io import ANALYSIS_SCHEMA, STREAMABLE_FORMATS, ResultSink, result_format
+
+
+def create_experiment_path(base_dir):
+    """Create experiment-results/exp-<timestamp> as the Java analysis does"""
+    path = Path(base_dir) / f"exp-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    path.mkdir(parents=True, exist_ok=True)
+    print(f"Experiment Directory: {path.resolve()}")
+    return path
+
+
+def save_endpoint_info(base_path, *endpoints):
+    with open(base_path / "endpointInfo.csv", "w", encoding="utf-8") as f:
+        f.write(Endpoint.get_attribute_order() + "\n")
+        for endpoint in endpoints:
+            f.write(str(endpoint) + "\n")
+
+
+def result_rows(result):
+    """Rows of a solved sweep point, one per endpoint, in the analysisResults layout"""
+    endpoints = result.point.endpoints
+    loads = "+".join(e.id for e in endpoints)
+    pool_size = result.point.num_of_replicas
+    return [(e.id, loads, pool_size, result.reliabilities[e], result.unavailabilities[e],
+             result.aging_contributions[e], result.resource_usage) for e in endpoints]
+
+
+def analysis_parameters(builder, endpoints, total_number_of_replicas):
+    """Parameters of the analysis, stored as metadata in columnar result files"""
+    return {
+        "totalNumberOfReplicas": total_number_of_replicas,
+        "repairRate": builder.repair_rate,
+        "rejuvenationRate": builder.rejuvenation_rate,
+        "falsePositiveProb": builder.false_positive_prob,
+        "falseNegativeProb": builder.false_negative_prob,
+        "endpoints": [str(e) for e in endpoints],
+    }
+
+
+def report(result):
+    loads = "+".join(e.id for e in result.point.endpoints)
+    stats = "cache" if result.stats is None else result.stats
+    print(f"Replica set {loads} ({result.point.num_of_replicas} repliche): {stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replica set analysis (Python port of ReplicaSetAnalysis)")
+    parser.add_argument("--replicas", type=int, default=8, help="Numero totale di repliche (default: 8)")
+    parser.add_argument("--output-dir", default="experiment-results", help="Cartella dei risultati")
+    parser.add_argument("--on-the-fly", action="store_true",
+                        help="Elimina le marcature vanishing durante l'esplorazione senza memorizzarle")
+    parser.add_argument("--lumping", action="store_true",
+                        help="Aggrega gli endpoint con parametri identici (lumping esatto)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Processi usati per risolvere le configurazioni (default: tutti i core)")
+    parser.add_argument("--cache-dir", help="Cache dei risultati (default: <output-dir>/.cache)")
+    parser.add_argument("--cache-size-mb", type=float, default=256,
+                        help="Dimensione massima della cache in MB (default: 256)")
+    parser.add_argument("--no-cache", action="store_true", help="Risolve tutte le configurazioni")
+    parser.add_argument("--graph-dir",
+                        help="Cartella in cui salvare e riusare i grafi di raggiungibilità esplorati")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Risolve ogni endpoint per numero crescente di repliche estendendo lo spazio "
+                             "degli stati precedente (non combinabile con --on-the-fly, --lumping e --graph-dir)")
+    parser.add_argument("--solver", choices=METHODS, default="lu",
+                        help="Metodo per la soluzione stazionaria (default: lu)")
+    parser.add_argument("--tol", type=float, default=1e-12,
+                        help="Tolleranza dei metodi iterativi, relativa al massimo exit rate (default: 1e-12)")
+    parser.add_argument("--maxiter", type=int, default=1000,
+                        help="Numero massimo di iterazioni dei metodi iterativi (default: 1000)")
+    parser.add_argument("--omega", type=float, default=1.,
+                        help="Fattore di rilassamento di sor (default: 1, Gauss-Seidel)")
+    parser.add_argument("--format", choices=["csv", "ndjson", "parquet", "arrow"], default="csv",
+                        help="Formato del file dei risultati (default: csv)")
+    parser.add_argument("--trace", nargs="?", const="",
+                        help="Scrive gli eventi di temporizzazione delle fasi (JSON lines, formato Chrome trace) "
+                             "nel file indicato (default: trace.jsonl nella cartella dell'esperimento)")
+    args = parser.parse_args()
+    if args.incremental and (args.on_the_fly or args.lumping or args.graph_dir):
+        parser.error("--incremental non è combinabile con --on-the-fly, --lumping e --graph-dir")
+
+    experiment_path = create_experiment_path(args.output_dir)
+    if args.trace is not None:
+        trace.enable(args.trace or experiment_path / "trace.jsonl")
+    total_number_of_replicas = args.replicas
+
+    endpoint_a = Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.)
+    endpoint_b = Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.)
+    endpoints = [endpoint_a, endpoint_b]
+
+    save_endpoint_info(experiment_path, endpoint_a, endpoint_b)
+
+    builder = ReplicaSetBuilder(repair_rate=10, rejuvenation_rate=10,
+                                false_positive_prob=25. / 100., false_negative_prob=25. / 100.)
+
+    points = pool_size_sweep(builder, endpoints, total_number_of_replicas)
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache_dir or Path(args.output_dir) / ".cache",
+                            max_bytes=int(args.cache_size_mb * 1024 * 1024))
+
+    result_file = experiment_path / f"analysisResults.{args.format}"
+    parameters = analysis_parameters(builder, endpoints, total_number_of_replicas)
+    # line formats are flushed at every row so watch_results.py can follow the run
+    batch_size = 1 if result_format(result_file) in STREAMABLE_FORMATS else 1024
+    with ResultSink(result_file, ANALYSIS_SCHEMA, parameters, batch_size=batch_size) as sink:
+        def write(result):
+            report(result)
+            with trace.span("write", **trace.configuration_labels(result.point.endpoints,
+                                                                    result.point.num_of_replicas)):
+                sink.add_rows(result_rows(result))
+
+        run_sweep(points, workers=args.workers, on_the_fly=args.on_the_fly, callback=write,
+                  cache=cache, lumping=args.lumping, graph_dir=args.graph_dir,
+                  solver=SolverOptions(args.solver, tol=args.tol, maxiter=args.maxiter, omega=args.omega),
+                  incremental=args.incremental)
+    print(f"Risultati salvati in: {result_file}")
+    if trace.TRACER.enabled:
+        print(f"Eventi di temporizzazione in: {trace.TRACER.path} (sar-results trace)")
+    if cache is not None:
+        print(f"Cache: {cache.hits} configurazioni riusate, {cache.misses} risolte")
+
+
+if __name__ == "__main__":
+    main()
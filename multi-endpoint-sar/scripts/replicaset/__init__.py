@@ -0,0 +1,17 @@
+"""In-process steady-state analysis of the multi-endpoint replica-set GSPN.
+
+Python counterpart of the Java classes in ``it.unifi.dinfo.stlab``: the net is
+built as in ``ReplicaSetBuilder`` and solved with sparse linear algebra instead
+of Oris ``GSPNSteadyState``, so no JVM run or CSV round-trip is needed.
+``GSPNTransient`` gives the same rewards over time from the initial marking.
+"""
+from .builder import ReplicaSetBuilder
+from .endpoint import Endpoint
+from .gspn import GSPNSteadyState
+from .model import ReplicaSetModel
+from .petrinet import PetriNet
+from .transient import GSPNTransient
+from .xpn import load_xpn
+
+__all__ = ["Endpoint", "GSPNSteadyState", "GSPNTransient", "PetriNet", "ReplicaSetBuilder", "ReplicaSetModel",
+           "load_xpn"]
@@ -0,0 +1,135 @@
+from .model import ReplicaSetModel
+from .petrinet import PetriNet
+from .trace import configuration_labels, span
+
+
+def _num(value):
+    return repr(float(value))
+
+
+class ReplicaSetBuilder:
+    """Builds the replica-set GSPN exactly as the Java ``ReplicaSetBuilder``"""
+
+    def __init__(self, repair_rate=0., rejuvenation_rate=0., false_positive_prob=0.,
+                 false_negative_prob=0., num_of_replicas=0):
+        self.repair_rate = repair_rate
+        self.rejuvenation_rate = rejuvenation_rate
+        self.false_positive_prob = false_positive_prob
+        self.false_negative_prob = false_negative_prob
+        self.num_of_replicas = num_of_replicas
+
+    def build(self, *endpoints):
+        with span("build", **configuration_labels(endpoints, self.num_of_replicas)):
+            net = PetriNet()
+            marking = {}
+            self._build_core_model(net, marking)
+            for endpoint in endpoints:
+                self._attach_endpoint(net, marking, endpoint)
+            return ReplicaSetModel(net, marking, list(endpoints))
+
+    def _build_core_model(self, net, marking):
+        # Fixed Places
+        aged = net.add_place("Aged")
+        aged_at_end = net.add_place("AgedAtEnd")
+        failed = net.add_place("Failed")
+        healthy = net.add_place("Healthy")
+        healthy_at_end = net.add_place("HealthyAtEnd")
+        rejuvenating = net.add_place("Rejuvenating")
+
+        # Fixed Transitions
+        aged_no_rej = net.add_transition("agedNoRej")
+        aged_rej = net.add_transition("agedRej")
+        healthy_no_rej = net.add_transition("healthyNoRej")
+        healthy_rej = net.add_transition("healthyRej")
+        rejuvenate = net.add_transition("rejuvenate")
+        repair = net.add_transition("repair")
+
+        # Fixed Connectors
+        net.add_precondition(aged_at_end, aged_no_rej)
+        net.add_postcondition(repair, healthy)
+        net.add_postcondition(healthy_rej, rejuvenating)
+        net.add_postcondition(aged_no_rej, aged)
+        net.add_precondition(aged_at_end, aged_rej)
+        net.add_postcondition(healthy_no_rej, healthy)
+        net.add_postcondition(rejuvenate, healthy)
+        net.add_precondition(healthy_at_end, healthy_no_rej)
+        net.add_postcondition(aged_rej, rejuvenating)
+        net.add_precondition(rejuvenating, rejuvenate)
+        net.add_precondition(healthy_at_end, healthy_rej)
+        net.add_precondition(failed, repair)
+
+        # Fixed Tokens
+        marking[healthy] = self.num_of_replicas
+        for place in (aged, aged_at_end, failed, healthy_at_end, rejuvenating):
+            marking[place] = 0
+
+        # Fixed Features
+        net.set_immediate(aged_no_rej, _num(self.false_negative_prob), priority=0)
+        net.set_immediate(aged_rej, "1", priority=0)
+        net.set_immediate(healthy_no_rej, "1", priority=0)
+        net.set_immediate(healthy_rej, _num(self.false_positive_prob), priority=0)
+        net.set_exponential(rejuvenate, _num(self.rejuvenation_rate) + "*Rejuvenating")
+        net.set_exponential(repair, _num(self.repair_rate) + "*Failed")
+
+    def _attach_endpoint(self, net, marking, endpoint):
+        request = net.add_place("Request" + endpoint.id)
+        healthy_computation = net.add_place("HealthyComputation" + endpoint.id)
+        aged_computation = net.add_place("AgedComputation" + endpoint.id)
+        aging_switch = net.add_place("AgingSwitch" + endpoint.id)
+        failing_switch = net.add_place("FailingSwitch" + endpoint.id)
+
+        aged_computation_t = net.add_transition("agedComputation" + endpoint.id)
+        aged_replica_selected = net.add_transition("agedReplicaSelected" + endpoint.id)
+        aged_to_failed = net.add_transition("agedToFailed" + endpoint.id)
+        arrival = net.add_transition("arrival" + endpoint.id)
+        back_aged = net.add_transition("backAged" + endpoint.id)
+        back_healthy = net.add_transition("backHealthy" + endpoint.id)
+        healthy_computation_t = net.add_transition("healthyComputation" + endpoint.id)
+        healthy_replica_selected = net.add_transition("healthyReplicaSelected" + endpoint.id)
+        healthy_to_aged = net.add_transition("healthyToAged" + endpoint.id)
+        reject = net.add_transition("reject" + endpoint.id)
+
+        # Fixed Network Connection
+        net.add_precondition(net.get_place("Healthy"), healthy_replica_selected)
+        net.add_precondition(net.get_place("Aged"), aged_replica_selected)
+
+        net.add_postcondition(arrival, request)
+        net.add_precondition(request, healthy_replica_selected)
+        net.add_precondition(request, aged_replica_selected)
+        net.add_precondition(request, reject)
+
+        net.add_postcondition(healthy_replica_selected, healthy_computation)
+        net.add_postcondition(aged_replica_selected, aged_computation)
+
+        net.add_precondition(healthy_computation, healthy_computation_t)
+        net.add_precondition(aged_computation, aged_computation_t)
+
+        net.add_postcondition(healthy_computation_t, aging_switch)
+        net.add_postcondition(aged_computation_t, failing_switch)
+
+        net.add_precondition(aging_switch, back_healthy)
+        net.add_precondition(aging_switch, healthy_to_aged)
+
+        net.add_precondition(failing_switch, back_aged)
+        net.add_precondition(failing_switch, aged_to_failed)
+
+        # Fixed Network Connection
+        net.add_postcondition(aged_to_failed, net.get_place("Failed"))
+        net.add_postcondition(back_aged, net.get_place("AgedAtEnd"))
+        net.add_postcondition(healthy_to_aged, net.get_place("AgedAtEnd"))
+        net.add_postcondition(back_healthy, net.get_place("HealthyAtEnd"))
+
+        # Endpoint specific Properties
+        for place in (aged_computation, aging_switch, failing_switch, healthy_computation, request):
+            marking[place] = 0
+
+        net.set_exponential(arrival, _num(endpoint.arrival_rate))
+        net.set_immediate(healthy_replica_selected, "1*Healthy", priority=1)
+        net.set_immediate(aged_replica_selected, "1*Aged", priority=1)
+        net.set_immediate(reject, "1", priority=0)
+        net.set_exponential(healthy_computation_t, _num(endpoint.service_rate) + "*" + healthy_computation)
+        net.set_exponential(aged_computation_t, _num(endpoint.service_rate) + "*" + aged_computation)
+        net.set_immediate(back_healthy, "1", priority=0)
+        net.set_immediate(healthy_to_aged, _num(endpoint.healthy_to_aged_tendency), priority=0)
+        net.set_immediate(back_aged, "1", priority=0)
+        net.set_immediate(aged_to_failed, _num(endpoint.aged_to_failed_tendency), priority=0)
@@ -0,0 +1,144 @@
+"""On-disk cache of solved replica-set configurations.
+
+Entries are keyed by a SHA-256 of the canonical form of a ``SweepPoint``: the
+``Endpoint`` records (sorted by id, since the id names the endpoint places),
+the ``ReplicaSetBuilder`` rates, probabilities and number of replicas, and the
+``SolverOptions`` settings that change the result: the method, plus the
+tolerance of the iterative ones and the preconditioner of the Krylov ones.
+Solves that did not converge (nor fell back to LU) are not stored. Each entry
+is a small JSON file with the steady-state rewards; its mtime is refreshed on
+every hit and the least recently used entries are evicted when the directory
+grows beyond ``max_bytes``. The size of the directory is read once and then
+kept up to date by ``put``, so the entries are listed again only when an
+eviction is due.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from .solvers import SolverOptions
+from .sweep import SweepResult
+
+# bump when the model, the reward definitions or the key change, to invalidate old entries
+CACHE_VERSION = 3
+
+
+def _solver_key(solver):
+    # LU ignores the tolerance and only the Krylov methods are preconditioned
+    if not solver.iterative:
+        return [solver.method]
+    if solver.method == "sor":
+        return [solver.method, repr(float(solver.tol))]
+    return [solver.method, repr(float(solver.tol)), solver.preconditioner]
+
+
+def canonical_point(point, solver=None):
+    solver = solver or SolverOptions()
+    endpoints = sorted(point.endpoints, key=lambda e: e.id)
+    return {
+        "version": CACHE_VERSION,
+        "endpoints": [[e.id, repr(float(e.arrival_rate)), repr(float(e.service_rate)),
+                       repr(float(e.healthy_to_aged_tendency)), repr(float(e.aged_to_failed_tendency))]
+                      for e in endpoints],
+        "numOfReplicas": int(point.num_of_replicas),
+        "repairRate": repr(float(point.repair_rate)),
+        "rejuvenationRate": repr(float(point.rejuvenation_rate)),
+        "falsePositiveProb": repr(float(point.false_positive_prob)),
+        "falseNegativeProb": repr(float(point.false_negative_prob)),
+        "solver": _solver_key(solver),
+    }
+
+
+def point_key(point, solver=None):
+    canonical = json.dumps(canonical_point(point, solver), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of ``SweepResult`` rewards in ``directory``"""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = None
+
+    def _entries(self):
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def size(self):
+        """Bytes taken by the entries, as of the last listing plus the entries put since"""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, point, solver=None):
+        """Cached ``SweepResult`` of ``point`` solved with ``solver``, or None"""
+        path = self._path(point_key(point, solver))
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        by_id = {e.id: e for e in point.endpoints}
+
+        def per_endpoint(values):
+            return {by_id[i]: v for i, v in values.items()}
+
+        return SweepResult(point, per_endpoint(entry["reliabilities"]),
+                           per_endpoint(entry["unavailabilities"]),
+                           per_endpoint(entry["aging_contributions"]),
+                           entry["resource_usage"])
+
+    def put(self, result, solver=None):
+        """Store ``result``, solved with ``solver``, unless its solve did not converge"""
+        solve = getattr(result.stats, "solve", None)
+        if solve is not None and not (solve.converged or solve.fallback):
+            return
+        entry = {
+            "point": canonical_point(result.point, solver),
+            "reliabilities": {e.id: v for e, v in result.reliabilities.items()},
+            "unavailabilities": {e.id: v for e, v in result.unavailabilities.items()},
+            "aging_contributions": {e.id: v for e, v in result.aging_contributions.items()},
+            "resource_usage": result.resource_usage,
+        }
+        path = self._path(point_key(result.point, solver))
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        total = self.size()
+        try:
+            total -= path.stat().st_size
+        except OSError:
+            pass
+        os.replace(tmp, path)
+        self._size = total + path.stat().st_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in ``max_bytes``"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._size = total
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """Endpoint served by a replica set (mirror of the Java ``Endpoint`` record)"""
+    id: str
+    arrival_rate: float
+    service_rate: float
+    healthy_to_aged_tendency: float
+    aged_to_failed_tendency: float
+
+    @staticmethod
+    def get_attribute_order():
+        return "id,arrivalRate,serviceRate,healthyToAgedTendency,agedToFailedTendency"
+
+    def __str__(self):
+        return (f"{self.id},{float(self.arrival_rate)},{float(self.service_rate)},"
+                f"{float(self.healthy_to_aged_tendency)},{float(self.aged_to_failed_tendency)}")
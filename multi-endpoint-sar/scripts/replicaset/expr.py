@@ -0,0 +1,136 @@
+"""Marking-dependent expressions written in the Oris ``MarkingExpr`` syntax.
+
+Supported: numbers, place names, ``+ - * /``, comparisons, ``&&``, ``||``, ``!``
+and ``If(condition, then, else)``, which is all the syntax used by the builder
+and by the reward strings of ``ReplicaSetModel``.
+
+Each expression is compiled once per (text, places) into two Python
+functions: one evaluating a single marking tuple (used while exploring) and
+one evaluating a whole array of markings with NumPy (used to label the edges
+of an explored graph and to compute rewards). ``PROFILE`` counts both kinds
+of evaluations.
+"""
+import ast
+import re
+import time
+from functools import lru_cache
+
+import numpy as np
+
+_BIN_OPS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+_CMP_OPS = {ast.Eq: "==", ast.NotEq: "!=", ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">="}
+
+
+def _to_python_syntax(text):
+    text = text.replace("&&", " and ").replace("||", " or ")
+    return re.sub(r"!(?!=)", " not ", text)
+
+
+def _translate(node, place_index, vector=False):
+    """Translate an expression node to Python source reading tokens from ``m``
+
+    With ``vector=True`` the source reads the token columns ``c`` of an array
+    of markings and uses the element-wise NumPy operations.
+    """
+    def sub(child):
+        return _translate(child, place_index, vector)
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return repr(float(node.value))
+    if isinstance(node, ast.Name):
+        if node.id not in place_index:
+            raise ValueError(f"Unknown place in expression: {node.id}")
+        return f"{'c' if vector else 'm'}[{place_index[node.id]}]"
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        return f"({sub(node.left)} {_BIN_OPS[type(node.op)]} {sub(node.right)})"
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return f"(-{sub(node.operand)})"
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return f"np.logical_not({sub(node.operand)})" if vector else f"(not {sub(node.operand)})"
+    if isinstance(node, ast.Compare) and len(node.ops) == 1 and type(node.ops[0]) in _CMP_OPS:
+        return f"({sub(node.left)} {_CMP_OPS[type(node.ops[0])]} {sub(node.comparators[0])})"
+    if isinstance(node, ast.BoolOp):
+        if vector:
+            reduce = "np.logical_and" if isinstance(node.op, ast.And) else "np.logical_or"
+            return f"{reduce}.reduce([{', '.join(sub(v) for v in node.values)}])"
+        op = " and " if isinstance(node.op, ast.And) else " or "
+        return "(" + op.join(sub(v) for v in node.values) + ")"
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "If"
+            and len(node.args) == 3 and not node.keywords):
+        cond, then, other = (sub(a) for a in node.args)
+        return f"np.where({cond}, {then}, {other})" if vector else f"({then} if {cond} else {other})"
+    raise ValueError(f"Unsupported expression: {ast.dump(node)}")
+
+
+@lru_cache(maxsize=4096)
+def _compile(text, places):
+    """Scalar and vectorized evaluators of ``text``, shared by all nets with the same places,
+    and the places it reads"""
+    place_index = {place: i for i, place in enumerate(places)}
+    tree = ast.parse(_to_python_syntax(text).strip(), mode="eval")
+    scalar = eval(f"lambda m: {_translate(tree.body, place_index)}", {"__builtins__": {}})
+    vector = eval(f"lambda c: {_translate(tree.body, place_index, vector=True)}", {"__builtins__": {}, "np": np})
+    read = tuple(sorted({node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and node.id in place_index}))
+    return scalar, vector, read
+
+
+class EvaluationProfile:
+    """Counters of the expression evaluations (all expressions of the process)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.scalar_calls = 0
+        self.vector_calls = 0
+        self.vector_rows = 0
+        self.vector_seconds = 0.
+
+    def __str__(self):
+        return (f"{self.scalar_calls} scalar evaluations, {self.vector_calls} vectorized evaluations "
+                f"of {self.vector_rows} markings in {self.vector_seconds:.3f} s")
+
+
+PROFILE = EvaluationProfile()
+
+
+class MarkingExpr:
+    """Expression over the token counts of a marking, e.g. ``10.0*Rejuvenating``
+
+    ``places`` lists the places the expression reads.
+    """
+
+    def __init__(self, text, places):
+        self.text = text
+        self._fn, self._vector_fn, self.places = _compile(text, tuple(places))
+
+    @classmethod
+    def from_string(cls, text, net):
+        return cls(text, net.places)
+
+    def evaluate(self, marking):
+        """Evaluate on a marking given as a tuple of token counts in net place order"""
+        PROFILE.scalar_calls += 1
+        return float(self._fn(marking))
+
+    @property
+    def scalar(self):
+        """Uncounted ``marking -> value`` evaluator, for loops that evaluate millions of times"""
+        return self._fn
+
+    def evaluate_all(self, markings):
+        """Evaluate on every row of an ``(n, places)`` array of token counts"""
+        start = time.perf_counter()
+        markings = np.asarray(markings)
+        values = np.empty(len(markings))
+        values[:] = self._vector_fn(markings.T)
+        PROFILE.vector_calls += 1
+        PROFILE.vector_rows += len(markings)
+        PROFILE.vector_seconds += time.perf_counter() - start
+        return values
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"MarkingExpr({self.text!r})"
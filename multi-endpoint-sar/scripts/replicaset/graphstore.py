@@ -0,0 +1,120 @@
+"""On-disk store of explored reachability graphs, memory-mapped when reused.
+
+A graph is keyed by a SHA-256 of the net structure (places, arcs, transition
+kinds and priorities), the initial marking and the lumping in use: rates and
+weights are not part of the key, since they only label the edges and are
+re-evaluated on the net being analyzed (see ``parametric.relabel``).
+
+Each entry is a directory of ``.npy`` files, loaded with ``mmap_mode="r"``:
+
+- ``markings.npy``: int32 ``(states, places)`` marking table, in exploration order
+- ``vanishing.npy``: bool flag of each marking
+- ``indptr.npy``, ``dst.npy``, ``transition.npy``: edges in CSR layout, i.e. the
+  edges leaving marking ``i`` are ``indptr[i]:indptr[i+1]``, with target marking
+  and index of the firing transition in ``net.transitions``
+
+plus a ``graph.json`` manifest with the place and transition names.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .gspn import MarkingRows, ReachabilityGraph, explore
+from .parametric import net_structure, relabel
+
+# bump when the exploration or the file layout change, to invalidate old entries
+GRAPH_VERSION = 1
+
+_ARRAYS = ("markings", "vanishing", "indptr", "dst", "transition")
+
+
+def graph_key(net, marking, symmetry=None):
+    structure = (GRAPH_VERSION, net_structure(net, marking), symmetry.structure() if symmetry else None)
+    return hashlib.sha256(repr(structure).encode("utf-8")).hexdigest()
+
+
+def save_graph(graph, net, directory):
+    """Write the structure of ``graph`` (not its edge labels) to ``directory``
+
+    Only ``complete`` graphs can be relabelled for other rates, so only those
+    should be saved.
+    """
+    directory = Path(directory)
+    if directory.exists():
+        return
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    n = len(graph.markings)
+    arrays = {
+        "markings": np.asarray(graph.markings, dtype=np.int32).reshape(n, -1),
+        "vanishing": graph.vanishing,
+        # explore() emits the edges of each marking contiguously and in marking order
+        "indptr": np.concatenate(([0], np.cumsum(np.bincount(graph.src, minlength=n)))).astype(np.int64),
+        "dst": graph.dst,
+        "transition": graph.transition.astype(np.int32),
+    }
+    tmp = Path(tempfile.mkdtemp(dir=directory.parent, prefix=".tmp-"))
+    try:
+        for name, array in arrays.items():
+            np.save(tmp / f"{name}.npy", array)
+        with open(tmp / "graph.json", "w", encoding="utf-8") as f:
+            json.dump({"version": GRAPH_VERSION, "states": n, "edges": len(graph.dst), "places": list(net.places),
+                       "transitions": [t.name for t in net.transitions]}, f)
+        os.replace(tmp, directory)
+    except OSError:
+        # another process stored the same graph first
+        if not directory.exists():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_graph(directory, net):
+    """Memory-map the graph in ``directory`` and label its edges with the rates of ``net``
+
+    The markings stay mapped (``gspn.MarkingRows``): only those read, e.g. the
+    tangible ones of the state space, are copied. Returns None when some edge
+    label is not positive on ``net``.
+    """
+    directory = Path(directory)
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+    indptr = arrays["indptr"]
+    src = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    graph = ReachabilityGraph(MarkingRows(arrays["markings"]), arrays["vanishing"], src, arrays["dst"],
+                              arrays["transition"], np.zeros(len(src)), derived={"markings": arrays["markings"]})
+    return relabel(graph, net)
+
+
+class GraphStore:
+    """Directory of reachability graphs shared by all analyses with the same net structure"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, net, marking, symmetry):
+        return self.directory / graph_key(net, marking, symmetry)
+
+    def load(self, net, marking, symmetry=None):
+        path = self._path(net, marking, symmetry)
+        if not (path / "graph.json").exists():
+            return None
+        return load_graph(path, net)
+
+    def explore(self, net, marking, symmetry=None):
+        """Stored graph of ``net`` from ``marking``, exploring and storing it on a miss"""
+        graph = self.load(net, marking, symmetry)
+        if graph is not None:
+            self.hits += 1
+            return graph
+        self.misses += 1
+        graph = explore(net, marking, symmetry.canonical if symmetry else None)
+        if graph.complete:
+            save_graph(graph, net, self._path(net, marking, symmetry))
+        return graph
@@ -0,0 +1,486 @@
+"""Steady-state analysis of GSPNs: reachability graph, vanishing elimination, CTMC solve.
+
+Same semantics as Oris ``GSPNSteadyState``: a marking enabling some immediate
+transition is vanishing and only the enabled immediate transitions with the
+highest priority fire, with probability proportional to their weights; all
+other markings are tangible and fire their exponential transitions.
+
+Only part of the build is vectorized. The exploration evaluates the rate or
+weight of each enabled transition on one marking tuple at a time (the scalar
+``MarkingExpr`` evaluator), since edges whose value is zero are skipped as
+they are found and decide which markings are reached. Vanishing elimination
+and the solve work on sparse matrices; relabelling an explored graph
+(``parametric.relabel``) and the rewards evaluate whole marking arrays.
+"""
+import time
+from collections import deque
+from itertools import chain
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import numpy as np
+import scipy.sparse as sp
+
+from .solvers import SolverOptions, solve
+from .trace import counter, span
+
+
+class MarkingRows:
+    """Read-only sequence of markings (tuples) backed by an ``(n, places)`` array, e.g. a memory map
+
+    Rows become tuples only when they are read; ``index`` hashes the raw rows
+    on first use instead of keeping a tuple per marking.
+    """
+
+    def __init__(self, array):
+        self.array = array
+        self._index = None
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, i):
+        return tuple(self.array[i].tolist())
+
+    def __iter__(self):
+        for start in range(0, len(self.array), 4096):
+            yield from map(tuple, self.array[start:start + 4096].tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self.array, dtype=dtype)
+
+    def subset(self, rows):
+        """The markings at ``rows``, copied from the array"""
+        return MarkingRows(np.asarray(self.array[rows]))
+
+    def index(self, marking):
+        if self._index is None:
+            rows = np.ascontiguousarray(self.array)
+            self._index = {row.tobytes(): i for i, row in enumerate(rows)}
+        key = np.asarray(marking, dtype=self.array.dtype).tobytes()
+        if key not in self._index:
+            raise ValueError(f"{marking} is not a marking of the graph")
+        return self._index[key]
+
+
+class ReachabilityGraph:
+    """Reachable markings and edges labelled by the firing transition and its rate/weight
+
+    ``complete`` is False when some enabled transition was skipped because its
+    rate or weight evaluated to zero: the structure then depends on the labels.
+    ``derived`` holds arrays computed from the structure on first use (the
+    markings as an ``(n, places)`` array, the edges of each transition); the
+    relabelled copies of a graph share it.
+    """
+
+    def __init__(self, markings, vanishing, src, dst, transition, value, complete=True, derived=None):
+        self.markings = markings
+        self.derived = {} if derived is None else derived
+        self.vanishing = np.asarray(vanishing, dtype=bool)
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.transition = np.asarray(transition, dtype=np.int64)
+        self.value = np.asarray(value, dtype=float)
+        self.complete = complete
+
+    @property
+    def marking_array(self):
+        if "markings" not in self.derived:
+            n = len(self.markings)
+            places = len(self.markings[0]) if n else 0
+            self.derived["markings"] = np.fromiter(chain.from_iterable(self.markings), dtype=np.int64,
+                                                   count=n * places).reshape(n, places)
+        return self.derived["markings"]
+
+    def transition_edges(self, num_transitions):
+        """Indices of the edges of each transition"""
+        if "transition_edges" not in self.derived:
+            order = np.argsort(self.transition, kind="stable")
+            bounds = np.searchsorted(self.transition[order], np.arange(num_transitions + 1))
+            self.derived["transition_edges"] = [order[bounds[t]:bounds[t + 1]] for t in range(num_transitions)]
+        return self.derived["transition_edges"]
+
+    @property
+    def num_tangible(self):
+        return int((~self.vanishing).sum())
+
+    @property
+    def num_vanishing(self):
+        return int(self.vanishing.sum())
+
+
+# longest chain of immediate firings followed before assuming a timeless trap
+MAX_IMMEDIATE_CHAIN = 10000
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB (None where unsupported)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+
+class ExplorationStats:
+    """State counts, generator size, exploration time and peak memory of an exploration"""
+
+    def __init__(self, tangible, vanishing, nonzeros, seconds, stored_vanishing=True):
+        self.tangible = tangible
+        self.vanishing = vanishing
+        self.nonzeros = nonzeros
+        self.seconds = seconds
+        self.stored_vanishing = stored_vanishing
+        self.peak_rss_mb = peak_rss_mb()
+        self.solve = None
+
+    def __str__(self):
+        vanishing = "vanishing" if self.stored_vanishing else "vanishing visits (not stored)"
+        rss = "n/a" if self.peak_rss_mb is None else f"{self.peak_rss_mb:.1f} MiB"
+        text = (f"{self.tangible} tangible, {self.vanishing} {vanishing}, {self.nonzeros} nonzeros, "
+                f"{self.seconds:.3f} s, peak RSS {rss}")
+        return text if self.solve is None else f"{text}; solve: {self.solve}"
+
+
+class StateSpace:
+    """Tangible markings and the generator of the CTMC embedded in the GSPN"""
+
+    def __init__(self, markings, generator, stats=None, initial=0):
+        self.markings = markings
+        self.generator = generator
+        self.stats = stats
+        self.initial = initial
+
+    def __len__(self):
+        return len(self.markings)
+
+
+def _enabling_test(pre, inhibitors):
+    """Compiled test ``marking -> bool`` of the input and inhibitor arcs of a transition"""
+    conditions = [f"m[{i}] >= {k}" for i, k in pre] + [f"m[{i}] < {k}" for i, k in inhibitors]
+    return eval(f"lambda m: {' and '.join(conditions) or 'True'}", {"__builtins__": {}})
+
+
+def _compile_transitions(net):
+    index = {place: i for i, place in enumerate(net.places)}
+    compiled = []
+    for t_index, transition in enumerate(net.transitions):
+        if transition.kind is None:
+            raise ValueError(f"Transition without stochastic feature: {transition.name}")
+        pre = [(index[p], k) for p, k in transition.pre.items()]
+        delta = {}
+        for p, k in transition.pre.items():
+            delta[index[p]] = delta.get(index[p], 0) - k
+        for p, k in transition.post.items():
+            delta[index[p]] = delta.get(index[p], 0) + k
+        inhibitors = [(index[p], k) for p, k in transition.inhibitors.items()]
+        compiled.append((t_index, transition, _enabling_test(pre, inhibitors),
+                         [(i, d) for i, d in delta.items() if d]))
+    return compiled
+
+
+def _fire(marking, delta):
+    fired = list(marking)
+    for i, d in delta:
+        fired[i] += d
+    return tuple(fired)
+
+
+def _firing_set(compiled, marking):
+    """Transitions that fire in ``marking`` and whether the marking is vanishing"""
+    enabled = [c for c in compiled if c[2](marking)]
+    immediate = [c for c in enabled if c[1].immediate]
+    if immediate:
+        top = max(c[1].priority for c in immediate)
+        return [c for c in immediate if c[1].priority == top], True
+    return enabled, False
+
+
+def explore(net, marking, canonical=None):
+    """Breadth-first exploration of the reachability graph from ``marking``
+
+    ``canonical``, if given, maps every reached marking to the representative
+    of its symmetry class (see ``lumping.EndpointSymmetry``). Rates and weights
+    are evaluated per marking, with the scalar evaluator of each transition.
+    """
+    compiled = _compile_transitions(net)
+    initial = net.marking_tuple(marking)
+    if canonical is not None:
+        initial = canonical(initial)
+    index = {initial: 0}
+    markings = [initial]
+    vanishing = []
+    src, dst, transition, value = [], [], [], []
+    skipped = 0
+    queue = deque([0])
+    while queue:
+        i = queue.popleft()
+        current = markings[i]
+        firing, is_vanishing = _firing_set(compiled, current)
+        vanishing.append(is_vanishing)
+        total = 0.
+        for t_index, t, _, delta in firing:
+            v = t.expr.evaluate(current)
+            if v <= 0:
+                skipped += 1
+                continue
+            total += v
+            reached = _fire(current, delta)
+            if canonical is not None:
+                reached = canonical(reached)
+            j = index.get(reached)
+            if j is None:
+                j = len(markings)
+                index[reached] = j
+                markings.append(reached)
+                queue.append(j)
+            src.append(i)
+            dst.append(j)
+            transition.append(t_index)
+            value.append(v)
+        if is_vanishing and total == 0:
+            raise ValueError(f"Vanishing marking with no positive weight: {current}")
+    # queue order is index order, so vanishing[i] refers to markings[i]
+    return ReachabilityGraph(markings, vanishing, src, dst, transition, value, complete=skipped == 0)
+
+
+def _generator_from_rates(rates):
+    """Generator of a CTMC from a matrix of transition rates (self-loops dropped)"""
+    rates = sp.csr_matrix(rates)
+    rates.setdiag(0)
+    rates.eliminate_zeros()
+    exit_rates = np.asarray(rates.sum(axis=1)).ravel()
+    return (rates - sp.diags(exit_rates)).tocsr()
+
+
+def _edge_matrix(graph):
+    """Edge labels as a matrix: rates out of tangible markings, probabilities out of vanishing ones"""
+    n = len(graph.markings)
+    values = graph.value.copy()
+    on_vanishing = graph.vanishing[graph.src]
+    if on_vanishing.any():
+        totals = np.bincount(graph.src, weights=graph.value, minlength=n)
+        values[on_vanishing] /= totals[graph.src[on_vanishing]]
+    return sp.csr_matrix((values, (graph.src, graph.dst)), shape=(n, n))
+
+
+def _absorbed(start, p_vv, left=False):
+    """``start (I - P_VV)^-1``, or ``(I - P_VV)^-1 start`` if ``left``: the Neumann series is exact after
+    the longest immediate chain"""
+    absorbed = term = start
+    for _ in range(p_vv.shape[0] + 1):
+        term = p_vv @ term if left else term @ p_vv
+        if term.nnz == 0:
+            return absorbed
+        absorbed = absorbed + term
+    raise ValueError("Cycle of immediate transitions (timeless trap) in the net")
+
+
+def tangible_state_space(graph):
+    """Eliminate vanishing markings: rates R_TT + R_TV (I - P_VV)^-1 P_VT"""
+    matrix = _edge_matrix(graph)
+    tangible = np.flatnonzero(~graph.vanishing)
+    vanishing = np.flatnonzero(graph.vanishing)
+
+    rows = matrix[tangible]
+    rates = rows[:, tangible]
+    if len(vanishing):
+        p_vv = matrix[vanishing][:, vanishing]
+        rates = rates + _absorbed(rows[:, vanishing], p_vv) @ matrix[vanishing][:, tangible]
+    if isinstance(graph.markings, MarkingRows):
+        markings = graph.markings.subset(tangible)
+    else:
+        markings = [graph.markings[i] for i in tangible]
+    return StateSpace(markings, _generator_from_rates(rates))
+
+
+def generator_derivatives(graph, derivatives):
+    """Generator of ``tangible_state_space(graph)`` and its derivatives along parameters
+
+    ``derivatives`` are the derivatives of the edge labels (``graph.value``)
+    along each parameter. With A = R_TV (I - P_VV)^-1 and B = (I - P_VV)^-1 P_VT
+    the derivative of the eliminated rates is [I A] dM [I; B], where dM is the
+    derivative of the edge matrix (rates, and weights normalized into
+    probabilities), so the elimination is done once for all parameters.
+    """
+    matrix = _edge_matrix(graph)
+    tangible = np.flatnonzero(~graph.vanishing)
+    vanishing = np.flatnonzero(graph.vanishing)
+    identity = sp.identity(len(tangible), format="csr")
+    rows = matrix[tangible]
+    rates = rows[:, tangible]
+    left, right = identity, identity
+    if len(vanishing):
+        p_vv = matrix[vanishing][:, vanishing]
+        p_vt = matrix[vanishing][:, tangible]
+        absorbed = _absorbed(rows[:, vanishing], p_vv)
+        rates = rates + absorbed @ p_vt
+        left = sp.hstack([identity, absorbed]).tocsr()
+        right = sp.vstack([identity, _absorbed(p_vt, p_vv, left=True)]).tocsr()
+    order = np.concatenate([tangible, vanishing])
+    n = len(graph.markings)
+    on_vanishing = graph.vanishing[graph.src]
+    totals = np.bincount(graph.src, weights=graph.value, minlength=n)[graph.src[on_vanishing]]
+    generators = []
+    for derivative in derivatives:
+        values = np.asarray(derivative, dtype=float).copy()
+        if on_vanishing.any():
+            # d(w / W) = dw / W - w dW / W^2 on the edges out of vanishing markings
+            d_totals = np.bincount(graph.src, weights=values, minlength=n)[graph.src[on_vanishing]]
+            values[on_vanishing] = (values[on_vanishing] / totals
+                                    - graph.value[on_vanishing] * d_totals / totals ** 2)
+        d_matrix = sp.csr_matrix((values, (graph.src, graph.dst)), shape=(n, n))[order][:, order]
+        generators.append(_generator_from_rates((left @ d_matrix @ right).tocsr()))
+    return _generator_from_rates(rates), generators
+
+
+def _absorb(compiled, marking, rate, targets, canonical=None):
+    """Follow the immediate firings from ``marking`` and add ``rate`` to the tangible targets
+
+    Returns the number of vanishing markings visited; none of them is kept.
+    """
+    visits = 0
+    stack = [(marking, rate, 0)]
+    while stack:
+        current, value, depth = stack.pop()
+        firing, is_vanishing = _firing_set(compiled, current)
+        if not is_vanishing:
+            targets[current] = targets.get(current, 0.) + value
+            continue
+        if depth >= MAX_IMMEDIATE_CHAIN:
+            raise ValueError("Cycle of immediate transitions (timeless trap) in the net")
+        visits += 1
+        weights = [(delta, t.expr.evaluate(current)) for _, t, _, delta in firing]
+        total = sum(w for _, w in weights if w > 0)
+        if total == 0:
+            raise ValueError(f"Vanishing marking with no positive weight: {current}")
+        for delta, w in weights:
+            if w > 0:
+                reached = _fire(current, delta)
+                if canonical is not None:
+                    reached = canonical(reached)
+                stack.append((reached, value * w / total, depth + 1))
+    return visits
+
+
+def explore_tangible(net, marking, canonical=None):
+    """Explore only tangible markings, collapsing immediate chains on the fly
+
+    Vanishing markings are traversed depth-first when a timed transition
+    reaches them and never stored, so memory only grows with the tangible
+    state space.
+    """
+    start = time.perf_counter()
+    compiled = _compile_transitions(net)
+    initial = net.marking_tuple(marking)
+    if canonical is not None:
+        initial = canonical(initial)
+    targets = {}
+    visits = _absorb(compiled, initial, 1., targets, canonical)
+    if len(targets) != 1:
+        raise ValueError("Vanishing initial marking with more than one tangible successor")
+    initial = next(iter(targets))
+
+    index = {initial: 0}
+    markings = [initial]
+    rows, cols, rates = [], [], []
+    queue = deque([0])
+    while queue:
+        i = queue.popleft()
+        current = markings[i]
+        firing, _ = _firing_set(compiled, current)
+        targets = {}
+        for _, t, _, delta in firing:
+            v = t.expr.evaluate(current)
+            if v > 0:
+                reached = _fire(current, delta)
+                if canonical is not None:
+                    reached = canonical(reached)
+                visits += _absorb(compiled, reached, v, targets, canonical)
+        for reached, rate in targets.items():
+            j = index.get(reached)
+            if j is None:
+                j = len(markings)
+                index[reached] = j
+                markings.append(reached)
+                queue.append(j)
+            rows.append(i)
+            cols.append(j)
+            rates.append(rate)
+    n = len(markings)
+    generator = _generator_from_rates(sp.csr_matrix((rates, (rows, cols)), shape=(n, n)))
+    stats = ExplorationStats(n, visits, generator.nnz, time.perf_counter() - start, stored_vanishing=False)
+    return StateSpace(markings, generator, stats)
+
+
+def build_state_space(net, marking, symmetry=None, on_the_fly=False, store=None):
+    """Tangible state space of ``net`` from ``marking``, with its exploration statistics
+
+    ``initial`` of the result is the index of the initial marking, or None if
+    that marking is vanishing (possible only without ``on_the_fly``, which
+    starts from its single tangible successor).
+    """
+    canonical = symmetry.canonical if symmetry else None
+    if on_the_fly:
+        return explore_tangible(net, marking, canonical)
+    start = time.perf_counter()
+    if store is not None:
+        graph = store.explore(net, marking, symmetry)
+    else:
+        graph = explore(net, marking, canonical)
+    state_space = tangible_state_space(graph)
+    state_space.stats = ExplorationStats(graph.num_tangible, graph.num_vanishing, state_space.generator.nnz,
+                                         time.perf_counter() - start)
+    # tangible markings keep the exploration order, which starts from the initial marking
+    state_space.initial = None if graph.vanishing[0] else 0
+    return state_space
+
+
+class GSPNSteadyState:
+    """Steady-state probabilities of the tangible markings of a GSPN
+
+    With ``on_the_fly=True`` vanishing markings are eliminated during the
+    exploration (``explore_tangible``) instead of being stored in the
+    reachability graph and reduced afterwards. A ``symmetry`` passed to
+    ``compute`` lumps markings into its canonical representatives, so the
+    returned probabilities are those of the lumped CTMC. With a ``store``
+    (``graphstore.GraphStore``) reachability graphs are reused from disk
+    instead of being explored again. ``solver`` (``solvers.SolverOptions``)
+    selects the solution method, LU by default; its telemetry is kept in
+    ``state_space.stats.solve``. An ``incremental`` explorer
+    (``incremental.IncrementalExplorer``) shared by successive computations
+    extends the previous reachability graph when the net embeds the previous
+    one and warm-starts iterative solvers from the previous solution; it
+    cannot be combined with ``on_the_fly``, a ``symmetry`` or a ``store``.
+    """
+
+    def __init__(self, on_the_fly=False, store=None, solver=None, incremental=None):
+        if incremental is not None and (on_the_fly or store is not None):
+            raise ValueError("An incremental explorer cannot be combined with on_the_fly or a store")
+        self.on_the_fly = on_the_fly
+        self.store = store
+        self.solver = solver or SolverOptions()
+        self.incremental = incremental
+        self.state_space = None
+
+    def compute(self, net, marking, symmetry=None):
+        incremental = self.incremental
+        if incremental is not None and symmetry:
+            raise ValueError("An incremental explorer cannot be combined with a symmetry (lumping)")
+        guess = None
+        with span("explore"):
+            if incremental is None:
+                self.state_space = build_state_space(net, marking, symmetry, self.on_the_fly, self.store)
+            else:
+                self.state_space = incremental.build_state_space(net, marking)
+                guess = incremental.initial_guess(self.state_space.markings)
+        stats = self.state_space.stats
+        counter("state_space", tangible=stats.tangible, vanishing=stats.vanishing, nonzeros=stats.nonzeros)
+        with span("solve", method=self.solver.method):
+            pi, stats.solve = solve(self.state_space.generator, self.solver, initial=guess)
+        counter("solve", iterations=stats.solve.iterations, residual=stats.solve.residual)
+        steady_state = dict(zip(self.state_space.markings, pi))
+        if incremental is not None:
+            incremental.remember(steady_state)
+        return steady_state
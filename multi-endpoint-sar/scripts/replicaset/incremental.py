@@ -0,0 +1,251 @@
+"""Reachability graphs extended from the one of a smaller net.
+
+The nets of a pool-size sweep differ only in the replicas initially in
+``Healthy``, and attaching an endpoint adds places and transitions without
+touching the others: shifted by the extra initial tokens (new places at
+zero), the markings of the smaller net are candidate markings of the larger
+one. Those images seed the exploration, which proceeds level by level with
+array operations: the enabling tests, the firing sets (immediate transitions
+first, by priority) and the rates or weights of a whole level are computed at
+once, and only the successors are hashed. The seeds make most of the larger
+graph a single level; those the larger net cannot reach are dropped at the
+end, so the result is its reachability graph whatever the seeds.
+
+``IncrementalExplorer`` keeps the last graph and steady state:
+``GSPNSteadyState(incremental=...)`` extends the graph whenever the new net
+embeds the previous one, and starts iterative solvers from the previous
+solution moved onto the new markings.
+"""
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import breadth_first_order
+
+from .gspn import ExplorationStats, ReachabilityGraph, tangible_state_space
+
+
+class Embedding:
+    """Markings of an explored net moved into ``net``: ``m -> m + offset``, new places at zero
+
+    False (as a boolean) unless ``net`` has all the old places and its initial
+    marking is the image of the old one plus a non-negative ``offset``.
+    """
+
+    def __init__(self, old_places, old_marking, net, marking):
+        places = {place: j for j, place in enumerate(net.places)}
+        self.valid = set(old_places) <= places.keys()
+        if not self.valid:
+            return
+        self.columns = np.array([places[place] for place in old_places], dtype=np.int64)
+        self.offset = np.array(net.marking_tuple(marking), dtype=np.int64)
+        self.offset[self.columns] -= np.asarray(old_marking, dtype=np.int64)
+        self.valid = bool((self.offset >= 0).all())
+
+    def __bool__(self):
+        return self.valid
+
+    def map_array(self, markings):
+        """Images of the rows of an ``(n, old places)`` array"""
+        images = np.tile(self.offset, (len(markings), 1))
+        images[:, self.columns] += markings
+        return images
+
+
+class _Transitions:
+    """Arcs, priorities and firing vectors of the transitions of a net, as arrays"""
+
+    def __init__(self, net):
+        index = {place: i for i, place in enumerate(net.places)}
+        self.transitions = net.transitions
+        for t in self.transitions:
+            if t.kind is None:
+                raise ValueError(f"Transition without stochastic feature: {t.name}")
+        self.pre = [[(index[p], k) for p, k in t.pre.items()] for t in self.transitions]
+        self.inhibitors = [[(index[p], k) for p, k in t.inhibitors.items()] for t in self.transitions]
+        self.immediate = np.array([t.immediate for t in self.transitions], dtype=bool)
+        self.priority = np.array([t.priority for t in self.transitions], dtype=float)
+        self.delta = np.zeros((len(self.transitions), len(net.places)), dtype=np.int64)
+        for k, t in enumerate(self.transitions):
+            for p, n in t.pre.items():
+                self.delta[k, index[p]] -= n
+            for p, n in t.post.items():
+                self.delta[k, index[p]] += n
+
+    def expand(self, markings):
+        """Edges leaving the rows of ``markings`` as (rows, transitions, values, successors),
+        the vanishing rows and the rows of the edges skipped for a zero rate or weight"""
+        n = len(markings)
+        enabled = np.ones((n, len(self.transitions)), dtype=bool)
+        for k in range(len(self.transitions)):
+            for i, tokens in self.pre[k]:
+                enabled[:, k] &= markings[:, i] >= tokens
+            for i, tokens in self.inhibitors[k]:
+                enabled[:, k] &= markings[:, i] < tokens
+        immediate = enabled & self.immediate
+        vanishing = immediate.any(axis=1)
+        top = np.where(immediate, self.priority, -np.inf).max(axis=1, initial=-np.inf)
+        firing = np.where(vanishing[:, None], immediate & (self.priority == top[:, None]), enabled)
+        rows, transitions, values, skipped = [], [], [], []
+        for k in np.flatnonzero(firing.any(axis=0)):
+            fired = np.flatnonzero(firing[:, k])
+            v = self.transitions[k].expr.evaluate_all(markings[fired])
+            positive = v > 0
+            rows.append(fired[positive])
+            transitions.append(np.full(int(positive.sum()), k, dtype=np.int64))
+            values.append(v[positive])
+            skipped.append(fired[~positive])
+        empty = np.empty(0, dtype=np.int64)
+        rows = np.concatenate(rows) if rows else empty
+        transitions = np.concatenate(transitions) if transitions else empty
+        values = np.concatenate(values) if values else np.empty(0)
+        skipped = np.concatenate(skipped) if skipped else empty
+        stuck = np.flatnonzero(vanishing & (np.bincount(rows, weights=values, minlength=n) <= 0))
+        if len(stuck):
+            raise ValueError(f"Vanishing marking with no positive weight: {tuple(markings[stuck[0]].tolist())}")
+        return rows, transitions, values, markings[rows] + self.delta[transitions], vanishing, skipped
+
+
+def explore_levels(net, marking, seeds=None, hints=None):
+    """Reachability graph of ``net`` from ``marking``, explored level by level
+
+    ``seeds`` (an ``(n, places)`` array, e.g. the images of the markings of a
+    smaller net) join the initial marking in the first level; those it does
+    not reach are dropped. ``hints`` are edges between seeds as ``(src, dst,
+    transition)`` arrays: the successors they predict are checked against the
+    fired ones instead of being looked up. The initial marking is the first,
+    so the result can replace the one of ``gspn.explore`` (same markings and
+    edges, in another order).
+    """
+    transitions = _Transitions(net)
+    level = np.array([net.marking_tuple(marking)], dtype=np.int64)
+    if seeds is not None and len(seeds):
+        if (seeds[0] == level[0]).all():
+            level = seeds
+        else:
+            hints = None
+            level = np.vstack([level, seeds])
+            # drop duplicates, keeping the first occurrence (the initial marking first)
+            level = level[np.sort(np.unique(level, axis=0, return_index=True)[1])]
+    index = {key: i for i, key in enumerate(map(tuple, level.tolist()))}
+    blocks, vanishing, src, dst, transition, value, skipped = [], [], [], [], [], [], []
+    start = 0
+    while len(level):
+        rows, fired, values, successors, is_vanishing, level_skipped = transitions.expand(level)
+        targets = np.full(len(rows), -1, dtype=np.int64)
+        if hints is not None and start == 0 and len(hints[0]):
+            # GSPN edges are identified by source and transition
+            width = len(transitions.transitions)
+            order = np.argsort(hints[0] * width + hints[2])
+            known = (hints[0] * width + hints[2])[order]
+            wanted = rows * width + fired
+            position = np.minimum(np.searchsorted(known, wanted), len(known) - 1)
+            predicted = hints[1][order][position]
+            found = np.flatnonzero(known[position] == wanted)
+            found = found[(successors[found] == level[predicted[found]]).all(axis=1)]
+            targets[found] = predicted[found]
+        new = []
+        looked_up = np.flatnonzero(targets < 0)
+        for e, key in zip(looked_up.tolist(), map(tuple, successors[looked_up].tolist())):
+            j = index.get(key)
+            if j is None:
+                j = index[key] = len(index)
+                new.append(e)
+            targets[e] = j
+        blocks.append(level)
+        vanishing.append(is_vanishing)
+        src.append(rows + start)
+        dst.append(targets)
+        transition.append(fired)
+        value.append(values)
+        skipped.append(level_skipped + start)
+        start += len(level)
+        level = successors[new]
+    markings = np.vstack(blocks)
+    vanishing, src, dst = np.concatenate(vanishing), np.concatenate(src), np.concatenate(dst)
+    transition, value, skipped = np.concatenate(transition), np.concatenate(value), np.concatenate(skipped)
+    n = len(markings)
+    if seeds is not None:
+        adjacency = sp.csr_matrix((np.ones(len(src)), (src, dst)), shape=(n, n))
+        reachable = np.sort(breadth_first_order(adjacency, 0, return_predecessors=False))
+        if len(reachable) < n:
+            renumber = np.full(n, -1, dtype=np.int64)
+            renumber[reachable] = np.arange(len(reachable))
+            kept = renumber[src] >= 0
+            markings, vanishing = markings[reachable], vanishing[reachable]
+            src, dst = renumber[src[kept]], renumber[dst[kept]]
+            transition, value = transition[kept], value[kept]
+            skipped = renumber[skipped][renumber[skipped] >= 0]
+    return ReachabilityGraph(list(map(tuple, markings.tolist())), vanishing, src, dst, transition, value,
+                             complete=not len(skipped), derived={"markings": markings})
+
+
+class IncrementalExplorer:
+    """Explorer seeded with the markings of the last net explored, when the next net embeds it
+
+    ``extended`` counts the explorations seeded this way and ``seeded`` the
+    seeds they were given; ``steady_state`` is the last solution passed to
+    ``remember``.
+    """
+
+    def __init__(self):
+        self.places = None
+        self.marking = None
+        self.transitions = None
+        self.graph = None
+        self.embedding = None
+        self.steady_state = None
+        self.extended = 0
+        self.seeded = 0
+
+    def explore(self, net, marking):
+        """Reachability graph of ``net`` from ``marking`` (see ``explore_levels``)"""
+        self.embedding = None
+        seeds = hints = None
+        if self.graph is not None:
+            embedding = Embedding(self.places, self.marking, net, marking)
+            if embedding:
+                self.embedding = embedding
+                seeds = embedding.map_array(self.graph.marking_array)
+                names = {t.name: k for k, t in enumerate(net.transitions)}
+                renamed = np.array([names.get(t.name, -1) for t in self.transitions], dtype=np.int64)
+                kept = renamed[self.graph.transition] >= 0
+                hints = (self.graph.src[kept], self.graph.dst[kept], renamed[self.graph.transition[kept]])
+                self.extended += 1
+                self.seeded += len(seeds)
+            else:
+                self.steady_state = None
+        self.graph = explore_levels(net, marking, seeds, hints)
+        self.places, self.marking = list(net.places), net.marking_tuple(marking)
+        self.transitions = list(net.transitions)
+        return self.graph
+
+    def build_state_space(self, net, marking):
+        """Tangible state space of ``net`` from ``marking``, as ``gspn.build_state_space``"""
+        start = time.perf_counter()
+        graph = self.explore(net, marking)
+        state_space = tangible_state_space(graph)
+        state_space.stats = ExplorationStats(graph.num_tangible, graph.num_vanishing, state_space.generator.nnz,
+                                             time.perf_counter() - start)
+        state_space.initial = None if graph.vanishing[0] else 0
+        return state_space
+
+    def initial_guess(self, markings):
+        """Last steady state moved onto ``markings`` through the last embedding, or None
+
+        Markings that are not images get the smallest moved probability, so
+        the guess is positive everywhere.
+        """
+        if self.embedding is None or self.steady_state is None:
+            return None
+        old = np.array(list(self.steady_state), dtype=np.int64)
+        moved = dict(zip(map(tuple, self.embedding.map_array(old).tolist()), self.steady_state.values()))
+        guess = np.array([moved.get(m, 0.) for m in markings])
+        if not (guess > 0).any():
+            return None
+        guess[guess <= 0] = guess[guess > 0].min()
+        return guess / guess.sum()
+
+    def remember(self, steady_state):
+        """Steady state (marking -> probability) of the net explored last"""
+        self.steady_state = steady_state
@@ -0,0 +1,73 @@
+"""Exact lumping of exchangeable endpoint subnets.
+
+Endpoints with identical ``Endpoint`` parameters attach isomorphic subnets to
+the shared Healthy/Aged pools, so permuting their places maps the net onto
+itself. Markings are replaced during exploration by a canonical representative
+(the endpoint blocks of each class sorted), which yields the lumped CTMC.
+Replicas are already interchangeable in the net, which only counts tokens.
+
+The steady-state probability of a lumped marking is the total probability of
+its orbit; the expected reward of endpoint ``i`` is recovered exactly by
+averaging the reward over the markings obtained by swapping the block of ``i``
+with each block of its class.
+"""
+from collections import defaultdict
+
+ENDPOINT_PLACES = ("Request", "HealthyComputation", "AgedComputation", "AgingSwitch", "FailingSwitch")
+
+
+class EndpointSymmetry:
+    """Classes of exchangeable endpoints and the place blocks they own"""
+
+    def __init__(self, net, classes):
+        index = {place: i for i, place in enumerate(net.places)}
+        self.index = index
+        self.classes = [list(c) for c in classes if len(c) > 1]
+        self.blocks = {}
+        self.class_of = {}
+        for members in self.classes:
+            for endpoint in members:
+                self.blocks[endpoint] = [index[place + endpoint.id] for place in ENDPOINT_PLACES]
+                self.class_of[endpoint] = members
+
+    @classmethod
+    def of_model(cls, model):
+        """Group the endpoints of ``model`` whose parameters are identical"""
+        groups = defaultdict(list)
+        for endpoint in model.endpoints:
+            groups[(endpoint.arrival_rate, endpoint.service_rate, endpoint.healthy_to_aged_tendency,
+                    endpoint.aged_to_failed_tendency)].append(endpoint)
+        return cls(model.net, groups.values())
+
+    def __bool__(self):
+        return bool(self.classes)
+
+    def structure(self):
+        """Place blocks of each class: two symmetries with the same structure lump alike"""
+        return tuple(tuple(tuple(self.blocks[e]) for e in members) for members in self.classes)
+
+    def canonical(self, marking):
+        """Representative of the orbit of ``marking``: endpoint blocks sorted within each class"""
+        canonical = list(marking)
+        for members in self.classes:
+            blocks = [self.blocks[e] for e in members]
+            values = sorted(tuple(marking[i] for i in block) for block in blocks)
+            for block, value in zip(blocks, values):
+                for i, v in zip(block, value):
+                    canonical[i] = v
+        return tuple(canonical)
+
+    def permutations(self, endpoint):
+        """Place orders that swap the block of ``endpoint`` with each block of its class:
+        ``markings[:, order]`` are the swapped rows of an array of markings"""
+        members = self.class_of.get(endpoint)
+        if members is None:
+            return [None]
+        own = self.blocks[endpoint]
+        orders = []
+        for other in members:
+            order = list(range(len(self.index)))
+            for i, j in zip(own, self.blocks[other]):
+                order[i], order[j] = j, i
+            orders.append(order)
+        return orders
@@ -0,0 +1,145 @@
+import numpy as np
+
+from .expr import MarkingExpr
+from .gspn import GSPNSteadyState
+from .lumping import EndpointSymmetry
+from .trace import span
+from .transient import GSPNTransient
+
+
+class ReplicaSetModel:
+    """Replica-set GSPN with the steady-state rewards of the Java ``ReplicaSetModel``"""
+
+    # markings where some replica has failed: absorbing when timing the first failure
+    FIRST_FAILURE = "Failed>0"
+
+    def __init__(self, net, marking, endpoints):
+        self.net = net
+        self.marking = marking
+        self.endpoints = endpoints
+        self.analysis = None
+        self.symmetry = None
+        self.steady_state = None
+        self.rewards = None
+        self.transient_analysis = None
+        self.transient = None
+        self.transient_rewards = None
+
+    def analyze(self, analysis=None, lumping=False):
+        """Solve the net with ``analysis`` (a default ``GSPNSteadyState`` if omitted)
+
+        With ``lumping=True`` endpoints with identical parameters are treated as
+        exchangeable and the lumped CTMC is solved; per-endpoint rewards are the
+        same as those of the unlumped solve.
+        """
+        self.analysis = analysis if analysis is not None else GSPNSteadyState()
+        self.symmetry = EndpointSymmetry.of_model(self) if lumping else None
+        self.steady_state = self.analysis.compute(self.net, self.marking, self.symmetry)
+        with span("rewards"):
+            # tangible markings as one array: every reward is a vectorized evaluation and a dot product
+            self._markings = np.array(list(self.steady_state), dtype=np.int64).reshape(len(self.steady_state), -1)
+            self._probabilities = np.fromiter(self.steady_state.values(), dtype=float, count=len(self.steady_state))
+            self.rewards = {reward: float(self._probabilities @ values)
+                            for reward, values in self._reward_values(self._markings, self.symmetry).items()}
+
+    def analyze_transient(self, times, analysis=None, lumping=False):
+        """Rewards of interest at every time of ``times``, starting from the initial marking
+
+        ``analysis`` is a ``transient.GSPNTransient`` (default settings if
+        omitted). Besides the instantaneous rewards, their averages over
+        ``[0, t]`` and the distribution of the time to the first failure
+        (``FIRST_FAILURE``) are computed from the same generator.
+        """
+        self.transient_analysis = analysis if analysis is not None else GSPNTransient()
+        symmetry = EndpointSymmetry.of_model(self) if lumping else None
+        self.transient = self.transient_analysis.compute(self.net, self.marking, times, symmetry,
+                                                         absorbing=self.FIRST_FAILURE)
+        space = self.transient_analysis.state_space
+        markings = np.array(space.markings, dtype=np.int64).reshape(len(space), -1)
+        averages = self.transient.interval_averages()
+        self.transient_rewards = {reward: (self.transient.probabilities @ values, averages @ values)
+                                  for reward, values in self._reward_values(markings, symmetry).items()}
+
+    def _reward_values(self, markings, symmetry):
+        """Value of every reward of interest in each of ``markings`` (rows)
+
+        In a lumped state space the per-endpoint rewards are averaged over the
+        endpoint permutations of each representative.
+        """
+        owners = {}
+        for endpoint in self.endpoints:
+            owners[self._single_endpoint_reliability_reward(endpoint)] = endpoint
+            owners[self._single_endpoint_healthy_computation_reward(endpoint)] = endpoint
+        values = {}
+        for reward in self.reward_of_interest():
+            expr = MarkingExpr.from_string(reward, self.net)
+            endpoint = owners.get(reward)
+            if not symmetry or endpoint is None:
+                values[reward] = expr.evaluate_all(markings)
+                continue
+            orders = symmetry.permutations(endpoint)
+            values[reward] = sum(expr.evaluate_all(markings if order is None else markings[:, order])
+                                 for order in orders) / len(orders)
+        return values
+
+    def reward_of_interest(self):
+        rewards = [self._single_endpoint_reliability_reward(e) for e in self.endpoints]
+        rewards += [self._single_endpoint_unavailability_reward(e) for e in self.endpoints]
+        rewards += [self._single_endpoint_healthy_computation_reward(e) for e in self.endpoints]
+        rewards.append(self.get_resource_usage_reward())
+        return list(dict.fromkeys(rewards))
+
+    def get_steady_state_resource_usage(self):
+        return self.rewards[self.get_resource_usage_reward()]
+
+    def get_steady_state_endpoints_reliabilities(self):
+        return {e: self.rewards[self._single_endpoint_reliability_reward(e)]
+                * e.service_rate * e.aged_to_failed_tendency for e in self.endpoints}
+
+    def get_steady_state_endpoints_unavailabilities(self):
+        return {e: self.rewards[self._single_endpoint_unavailability_reward(e)] for e in self.endpoints}
+
+    def get_steady_state_aging_contributions(self):
+        return {e: self.rewards[self._single_endpoint_reliability_reward(e)]
+                * e.service_rate * e.healthy_to_aged_tendency for e in self.endpoints}
+
+    def _transient(self, reward, interval):
+        return self.transient_rewards[reward][1 if interval else 0]
+
+    def get_transient_resource_usage(self, interval=False):
+        """Resource usage at every time of the grid (``interval=True``: averaged over [0, t])"""
+        return self._transient(self.get_resource_usage_reward(), interval)
+
+    def get_transient_endpoints_reliabilities(self, interval=False):
+        return {e: self._transient(self._single_endpoint_reliability_reward(e), interval)
+                * e.service_rate * e.aged_to_failed_tendency for e in self.endpoints}
+
+    def get_transient_endpoints_unavailabilities(self, interval=False):
+        return {e: self._transient(self._single_endpoint_unavailability_reward(e), interval) for e in self.endpoints}
+
+    def get_transient_aging_contributions(self, interval=False):
+        return {e: self._transient(self._single_endpoint_reliability_reward(e), interval)
+                * e.service_rate * e.healthy_to_aged_tendency for e in self.endpoints}
+
+    def get_first_failure_probabilities(self):
+        """Probability that some replica has failed by every time of the grid"""
+        return self.transient.absorbed
+
+    def get_mean_time_to_first_failure(self):
+        return self.transient.mean_time_to_absorption
+
+    @staticmethod
+    def _single_endpoint_unavailability_reward(endpoint):
+        return f"If((Healthy+Aged)==0,{float(endpoint.arrival_rate)!r},0)"
+
+    @staticmethod
+    def _single_endpoint_healthy_computation_reward(endpoint):
+        return "HealthyComputation" + endpoint.id
+
+    @staticmethod
+    def _single_endpoint_reliability_reward(endpoint):
+        return "AgedComputation" + endpoint.id
+
+    @staticmethod
+    def get_resource_usage_reward():
+        return "Healthy+Aged"
@@ -0,0 +1,270 @@
+"""Search of rejuvenation policies over the ``ReplicaSetBuilder`` parameters.
+
+The repair and rejuvenation rates and the false positive/negative
+probabilities only label the edges of the reachability graph, so
+``PolicyEvaluator`` explores it once and, for every candidate, relabels it,
+eliminates the vanishing markings and solves the tangible CTMC with one LU
+factorization. The same factorization gives the derivatives of the steady
+state (``solvers.steady_state_sensitivities``). Every parameter multiplies the
+label of one transition, so the derivatives of the edge labels are exact
+differences of two relabellings, and the derivative of the generator comes
+from the same vanishing elimination (``gspn.generator_derivatives``). Rewards
+are linear in the steady state, so their gradients follow.
+
+``PolicyOptimizer`` evaluates a Latin hypercube of candidates in parallel,
+refines the best ones with SLSQP using these gradients, and returns every
+evaluated policy with the Pareto front of (unreliability, unavailability).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .builder import ReplicaSetBuilder
+from .gspn import explore, generator_derivatives, tangible_state_space
+from .lumping import EndpointSymmetry
+from .parametric import relabel
+from .solvers import steady_state_sensitivities
+
+PARAMETERS = ("repair_rate", "rejuvenation_rate", "false_positive_prob", "false_negative_prob")
+METRICS = ("unreliability", "unavailability", "resource_usage")
+# probabilities are weights of immediate transitions: 0 would remove edges from the graph
+DEFAULT_BOUNDS = {"repair_rate": (1., 50.), "rejuvenation_rate": (1., 50.),
+                  "false_positive_prob": (0.01, 0.5), "false_negative_prob": (0.01, 0.5)}
+
+
+class PolicyEvaluation:
+    """Steady-state metrics of one policy and their gradients along ``PARAMETERS``
+
+    ``unreliability`` and ``unavailability`` add up the rewards of all
+    endpoints (those shown per endpoint by the plots); ``gradients`` maps each
+    metric to an array ordered as ``PARAMETERS`` (None if not computed).
+    """
+
+    def __init__(self, parameters, metrics, gradients=None):
+        self.parameters = parameters
+        self.metrics = metrics
+        self.gradients = gradients
+
+    def __getitem__(self, metric):
+        return self.metrics[metric]
+
+    def __repr__(self):
+        params = ", ".join(f"{name}={value:.6g}" for name, value in self.parameters.items())
+        metrics = ", ".join(f"{name}={value:.6g}" for name, value in self.metrics.items())
+        return f"PolicyEvaluation({params}; {metrics})"
+
+
+class PolicyEvaluator:
+    """Metrics of rejuvenation policies for fixed endpoints and replicas, on one explored state space"""
+
+    def __init__(self, endpoints, num_of_replicas, lumping=False, store=None):
+        self.endpoints = list(endpoints)
+        self.num_of_replicas = num_of_replicas
+        self.evaluations = 0
+        model = self._build({name: (low + high) / 2 for name, (low, high) in DEFAULT_BOUNDS.items()})
+        symmetry = EndpointSymmetry.of_model(model) if lumping else None
+        if store is not None:
+            self.graph = store.explore(model.net, model.marking, symmetry)
+        else:
+            self.graph = explore(model.net, model.marking, symmetry.canonical if symmetry else None)
+        space = tangible_state_space(self.graph)
+        markings = np.array(space.markings, dtype=np.int64).reshape(len(space), -1)
+        # rewards do not depend on the policy: one value per tangible marking, computed once
+        values = model._reward_values(markings, symmetry)
+        self.rewards = {
+            "unreliability": sum(values[model._single_endpoint_reliability_reward(e)]
+                                 * e.service_rate * e.aged_to_failed_tendency for e in self.endpoints),
+            "unavailability": sum(values[model._single_endpoint_unavailability_reward(e)] for e in self.endpoints),
+            "resource_usage": values[model.get_resource_usage_reward()],
+        }
+
+    def __len__(self):
+        return len(self.rewards["resource_usage"])
+
+    def _build(self, parameters):
+        builder = ReplicaSetBuilder(num_of_replicas=self.num_of_replicas, **parameters)
+        return builder.build(*self.endpoints)
+
+    def _relabel(self, parameters):
+        graph = relabel(self.graph, self._build(parameters).net)
+        if graph is None:
+            raise ValueError(f"Rates and probabilities must be positive: {parameters}")
+        return graph
+
+    def evaluate(self, parameters, sensitivities=True):
+        """``PolicyEvaluation`` of ``parameters`` (a value for each name in ``PARAMETERS``)"""
+        parameters = {name: float(parameters[name]) for name in PARAMETERS}
+        graph = self._relabel(parameters)
+        derivatives = []
+        if sensitivities:
+            # labels are linear in each parameter: the change for a unit step is the derivative
+            labels = [self._relabel({**parameters, name: parameters[name] + 1.}).value - graph.value
+                      for name in PARAMETERS]
+            generator, derivatives = generator_derivatives(graph, labels)
+        else:
+            generator = tangible_state_space(graph).generator
+        pi, d_pi = steady_state_sensitivities(generator, derivatives)
+        self.evaluations += 1
+        metrics = {metric: float(pi @ values) for metric, values in self.rewards.items()}
+        gradients = None
+        if sensitivities:
+            gradients = {metric: np.array([d @ values for d in d_pi]) for metric, values in self.rewards.items()}
+        return PolicyEvaluation(parameters, metrics, gradients)
+
+
+class Objective:
+    """Weighted sum of metrics to minimize, with upper bounds on metrics as constraints
+
+    ``weights`` and ``constraints`` map names in ``METRICS`` to a weight and
+    to the largest value allowed.
+    """
+
+    def __init__(self, weights=None, constraints=None):
+        self.weights = dict(weights or {"unreliability": 1., "unavailability": 1.})
+        self.constraints = dict(constraints or {})
+        unknown = (set(self.weights) | set(self.constraints)) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metric: {', '.join(sorted(unknown))} (use one of {', '.join(METRICS)})")
+
+    def value(self, evaluation):
+        return sum(w * evaluation[metric] for metric, w in self.weights.items())
+
+    def gradient(self, evaluation):
+        return sum(w * evaluation.gradients[metric] for metric, w in self.weights.items())
+
+    def feasible(self, evaluation):
+        return all(evaluation[metric] <= bound for metric, bound in self.constraints.items())
+
+
+def pareto_front(evaluations, metrics=("unreliability", "unavailability")):
+    """Evaluations not dominated on ``metrics`` (all minimized), sorted by the first metric"""
+    ordered = sorted(evaluations, key=lambda e: tuple(e[m] for m in metrics))
+    front = []
+    for evaluation in ordered:
+        point = [evaluation[m] for m in metrics]
+        if not any(all(f[m] <= v for m, v in zip(metrics, point)) for f in front):
+            front.append(evaluation)
+    return front
+
+
+def latin_hypercube(bounds, count, seed=0):
+    """``count`` parameter sets spreading every parameter over its bounds"""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name in PARAMETERS:
+        low, high = bounds[name]
+        strata = (rng.permutation(count) + rng.random(count)) / count
+        columns[name] = low + strata * (high - low)
+    return [{name: float(columns[name][i]) for name in PARAMETERS} for i in range(count)]
+
+
+# one evaluator per worker process, built at the first candidate of its kind
+_evaluators = {}
+
+
+def _evaluator(endpoints, num_of_replicas, lumping, graph_dir):
+    key = (tuple(endpoints), num_of_replicas, lumping)
+    if key not in _evaluators:
+        from .graphstore import GraphStore
+        store = GraphStore(graph_dir) if graph_dir is not None else None
+        _evaluators[key] = PolicyEvaluator(endpoints, num_of_replicas, lumping=lumping, store=store)
+    return _evaluators[key]
+
+
+def _evaluate_job(job):
+    endpoints, num_of_replicas, lumping, graph_dir, parameters = job
+    return _evaluator(endpoints, num_of_replicas, lumping, graph_dir).evaluate(parameters, sensitivities=False)
+
+
+def _refine_job(job):
+    endpoints, num_of_replicas, lumping, graph_dir, start, bounds, objective, maxiter = job
+    return refine(_evaluator(endpoints, num_of_replicas, lumping, graph_dir), start, bounds, objective, maxiter)
+
+
+def refine(evaluator, start, bounds, objective, maxiter=50):
+    """Local SLSQP search from ``start`` with exact gradients; returns every policy evaluated on the way
+
+    Parameters are scaled to [0, 1] within ``bounds`` and the objective and
+    constraints to the values at ``start``, so all variables weigh alike.
+    """
+    from scipy.optimize import minimize
+
+    low = np.array([bounds[name][0] for name in PARAMETERS])
+    span = np.array([bounds[name][1] for name in PARAMETERS]) - low
+    evaluated = {}
+
+    def at(x):
+        key = tuple(np.clip(x, 0., 1.))
+        if key not in evaluated:
+            evaluated[key] = evaluator.evaluate(dict(zip(PARAMETERS, low + np.array(key) * span)))
+        return evaluated[key]
+
+    x0 = (np.array([start[name] for name in PARAMETERS]) - low) / span
+    scale = objective.value(at(x0)) or 1.
+    constraints = [{"type": "ineq",
+                    "fun": lambda x, m=metric, b=bound: (b - at(x)[m]) / abs(b or 1.),
+                    "jac": lambda x, m=metric, b=bound: -at(x).gradients[m] * span / abs(b or 1.)}
+                   for metric, bound in objective.constraints.items()]
+    minimize(lambda x: objective.value(at(x)) / scale, x0, jac=lambda x: objective.gradient(at(x)) * span / scale,
+             method="SLSQP", bounds=[(0., 1.)] * len(PARAMETERS), constraints=constraints,
+             options={"maxiter": maxiter, "ftol": 1e-10})
+    return list(evaluated.values())
+
+
+class OptimizationResult:
+    """Best feasible policy (None if no candidate met the constraints), every evaluation and the Pareto front"""
+
+    def __init__(self, best, evaluations, front):
+        self.best = best
+        self.evaluations = evaluations
+        self.front = front
+
+
+class PolicyOptimizer:
+    """Minimize ``objective`` over the policy parameters within ``bounds``
+
+    ``optimize`` evaluates ``candidates`` Latin hypercube points on
+    ``workers`` processes (each explores the state space once, or loads it
+    from ``graph_dir``), then refines the ``refine`` best feasible ones (the
+    least infeasible if none is) with gradient-based local searches, again
+    in parallel.
+    """
+
+    def __init__(self, endpoints, num_of_replicas, objective=None, bounds=None, lumping=False, workers=None,
+                 graph_dir=None):
+        self.endpoints = tuple(endpoints)
+        self.num_of_replicas = num_of_replicas
+        self.objective = objective or Objective()
+        self.bounds = {**DEFAULT_BOUNDS, **(bounds or {})}
+        for name, (low, high) in self.bounds.items():
+            if name not in PARAMETERS:
+                raise ValueError(f"Unknown parameter: {name} (use one of {', '.join(PARAMETERS)})")
+            if not 0 < low < high:
+                raise ValueError(f"Bounds of {name} must satisfy 0 < low < high: {low}, {high}")
+        self.lumping = lumping
+        self.workers = workers or os.cpu_count() or 1
+        self.graph_dir = graph_dir
+
+    def _violation(self, evaluation):
+        return sum(max(evaluation[m] - b, 0.) / abs(b or 1.) for m, b in self.objective.constraints.items())
+
+    def _map(self, function, jobs):
+        workers = min(self.workers, len(jobs))
+        if workers <= 1:
+            return list(map(function, jobs))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, jobs))
+
+    def optimize(self, candidates=16, refine=4, maxiter=50, seed=0):
+        common = (self.endpoints, self.num_of_replicas, self.lumping, self.graph_dir)
+        starts = latin_hypercube(self.bounds, candidates, seed)
+        evaluations = self._map(_evaluate_job, [common + (start,) for start in starts])
+        ranked = sorted(evaluations, key=lambda e: (self._violation(e), self.objective.value(e)))
+        jobs = [common + (e.parameters, self.bounds, self.objective, maxiter) for e in ranked[:refine]]
+        for path in self._map(_refine_job, jobs):
+            evaluations += path
+        feasible = [e for e in evaluations if self.objective.feasible(e)]
+        best = min(feasible, key=self.objective.value) if feasible else None
+        return OptimizationResult(best, evaluations, pareto_front(evaluations))
+
@@ -0,0 +1,91 @@
+"""Steady-state analysis reusing one reachability graph across parameter points.
+
+For a fixed number of replicas and endpoints the reachability graph of the
+replica-set net does not depend on the arrival, service or aging parameters:
+only the rates and weights labelling its edges do. ``ParametricSteadyState``
+explores the graph once, re-evaluates the edge labels for every new net with
+the same structure and warm-starts the solver from the previous solution.
+"""
+import time
+
+import numpy as np
+
+from .gspn import ExplorationStats, GSPNSteadyState, ReachabilityGraph, explore, tangible_state_space
+from .solvers import SolverOptions, solve
+from .trace import counter, span
+
+
+def net_structure(net, marking):
+    """Everything that determines the reachability graph, but not the edge labels"""
+    transitions = tuple((t.name, t.kind, t.priority, tuple(sorted(t.pre.items())), tuple(sorted(t.post.items())),
+                         tuple(sorted(t.inhibitors.items())))
+                        for t in net.transitions)
+    return tuple(net.places), transitions, net.marking_tuple(marking)
+
+
+def relabel(graph, net):
+    """Copy of ``graph`` with edge rates/weights evaluated on ``net``, or None when
+    some label is no longer positive (the structure would change)"""
+    markings = graph.marking_array
+    values = np.empty(len(graph.src))
+    edges_of = graph.transition_edges(len(net.transitions))
+    # one vectorized evaluation per transition over all markings (cheaper than gathering the
+    # source marking of every edge); values where the transition is not enabled are discarded
+    with np.errstate(all="ignore"):
+        for transition, edges in zip(net.transitions, edges_of):
+            if len(edges):
+                values[edges] = transition.expr.evaluate_all(markings)[graph.src[edges]]
+    if (values <= 0).any():
+        return None
+    return ReachabilityGraph(graph.markings, graph.vanishing, graph.src, graph.dst, graph.transition, values,
+                             derived=graph.derived)
+
+
+class ParametricSteadyState(GSPNSteadyState):
+    """``GSPNSteadyState`` that explores once per net structure and warm-starts solves
+
+    Use one instance for a whole sweep: ``compute`` re-explores only when the
+    structure of the net (places, arcs, priorities, initial marking) changes.
+    After a new exploration the first point is solved by LU; the following
+    ones use the iterative ``solver`` (GMRES preconditioned by one Gauss-Seidel sweep,
+    ``"gs"``, by default) started from the previous solution.
+    """
+
+    def __init__(self, warm_start=True, tol=1e-12, store=None, solver=None):
+        super().__init__(store=store, solver=solver or SolverOptions("gmres", tol=tol, maxiter=500))
+        self.warm_start = warm_start
+        self.graph = None
+        self.explorations = 0
+        self._structure = None
+        self._previous = None
+
+    def compute(self, net, marking, symmetry=None):
+        # the spans and counters of GSPNSteadyState.compute, so that traces of both read the same
+        start = time.perf_counter()
+        canonical = symmetry.canonical if symmetry else None
+        with span("explore"):
+            structure = (net_structure(net, marking), symmetry.structure() if symmetry else None)
+            reusable = structure == self._structure and self.graph.complete
+            graph = relabel(self.graph, net) if reusable else None
+            if graph is None:
+                if self.store is not None:
+                    graph = self.store.explore(net, marking, symmetry)
+                else:
+                    graph = explore(net, marking, canonical)
+                self.explorations += 1
+                self._structure = structure
+                self._previous = None
+            self.graph = graph
+            self.state_space = tangible_state_space(graph)
+        stats = self.state_space.stats = ExplorationStats(graph.num_tangible, graph.num_vanishing,
+                                                          self.state_space.generator.nnz, time.perf_counter() - start)
+        counter("state_space", tangible=stats.tangible, vanishing=stats.vanishing, nonzeros=stats.nonzeros)
+        if self.warm_start and self._previous is not None and self.solver.iterative:
+            solver, initial = self.solver, self._previous
+        else:
+            solver, initial = SolverOptions(), None
+        with span("solve", method=solver.method):
+            pi, stats.solve = solve(self.state_space.generator, solver, initial)
+        counter("solve", iterations=stats.solve.iterations, residual=stats.solve.residual)
+        self._previous = pi
+        return dict(zip(self.state_space.markings, pi))
@@ -0,0 +1,154 @@
+"""Search of deployments: how to split N replicas into replica sets serving disjoint groups of endpoints.
+
+A deployment partitions the endpoints into groups and gives each group its
+own pool, with pool sizes adding up to N; ``ReplicaSetAnalysis`` only looks at
+the joined pool and the dedicated (k, N-k) splits of two endpoints. Every
+group is an independent replica set, so the per-endpoint rewards of a
+deployment are those of the ``SweepPoint`` (group, pool size) solved alone:
+each such point is solved once (in parallel, through ``run_sweep`` and an
+optional ``ResultCache``) and memoized for all the deployments that use it.
+
+The totals of unreliability and unavailability add up over the groups, so
+for each partition of the endpoints the pool sizes are chosen group by group,
+keeping after each group only the partial deployments that are not dominated
+by another one using the same number of replicas: a dominated prefix can
+never complete into a Pareto-optimal deployment.
+"""
+from dataclasses import replace
+
+from .sweep import SweepPoint, run_sweep
+
+
+def set_partitions(items):
+    """Every partition of ``items`` into non-empty groups, each group in the order of ``items``"""
+    items = list(items)
+    if not items:
+        yield []
+        return
+    first, rest = items[0], items[1:]
+    for partition in set_partitions(rest):
+        yield [(first,)] + partition
+        for i, group in enumerate(partition):
+            yield partition[:i] + [(first,) + group] + partition[i + 1:]
+
+
+class Deployment:
+    """Groups of endpoints with their pool sizes and the resulting per-endpoint rewards
+
+    ``groups`` is a tuple of ``(endpoints, replicas)``; ``results`` has the
+    ``SweepResult`` of each group in the same order.
+    """
+
+    def __init__(self, groups, results):
+        self.groups = groups
+        self.results = results
+        self.reliabilities = {e: r.reliabilities[e] for r in results for e in r.point.endpoints}
+        self.unavailabilities = {e: r.unavailabilities[e] for r in results for e in r.point.endpoints}
+        self.unreliability = sum(self.reliabilities.values())
+        self.unavailability = sum(self.unavailabilities.values())
+        self.resource_usage = sum(r.resource_usage for r in results)
+
+    @property
+    def name(self):
+        """E.g. ``A+B=4|C=2``: endpoints sharing a pool joined by '+', pools separated by '|'"""
+        return "|".join(f"{'+'.join(e.id for e in group)}={replicas}" for group, replicas in self.groups)
+
+    def __repr__(self):
+        return (f"Deployment({self.name}, unreliability={self.unreliability:.6g}, "
+                f"unavailability={self.unavailability:.6g})")
+
+
+def _prune(states):
+    """Partial deployments (unreliability, unavailability, choices) not dominated by another one"""
+    front = []
+    for state in sorted(states, key=lambda s: (s[0], s[1])):
+        if not front or state[1] < front[-1][1]:
+            front.append(state)
+    return front
+
+
+class PartitionSearch:
+    """Pareto-optimal deployments of ``total_replicas`` across ``endpoints``
+
+    ``builder`` supplies the repair/rejuvenation parameters of every pool;
+    ``max_group`` limits how many endpoints may share a pool (the joined
+    pools of many endpoints are the most expensive models). Solved points are
+    kept in ``memo`` across searches; ``cache``, ``lumping``, ``graph_dir`` and
+    ``solver`` are passed to ``run_sweep``.
+    """
+
+    def __init__(self, builder, endpoints, total_replicas, max_group=None, workers=None, cache=None, lumping=False,
+                 graph_dir=None, solver=None):
+        self.builder = builder
+        self.endpoints = list(endpoints)
+        self.total_replicas = total_replicas
+        self.max_group = max_group or len(self.endpoints)
+        self.workers = workers
+        self.cache = cache
+        self.lumping = lumping
+        self.graph_dir = graph_dir
+        self.solver = solver
+        self.memo = {}
+        self.pruned = 0
+        self.partitions = 0
+
+    def _point(self, group, replicas):
+        return replace(SweepPoint.of(self.builder, *group), num_of_replicas=replicas)
+
+    def partitions_of_endpoints(self):
+        """Partitions with at most ``max_group`` endpoints per group and at most one group per replica"""
+        order = {e: i for i, e in enumerate(self.endpoints)}
+        return [sorted(p, key=lambda group: order[group[0]]) for p in set_partitions(self.endpoints)
+                if len(p) <= self.total_replicas and all(len(group) <= self.max_group for group in p)]
+
+    def required_points(self, partitions):
+        """(group, pool size) points needed: a group of a k-group partition gets 1..N-k+1 replicas"""
+        largest = {}
+        for partition in partitions:
+            for group in partition:
+                largest[group] = max(largest.get(group, 0), self.total_replicas - len(partition) + 1)
+        return [self._point(group, replicas) for group, most in largest.items() for replicas in range(1, most + 1)]
+
+    def solve(self, points, callback=None):
+        """Solve the points not yet in ``memo``, in parallel"""
+        missing = [p for p in dict.fromkeys(points) if p not in self.memo]
+        for result in run_sweep(missing, workers=self.workers, callback=callback, cache=self.cache,
+                                lumping=self.lumping, graph_dir=self.graph_dir, solver=self.solver):
+            self.memo[result.point] = result
+        return len(missing)
+
+    def _deployments(self, partition):
+        """Non-dominated deployments of one partition, choosing the pool sizes group by group"""
+        # partial deployments by replicas used: (unreliability, unavailability, chosen results)
+        states = {0: [(0., 0., ())]}
+        for index, group in enumerate(partition):
+            # every group after this one needs at least a replica; the last one takes all that is left
+            later = len(partition) - index - 1
+            following = {}
+            for used, partial in states.items():
+                free = self.total_replicas - used
+                sizes = range(1, free - later + 1) if later else [free]
+                for replicas in sizes:
+                    result = self.memo[self._point(group, replicas)]
+                    unreliability = sum(result.reliabilities.values())
+                    unavailability = sum(result.unavailabilities.values())
+                    following.setdefault(used + replicas, []).extend(
+                        (u + unreliability, a + unavailability, chosen + (result,)) for u, a, chosen in partial)
+            states = {}
+            for used, partial in following.items():
+                kept = _prune(partial)
+                self.pruned += len(partial) - len(kept)
+                states[used] = kept
+        complete = states.get(self.total_replicas, [])
+        return [Deployment(tuple((r.point.endpoints, r.point.num_of_replicas) for r in chosen), chosen)
+                for _, _, chosen in complete]
+
+    def search(self, callback=None):
+        """Pareto front of (total unreliability, total unavailability) over all deployments"""
+        partitions = self.partitions_of_endpoints()
+        self.partitions = len(partitions)
+        self.solve(self.required_points(partitions), callback)
+        candidates = [d for partition in partitions for d in self._deployments(partition)]
+        front = _prune([(d.unreliability, d.unavailability, d) for d in candidates])
+        self.pruned += len(candidates) - len(front)
+        return [d for _, _, d in front]
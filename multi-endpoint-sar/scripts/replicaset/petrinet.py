@@ -0,0 +1,82 @@
+from .expr import MarkingExpr
+
+EXPONENTIAL = "exp"
+IMMEDIATE = "imm"
+
+
+class Transition:
+    """GSPN transition: exponential with a rate or immediate with a weight and priority"""
+
+    def __init__(self, name):
+        self.name = name
+        self.pre = {}
+        self.post = {}
+        self.inhibitors = {}
+        self.kind = None
+        self.expr = None
+        self.priority = 0
+
+    @property
+    def immediate(self):
+        return self.kind == IMMEDIATE
+
+    def __repr__(self):
+        return f"Transition({self.name!r})"
+
+
+class PetriNet:
+    """Minimal Petri net with the API used by ``ReplicaSetBuilder``"""
+
+    def __init__(self):
+        self.places = []
+        self.transitions = []
+        self._place_set = set()
+        self._transitions_by_name = {}
+
+    def add_place(self, name):
+        if name in self._place_set:
+            raise ValueError(f"Duplicate place: {name}")
+        self.places.append(name)
+        self._place_set.add(name)
+        return name
+
+    def get_place(self, name):
+        if name not in self._place_set:
+            raise KeyError(name)
+        return name
+
+    def add_transition(self, name):
+        if name in self._transitions_by_name:
+            raise ValueError(f"Duplicate transition: {name}")
+        transition = Transition(name)
+        self.transitions.append(transition)
+        self._transitions_by_name[name] = transition
+        return transition
+
+    def get_transition(self, name):
+        return self._transitions_by_name[name]
+
+    def add_precondition(self, place, transition, multiplicity=1):
+        transition.pre[self.get_place(place)] = multiplicity
+
+    def add_postcondition(self, transition, place, multiplicity=1):
+        transition.post[self.get_place(place)] = multiplicity
+
+    def add_inhibitor_arc(self, place, transition, multiplicity=1):
+        """``transition`` is disabled while ``place`` holds at least ``multiplicity`` tokens"""
+        transition.inhibitors[self.get_place(place)] = multiplicity
+
+    def set_exponential(self, transition, rate):
+        """Exponential transition whose rate is the (marking-dependent) expression ``rate``"""
+        transition.kind = EXPONENTIAL
+        transition.expr = MarkingExpr.from_string(str(rate), self)
+
+    def set_immediate(self, transition, weight, priority=0):
+        """Immediate transition; among the enabled ones the highest priority fires, by weight"""
+        transition.kind = IMMEDIATE
+        transition.expr = MarkingExpr.from_string(str(weight), self)
+        transition.priority = priority
+
+    def marking_tuple(self, marking):
+        """Convert a ``{place: tokens}`` marking to a tuple in place order"""
+        return tuple(int(marking.get(place, 0)) for place in self.places)
@@ -0,0 +1,384 @@
+"""Discrete-event simulation of the replica-set GSPN with general firing times.
+
+The simulator runs the same ``PetriNet`` as the analysis. Exponential
+transitions fire with their marking-dependent rate, drawn afresh after every
+event, which is exactly the CTMC of the GSPN. A transition listed in
+``timings`` instead gets one clock per enabled instance (its enabling degree,
+the infinite-server semantics of the builder's ``rate*Place`` rates), drawn
+from its distribution when the instance is enabled and kept until it fires;
+if the degree drops for another reason, the clocks that would fire last are
+discarded. Immediate transitions fire as in the analysis: highest priority
+first, chosen with probability proportional to their weights.
+
+Rewards are time averages. After a warm-up, the run is cut into batches of
+equal length; the batch means of all the independent replications give the
+estimate and its Student-t confidence interval. Replications run on a
+process pool with seeds spawned from one ``SeedSequence``, so results do not
+depend on the number of workers.
+"""
+import bisect
+import itertools
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .expr import MarkingExpr
+from .gspn import _compile_transitions
+from .sweep import SweepResult
+
+
+class Exponential:
+    def __init__(self, mean):
+        self.mean = mean
+
+    def sample(self, rng):
+        return rng.expovariate(1. / self.mean)
+
+
+class Deterministic:
+    def __init__(self, mean):
+        self.mean = mean
+
+    def sample(self, rng):
+        return self.mean
+
+
+class LogNormal:
+    """Lognormal with the given mean and coefficient of variation"""
+
+    def __init__(self, mean, cv=1.):
+        self.mean = mean
+        self.sigma = math.sqrt(math.log(1 + cv * cv))
+        self.mu = math.log(mean) - self.sigma ** 2 / 2
+
+    def sample(self, rng):
+        return rng.lognormvariate(self.mu, self.sigma)
+
+
+class Weibull:
+    """Weibull with the given mean; ``shape`` < 1 gives a heavier tail than the exponential"""
+
+    def __init__(self, mean, shape=0.5):
+        self.mean = mean
+        self.shape = shape
+        self.scale = mean / math.gamma(1 + 1 / shape)
+
+    def sample(self, rng):
+        return rng.weibullvariate(self.scale, self.shape)
+
+
+class Pareto:
+    """Pareto with the given mean and tail index ``alpha`` (> 1; infinite variance up to 2)"""
+
+    def __init__(self, mean, alpha=2.5):
+        if alpha <= 1:
+            raise ValueError(f"Pareto needs alpha > 1 for a finite mean: {alpha}")
+        self.mean = mean
+        self.alpha = alpha
+        self.minimum = mean * (alpha - 1) / alpha
+
+    def sample(self, rng):
+        return self.minimum * rng.paretovariate(self.alpha)
+
+
+DISTRIBUTIONS = {"exponential": Exponential, "deterministic": Deterministic, "lognormal": LogNormal,
+                 "weibull": Weibull, "pareto": Pareto}
+
+
+def distribution(spec, mean):
+    """``'lognormal:cv=2'`` -> ``LogNormal(mean, cv=2.)``"""
+    name, _, options = spec.partition(":")
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {name} (use one of {', '.join(DISTRIBUTIONS)})")
+    params = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        params[key.strip()] = float(value)
+    return DISTRIBUTIONS[name](mean, **params)
+
+
+class ReplicaSetTimings:
+    """Non-exponential timings of a replica set, as distribution specs (see ``distribution``)
+
+    ``service`` applies to the healthy and aged computations of every endpoint,
+    with mean 1/service rate; ``repair`` and ``rejuvenation`` to the repair and
+    rejuvenation of each replica. None keeps the transition exponential.
+    Calling it on a ``SweepPoint`` gives the ``timings`` of its net.
+    """
+
+    def __init__(self, service=None, repair=None, rejuvenation=None):
+        self.service = service
+        self.repair = repair
+        self.rejuvenation = rejuvenation
+        for spec in (service, repair, rejuvenation):
+            if spec is not None:
+                distribution(spec, 1.)
+
+    def __call__(self, point):
+        timings = {}
+        if self.service is not None:
+            for e in point.endpoints:
+                for kind in ("healthy", "aged"):
+                    timings[f"{kind}Computation{e.id}"] = distribution(self.service, 1. / e.service_rate)
+        if self.repair is not None:
+            timings["repair"] = distribution(self.repair, 1. / point.repair_rate)
+        if self.rejuvenation is not None:
+            timings["rejuvenate"] = distribution(self.rejuvenation, 1. / point.rejuvenation_rate)
+        return timings
+
+
+def _degree_function(pre, inhibitors):
+    """Compiled enabling degree ``marking -> int`` (0 when an inhibitor arc blocks the transition)"""
+    degree = f"min({', '.join(f'm[{i}] // {k}' for i, k in pre)}, 1 << 30)" if pre else "1"
+    if inhibitors:
+        blocked = " or ".join(f"m[{i}] >= {k}" for i, k in inhibitors)
+        degree = f"0 if ({blocked}) else {degree}"
+    return eval(f"lambda m: {degree}", {"__builtins__": {"min": min}})
+
+
+class Simulator:
+    """Event-driven simulation of ``net`` from ``marking``, estimating the time averages of ``rewards``
+
+    ``timings`` maps transition names to distributions (objects with
+    ``sample(rng)``) for the transitions that are not exponential.
+    """
+
+    def __init__(self, net, marking, rewards, timings=None):
+        timings = timings or {}
+        unknown = set(timings) - {t.name for t in net.transitions}
+        if unknown:
+            raise ValueError(f"Unknown transitions: {', '.join(sorted(unknown))}")
+        index = {place: i for i, place in enumerate(net.places)}
+        self.initial = list(net.marking_tuple(marking))
+        self.rewards = [MarkingExpr.from_string(reward, net).scalar for reward in rewards]
+        self.immediate, self.exponential, self.general = [], [], []
+        readers = [([], []) for _ in net.places]
+        for _, transition, enabled, delta in _compile_transitions(net):
+            read = {index[p] for p in transition.pre} | {index[p] for p in transition.inhibitors}
+            if transition.immediate:
+                self.immediate.append((transition.priority, enabled, delta, transition.expr.scalar))
+                continue
+            if transition.name in timings:
+                pre = [(index[p], k) for p, k in transition.pre.items()]
+                inhibitors = [(index[p], k) for p, k in transition.inhibitors.items()]
+                kind, position = 1, len(self.general)
+                self.general.append((_degree_function(pre, inhibitors), delta, timings[transition.name]))
+            else:
+                read |= {index[p] for p in transition.expr.places}
+                kind, position = 0, len(self.exponential)
+                self.exponential.append((enabled, delta, transition.expr.scalar))
+            for i in read:
+                readers[i][kind].append(position)
+        self.readers = readers
+        # firing choices of the immediate transitions, by marking
+        self._vanishing = {}
+
+    def _choices(self, key):
+        """Immediate transitions firing in marking ``key`` as (total weight, [(weight, delta)]); None if tangible"""
+        enabled = [c for c in self.immediate if c[1](key)]
+        if not enabled:
+            return None
+        top = max(c[0] for c in enabled)
+        weights = [(w, c[2]) for c in enabled if c[0] == top for w in [c[3](key)] if w > 0]
+        if not weights:
+            raise ValueError(f"Vanishing marking with no positive weight: {key}")
+        return sum(w for w, _ in weights), weights
+
+    def _settle(self, m, rng, changed):
+        """Fire immediate transitions until the marking is tangible, recording the places they change"""
+        while True:
+            key = tuple(m)
+            if key not in self._vanishing:
+                self._vanishing[key] = self._choices(key)
+            choices = self._vanishing[key]
+            if choices is None:
+                return
+            total, weights = choices
+            u = rng.random() * total
+            for w, delta in weights:
+                u -= w
+                if u < 0:
+                    break
+            for i, d in delta:
+                m[i] += d
+                changed.add(i)
+
+    def run(self, seed, warmup, batches, batch_length):
+        """Batch means (``batches`` x rewards) of one replication and the number of timed events"""
+        rng = random.Random(seed)
+        m = list(self.initial)
+        self._settle(m, rng, set())
+        rates = [fn(m) if enabled(m) else 0. for enabled, _, fn in self.exponential]
+        clocks = [[] for _ in self.general]
+        for g in range(len(self.general)):
+            self._sync(g, m, clocks, 0., rng)
+        integrals = [[0.] * len(self.rewards) for _ in range(batches)]
+        end = warmup + batches * batch_length
+        values_of = {}
+        now, events = 0., 0
+        while True:
+            key = tuple(m)
+            values = values_of.get(key)
+            if values is None:
+                values = values_of[key] = [reward(m) for reward in self.rewards]
+            total = sum(rates)
+            next_exponential = now + rng.expovariate(total) if total > 0 else math.inf
+            next_general, fired_general = math.inf, None
+            for g, pending in enumerate(clocks):
+                if pending and pending[0] < next_general:
+                    next_general, fired_general = pending[0], g
+            following = min(next_exponential, next_general, end)
+            self._accumulate(integrals, values, now, following, warmup, batch_length)
+            if following >= end:
+                break
+            now = following
+            events += 1
+            changed = set()
+            if next_exponential <= next_general:
+                # over the positive rates only: rounding cannot select a disabled transition
+                positive = [j for j, rate in enumerate(rates) if rate > 0]
+                cumulative = list(itertools.accumulate(rates[j] for j in positive))
+                k = bisect.bisect_right(cumulative, rng.random() * cumulative[-1])
+                j = positive[min(k, len(positive) - 1)]
+                delta = self.exponential[j][1]
+            else:
+                clocks[fired_general].pop(0)
+                delta = self.general[fired_general][1]
+            for i, d in delta:
+                m[i] += d
+                changed.add(i)
+            self._settle(m, rng, changed)
+            stale_rates, stale_clocks = set(), set()
+            for i in changed:
+                stale_rates.update(self.readers[i][0])
+                stale_clocks.update(self.readers[i][1])
+            for j in stale_rates:
+                enabled, _, fn = self.exponential[j]
+                rates[j] = fn(m) if enabled(m) else 0.
+            for g in stale_clocks:
+                self._sync(g, m, clocks, now, rng)
+        return np.array(integrals) / batch_length, events
+
+    def _sync(self, g, m, clocks, now, rng):
+        """One clock per enabled instance of general transition ``g``"""
+        degree_fn, _, dist = self.general[g]
+        pending = clocks[g]
+        degree = degree_fn(m)
+        while len(pending) < degree:
+            bisect.insort(pending, now + dist.sample(rng))
+        del pending[degree:]
+
+    @staticmethod
+    def _accumulate(integrals, values, start, stop, warmup, batch_length):
+        """Add ``values`` times the part of [start, stop) after the warm-up to the batches it overlaps"""
+        start = max(start, warmup)
+        while start < stop:
+            batch = int((start - warmup) // batch_length)
+            if batch >= len(integrals):
+                return
+            edge = min(stop, warmup + (batch + 1) * batch_length)
+            row = integrals[batch]
+            duration = edge - start
+            for r, value in enumerate(values):
+                row[r] += value * duration
+            start = edge
+
+
+@dataclass
+class SimulationOptions:
+    """Run length and replications of a simulation; times are in the units of the rates"""
+    replications: int = 8
+    warmup: float = 50.
+    batches: int = 20
+    batch_length: float = 200.
+    seed: int = 0
+    confidence: float = 0.95
+
+    def seeds(self):
+        """One reproducible seed per replication"""
+        return [int.from_bytes(s.generate_state(4).tobytes(), "little")
+                for s in np.random.SeedSequence(self.seed).spawn(self.replications)]
+
+
+@dataclass
+class SimulationResult(SweepResult):
+    """``SweepResult`` whose rewards are estimates; ``halfwidths`` has the same layout
+    (per-endpoint dicts and a resource usage value) with their confidence half-widths"""
+    halfwidths: dict = None
+
+
+class SimulationStats:
+    def __init__(self, replications, batches, events, seconds):
+        self.replications = replications
+        self.batches = batches
+        self.events = events
+        self.seconds = seconds
+
+    def __str__(self):
+        return (f"{self.replications} replications x {self.batches} batches, {self.events} events, "
+                f"{self.seconds:.2f} s ({self.events / max(self.seconds, 1e-9):.0f} events/s)")
+
+
+def _replication(job):
+    point, timings, options, seed = job
+    model = point.build()
+    simulator = Simulator(model.net, model.marking, model.reward_of_interest(), timings(point) if timings else None)
+    start = time.perf_counter()
+    batch_means, events = simulator.run(seed, options.warmup, options.batches, options.batch_length)
+    return batch_means, events, time.perf_counter() - start
+
+
+def _metrics(model, rewards):
+    """Reliabilities, unavailabilities, aging contributions and resource usage of ``rewards``
+
+    They are the steady-state getters of the model applied to other reward
+    values; being reward values times non-negative constants, they also map
+    confidence half-widths.
+    """
+    model.rewards = rewards
+    return (model.get_steady_state_endpoints_reliabilities(), model.get_steady_state_endpoints_unavailabilities(),
+            model.get_steady_state_aging_contributions(), model.get_steady_state_resource_usage())
+
+
+def _estimate(point, runs, options):
+    from scipy.stats import t as student_t
+
+    model = point.build()
+    batch_means = np.vstack([means for means, _, _ in runs])
+    n = len(batch_means)
+    mean = batch_means.mean(axis=0)
+    quantile = student_t.ppf((1 + options.confidence) / 2, n - 1) if n > 1 else math.inf
+    halfwidth = quantile * batch_means.std(axis=0, ddof=1) / math.sqrt(n) if n > 1 else np.full_like(mean, math.inf)
+    rewards = model.reward_of_interest()
+    estimates = _metrics(model, dict(zip(rewards, mean.tolist())))
+    halfwidths = _metrics(model, dict(zip(rewards, halfwidth.tolist())))
+    stats = SimulationStats(options.replications, options.batches, sum(events for _, events, _ in runs),
+                            sum(seconds for _, _, seconds in runs))
+    return SimulationResult(point, *estimates, stats=stats,
+                            halfwidths=dict(zip(("reliabilities", "unavailabilities", "aging_contributions",
+                                                 "resource_usage"), halfwidths)))
+
+
+def simulate_points(points, options=None, timings=None, workers=None, callback=None):
+    """Estimates of the steady-state rewards of every ``SweepPoint``, in order
+
+    All replications of all points share one process pool. ``timings``, if
+    given, is a picklable function ``point -> {transition name: distribution}``;
+    ``callback(result)`` is called in the order of ``points``.
+    """
+    options = options or SimulationOptions()
+    seeds = options.seeds()
+    jobs = [(point, timings, options, seed) for point in points for seed in seeds]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        runs = executor.map(_replication, jobs)
+        for point in points:
+            result = _estimate(point, [next(runs) for _ in seeds], options)
+            results.append(result)
+            if callback is not None:
+                callback(result)
+    return results
@@ -0,0 +1,207 @@
+"""Steady-state solvers for the CTMC generator of a GSPN.
+
+All methods solve pi Q = 0 with sum(pi) = 1:
+
+- ``lu``: sparse LU of the balance equations with one equation dropped and
+  one probability pinned to 1 (exact up to rounding, but fill-in grows fast
+  with the number of replicas);
+- ``sor``: Gauss-Seidel (``omega=1``) or successive over-relaxation on the
+  singular system Q^T pi = 0, normalizing at every sweep;
+- ``gmres``/``bicgstab``: Krylov methods on the pinned system, preconditioned
+  by its lower triangle (``preconditioner="gs"``, one Gauss-Seidel sweep) or
+  by an incomplete LU (``"ilu"``, which is far more expensive to build on the
+  larger replica sets).
+
+Every solve returns ``SolveStats`` with the iterations, the residual
+``max |(pi Q)_j|`` and the elapsed time. Iterative methods stop when the
+residual is below ``tol`` times the largest exit rate; if they do not get
+there within ``maxiter`` iterations the solve falls back to LU (unless
+``fallback=False``).
+"""
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, bicgstab, gmres, spilu, splu, spsolve
+
+METHODS = ("lu", "sor", "gmres", "bicgstab")
+PRECONDITIONERS = ("gs", "ilu")
+
+
+class SolverOptions:
+    """Method and convergence settings of the steady-state solve"""
+
+    def __init__(self, method="lu", tol=1e-12, maxiter=1000, omega=1., preconditioner="gs", drop_tol=1e-6,
+                 fallback=True):
+        if method not in METHODS:
+            raise ValueError(f"Unknown steady-state method: {method} (use one of {', '.join(METHODS)})")
+        if preconditioner not in PRECONDITIONERS:
+            raise ValueError(f"Unknown preconditioner: {preconditioner} (use one of {', '.join(PRECONDITIONERS)})")
+        self.method = method
+        self.tol = tol
+        self.maxiter = maxiter
+        self.omega = omega
+        self.preconditioner = preconditioner
+        self.drop_tol = drop_tol
+        self.fallback = fallback
+
+    @property
+    def iterative(self):
+        return self.method != "lu"
+
+
+class SolveStats:
+    """Convergence telemetry of a steady-state solve"""
+
+    def __init__(self, method, iterations, residual, seconds, converged=True, fallback=False):
+        self.method = method
+        self.iterations = iterations
+        self.residual = residual
+        self.seconds = seconds
+        self.converged = converged
+        self.fallback = fallback
+
+    def __str__(self):
+        method = f"{self.method} -> lu" if self.fallback else self.method
+        return f"{method}, {self.iterations} iterations, residual {self.residual:.2e}, {self.seconds:.3f} s"
+
+
+def residual(generator, pi):
+    return float(np.abs(generator.T @ pi).max())
+
+
+def _reduced_system(generator, pinned):
+    """Balance equations pi Q = 0 without equation ``pinned`` and with pi[pinned] = 1"""
+    transposed = generator.T.tocsc()
+    keep = np.flatnonzero(np.arange(generator.shape[0]) != pinned)
+    system = transposed[keep][:, keep].tocsc()
+    rhs = -transposed[keep, pinned].toarray().ravel()
+    return system, rhs, keep
+
+
+def _expand(x, keep, pinned, n):
+    pi = np.empty(n)
+    pi[keep] = x
+    pi[pinned] = 1.
+    return pi / pi.sum()
+
+
+def _solve_lu(generator):
+    n = generator.shape[0]
+    system, rhs, keep = _reduced_system(generator, n - 1)
+    return _expand(spsolve(system, rhs, permc_spec="MMD_AT_PLUS_A"), keep, n - 1, n), 0, True
+
+
+def _lower_solver(matrix):
+    """Solver of the lower triangle of ``matrix`` (a triangular matrix factorizes without fill-in)"""
+    return splu(sp.tril(matrix).tocsc(), permc_spec="NATURAL", diag_pivot_thresh=0.)
+
+
+def _solve_sor(generator, options, initial, scale):
+    """SOR sweeps (D + omega L) x' = ((1 - omega) D - omega U) x on A = Q^T"""
+    a = generator.T.tocsr()
+    diagonal = sp.diags(a.diagonal())
+    lower = sp.tril(a, k=-1)
+    upper = sp.triu(a, k=1)
+    sweep = _lower_solver(diagonal + options.omega * lower)
+    rhs = ((1. - options.omega) * diagonal - options.omega * upper).tocsr()
+    x = initial.copy()
+    for iteration in range(1, options.maxiter + 1):
+        x = sweep.solve(rhs @ x)
+        x /= x.sum()
+        if residual(generator, x) <= options.tol * scale:
+            return x, iteration, True
+    return x, options.maxiter, False
+
+
+def _solve_krylov(generator, options, initial):
+    """Krylov solve of the pinned system; without ``initial`` the first state (the
+    initial marking, usually among the most probable) is pinned and x0 = 0"""
+    n = generator.shape[0]
+    pinned = 0 if initial is None else int(np.argmax(initial))
+    system, rhs, keep = _reduced_system(generator, pinned)
+    try:
+        if options.preconditioner == "ilu":
+            preconditioner = spilu(system, drop_tol=options.drop_tol, fill_factor=20)
+        else:
+            preconditioner = _lower_solver(system)
+    except RuntimeError:
+        return np.full(n, 1. / n), 0, False
+    operator = LinearOperator(system.shape, preconditioner.solve)
+    iterations = [0]
+
+    def count(*_):
+        iterations[0] += 1
+
+    x0 = None if initial is None else initial[keep] / initial[pinned]
+    if options.method == "gmres":
+        x, info = gmres(system, rhs, x0=x0, M=operator, rtol=options.tol, atol=0., maxiter=options.maxiter,
+                        callback=count, callback_type="pr_norm")
+    else:
+        x, info = bicgstab(system, rhs, x0=x0, M=operator, rtol=options.tol, atol=0., maxiter=options.maxiter,
+                           callback=count)
+    return _expand(x, keep, pinned, n), iterations[0], info == 0
+
+
+def solve(generator, options=None, initial=None):
+    """Steady-state distribution of ``generator`` and the ``SolveStats`` of the solve
+
+    ``initial`` is a starting guess for iterative methods, e.g. the solution
+    of a nearby generator with the same states.
+    """
+    options = options or SolverOptions()
+    start = time.perf_counter()
+    n = generator.shape[0]
+    if n == 1:
+        return np.ones(1), SolveStats(options.method, 0, 0., time.perf_counter() - start)
+    if options.method == "lu":
+        pi, iterations, converged = _solve_lu(generator)
+    else:
+        initial = None if initial is None else np.asarray(initial, dtype=float)
+        scale = float(np.abs(generator.diagonal()).max())
+        if options.method == "sor":
+            initial = np.full(n, 1. / n) if initial is None else initial
+            pi, iterations, converged = _solve_sor(generator, options, initial, scale)
+        else:
+            pi, iterations, converged = _solve_krylov(generator, options, initial)
+            converged = converged and residual(generator, pi) <= options.tol * scale
+    fallback = not converged and options.fallback
+    if fallback:
+        pi, _, _ = _solve_lu(generator)
+    return pi, SolveStats(options.method, iterations, residual(generator, pi), time.perf_counter() - start,
+                          converged, fallback)
+
+
+def solve_steady_state(generator):
+    """Solve pi Q = 0 with sum(pi) = 1 by sparse LU
+
+    The last balance equation is dropped and the last probability fixed to 1
+    before normalizing, which keeps the system as sparse as the generator.
+    """
+    return solve(generator)[0]
+
+
+def steady_state_sensitivities(generator, derivatives):
+    """Steady state of ``generator`` and its derivatives along each matrix of ``derivatives`` (dQ/dtheta)
+
+    Differentiating the pinned balance equations S x = b gives S x' = b' - S' x,
+    so one sparse LU of S yields the distribution and every derivative with a
+    pair of triangular solves each.
+    """
+    n = generator.shape[0]
+    if n == 1:
+        return np.ones(1), [np.zeros(1) for _ in derivatives]
+    pinned = n - 1
+    system, rhs, keep = _reduced_system(generator, pinned)
+    lu = splu(system, permc_spec="MMD_AT_PLUS_A")
+    p = np.ones(n)
+    p[keep] = lu.solve(rhs)
+    total = p.sum()
+    sensitivities = []
+    for derivative in derivatives:
+        d_system, d_rhs, _ = _reduced_system(derivative, pinned)
+        dp = np.zeros(n)
+        dp[keep] = lu.solve(d_rhs - d_system @ p[keep])
+        # derivative of p / sum(p)
+        sensitivities.append(dp / total - p * (dp.sum() / total ** 2))
+    return p / total, sensitivities
@@ -0,0 +1,156 @@
+"""Parallel execution of independent replica-set solves.
+
+Every ``SweepPoint`` is solved in its own worker process; results come back in
+the order of the points, whatever the completion order, so output files are
+deterministic. The largest models are submitted first to keep all cores busy
+until the end of the sweep. Incremental sweeps solve the points that differ
+only in the number of replicas in one worker, each extending the state space
+of the previous one.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+from .builder import ReplicaSetBuilder
+from .graphstore import GraphStore
+from .gspn import GSPNSteadyState
+from .incremental import IncrementalExplorer
+from .trace import configuration_labels, span
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """One replica-set configuration: endpoints sharing a pool plus builder parameters"""
+    endpoints: tuple
+    num_of_replicas: int
+    repair_rate: float
+    rejuvenation_rate: float
+    false_positive_prob: float
+    false_negative_prob: float
+
+    @classmethod
+    def of(cls, builder, *endpoints):
+        return cls(tuple(endpoints), builder.num_of_replicas, builder.repair_rate,
+                   builder.rejuvenation_rate, builder.false_positive_prob, builder.false_negative_prob)
+
+    def build(self):
+        builder = ReplicaSetBuilder(self.repair_rate, self.rejuvenation_rate, self.false_positive_prob,
+                                    self.false_negative_prob, self.num_of_replicas)
+        return builder.build(*self.endpoints)
+
+    def estimated_size(self):
+        """Upper bound on tangible markings: replicas spread over Healthy/Aged/Failed/
+        Rejuvenating and the two computation places of each endpoint"""
+        places = 4 + 2 * len(self.endpoints)
+        return math.comb(self.num_of_replicas + places - 1, places - 1)
+
+
+@dataclass
+class SweepResult:
+    """Steady-state rewards of a solved ``SweepPoint``"""
+    point: SweepPoint
+    reliabilities: dict
+    unavailabilities: dict
+    aging_contributions: dict
+    resource_usage: float
+    stats: object = None
+
+
+def solve_point(point, on_the_fly=False, lumping=False, graph_dir=None, solver=None, incremental=None):
+    with span("point", **configuration_labels(point.endpoints, point.num_of_replicas)):
+        model = point.build()
+        store = GraphStore(graph_dir) if graph_dir is not None else None
+        model.analyze(GSPNSteadyState(on_the_fly=on_the_fly, store=store, solver=solver, incremental=incremental),
+                      lumping=lumping)
+        return SweepResult(point,
+                           model.get_steady_state_endpoints_reliabilities(),
+                           model.get_steady_state_endpoints_unavailabilities(),
+                           model.get_steady_state_aging_contributions(),
+                           model.get_steady_state_resource_usage(),
+                           model.analysis.state_space.stats)
+
+
+def solve_chain(points, on_the_fly=False, lumping=False, graph_dir=None, solver=None, incremental=True):
+    """Solve ``points`` in order, with one ``IncrementalExplorer`` if ``incremental``:
+    each reachability graph then extends the previous one when the net embeds it
+    (e.g. one more replica)"""
+    explorer = IncrementalExplorer() if incremental else None
+    return [solve_point(point, on_the_fly, lumping, graph_dir, solver, explorer) for point in points]
+
+
+def _chains(points, pending, incremental):
+    """Groups of ``pending`` indices solved together: with ``incremental`` the points
+    differing only in the number of replicas, by increasing replicas"""
+    if not incremental:
+        return [[i] for i in pending]
+    chains = {}
+    for i in pending:
+        chains.setdefault(replace(points[i], num_of_replicas=0), []).append(i)
+    return [sorted(chain, key=lambda i: points[i].num_of_replicas) for chain in chains.values()]
+
+
+def pool_size_sweep(builder, endpoints, total_number_of_replicas):
+    """Points of ``ReplicaSetAnalysis``: all endpoints on the whole pool, then each
+    endpoint alone on 1..N-1 replicas"""
+    points = [replace(SweepPoint.of(builder, *endpoints), num_of_replicas=total_number_of_replicas)]
+    for single_endpoint_replicas in range(1, total_number_of_replicas):
+        for endpoint in endpoints:
+            points.append(replace(SweepPoint.of(builder, endpoint), num_of_replicas=single_endpoint_replicas))
+    return points
+
+
+def run_sweep(points, workers=None, on_the_fly=False, callback=None, cache=None, lumping=False, graph_dir=None,
+              solver=None, incremental=False):
+    """Solve ``points`` on ``workers`` processes (all cores by default)
+
+    Results are returned in the order of ``points``; ``callback(result)``, if
+    given, is invoked in that same order as soon as each result is available.
+    With a ``ResultCache`` only the points missing from the cache are solved
+    (cached results have ``stats`` set to None) and new results are stored,
+    keyed by ``solver`` too.
+    ``graph_dir`` is a ``GraphStore`` directory shared by all workers and
+    ``solver`` the ``SolverOptions`` of every solve. With ``incremental`` the
+    points that differ only in the number of replicas are solved in one
+    process by ``solve_chain``, smallest first. Incremental exploration does
+    not combine with ``on_the_fly``, ``lumping`` or ``graph_dir``: together
+    with any of them it is rejected, rather than serializing every chain
+    for nothing.
+    """
+    if incremental and (on_the_fly or lumping or graph_dir is not None):
+        raise ValueError("Incremental exploration cannot be combined with on_the_fly, lumping or graph_dir")
+    workers = workers or os.cpu_count() or 1
+    cached = [cache.get(point, solver) if cache is not None else None for point in points]
+    pending = [i for i, result in enumerate(cached) if result is None]
+    results = []
+
+    def collect(result, solved):
+        if solved and cache is not None:
+            cache.put(result, solver)
+        results.append(result)
+        if callback is not None:
+            callback(result)
+
+    chains = _chains(points, pending, incremental)
+    chain_of = {i: (c, position) for c, chain in enumerate(chains) for position, i in enumerate(chain)}
+    arguments = (on_the_fly, lumping, graph_dir, solver, incremental)
+    if workers == 1 or len(chains) <= 1:
+        solved = {}
+        for i, result in enumerate(cached):
+            if result is None and i not in solved:
+                chain = chains[chain_of[i][0]]
+                solved.update(zip(chain, solve_chain([points[j] for j in chain], *arguments)))
+            collect(result or solved.pop(i), result is None)
+        return results
+
+    order = sorted(range(len(chains)), key=lambda c: -max(points[i].estimated_size() for i in chains[c]))
+    with ProcessPoolExecutor(max_workers=min(workers, len(chains))) as executor:
+        futures = {c: executor.submit(solve_chain, [points[i] for i in chains[c]], *arguments) for c in order}
+        for i, result in enumerate(cached):
+            if result is None:
+                c, position = chain_of[i]
+                result = futures[c].result()[position]
+                collect(result, True)
+            else:
+                collect(result, False)
+    return results
@@ -0,0 +1,141 @@
+"""Structured timing events of the analysis phases.
+
+Spans (net construction, exploration, solve, reward evaluation, result
+writing) and counters (state counts, solver iterations) are written as Chrome
+trace events, ``"X"`` and ``"C"``, one JSON object per line, to the file
+named by ``SAR_TRACE`` (or given to ``enable``). Every event is one
+``os.write`` on a file opened with ``O_APPEND``, so the worker processes of a
+sweep and the Java analysis (``-Dsar.trace=...``, same format) can append to
+the same file. Labels given to a span, e.g. the configuration and the number
+of replicas, are inherited by the spans and counters opened inside it.
+
+Without a trace file ``span`` returns a shared no-op context manager, so the
+hooks can stay in the hot paths; with one, an event costs a few microseconds.
+``sar-results trace`` aggregates the files into per-phase summaries.
+"""
+import json
+import os
+import threading
+import time
+
+# perf_counter_ns() + _EPOCH_NS is the wall clock, in nanoseconds since the epoch
+_EPOCH_NS = time.time_ns() - time.perf_counter_ns()
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "labels", "start")
+
+    def __init__(self, tracer, name, labels):
+        self.tracer = tracer
+        self.name = name
+        self.labels = labels
+        self.start = None
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        if stack:
+            self.labels = {**stack[-1], **self.labels}
+        stack.append(self.labels)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer._stack().pop()
+        self.tracer._write({"name": self.name, "cat": "sar", "ph": "X", "ts": (self.start + _EPOCH_NS) / 1000,
+                            "dur": (end - self.start) / 1000, "pid": os.getpid(), "tid": threading.get_native_id(),
+                            "args": self.labels})
+        return False
+
+
+class Tracer:
+    """Writer of trace events to ``path`` (disabled when None)"""
+
+    def __init__(self, path=None):
+        self._fd = None
+        self._pid = None
+        self._path = path
+        self._local = threading.local()
+
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        # events go to the new file from the next one on
+        if path != self._path:
+            self._close()
+        self._path = path
+
+    def _close(self):
+        # a descriptor inherited over a fork is the parent's: the child only forgets it
+        if self._fd is not None and self._pid == os.getpid():
+            os.close(self._fd)
+        self._fd = None
+        self._pid = None
+
+    @property
+    def enabled(self):
+        return self._path is not None
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _write(self, event):
+        # reopened after a fork: each process appends through its own descriptor
+        if self._pid != os.getpid():
+            self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        os.write(self._fd, (json.dumps(event, separators=(",", ":"), default=str) + "\n").encode("utf-8"))
+
+    def span(self, name, **labels):
+        """Context manager timing a phase, with ``labels`` added to the inherited ones"""
+        if self._path is None:
+            return _NO_SPAN
+        return _Span(self, name, labels)
+
+    def counter(self, name, **values):
+        """Numeric ``values`` (e.g. states, iterations) at this instant, with the current labels"""
+        if self._path is None:
+            return
+        stack = self._stack()
+        self._write({"name": name, "cat": "sar", "ph": "C", "ts": (time.perf_counter_ns() + _EPOCH_NS) / 1000,
+                     "pid": os.getpid(), "tid": threading.get_native_id(), "args": values,
+                     "labels": stack[-1] if stack else {}})
+
+
+TRACER = Tracer(os.environ.get("SAR_TRACE") or None)
+
+
+def enable(path):
+    """Trace to ``path`` from now on, also in the worker processes started afterwards"""
+    TRACER.path = os.path.abspath(path)
+    os.environ["SAR_TRACE"] = TRACER.path
+
+
+def span(name, **labels):
+    return TRACER.span(name, **labels)
+
+
+def counter(name, **values):
+    TRACER.counter(name, **values)
+
+
+def configuration_labels(endpoints, replicas):
+    """Labels of a replica-set configuration, as in the result files (``A+B``, pool size)"""
+    return {"configuration": "+".join(endpoint.id for endpoint in endpoints), "replicas": replicas}
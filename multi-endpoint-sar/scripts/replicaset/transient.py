@@ -0,0 +1,247 @@
+"""Transient analysis of the tangible CTMC by uniformization.
+
+With ``q`` at least the largest exit rate and ``P = I + Q/q``,
+``pi(t) = sum_k Poisson(k; q t) pi(0) P^k`` and
+``int_0^t pi(s) ds = 1/q sum_k (1 - F(k; q t)) pi(0) P^k``, where ``F`` is the
+Poisson distribution function; both series are truncated where the Poisson
+weights (computed as in Fox and Glynn, 1988) leave less than ``epsilon`` of
+probability out.
+
+The time grid is covered one interval at a time, each split into steps with
+``q dt`` at most ``max_step`` so that the weights stay short and cheap; every
+step reuses the same sparse matrix and starts from the vector of the previous
+one. A step stops early when the iterates no longer change (steady-state
+detection), and once ``pi`` is stationary all later points cost nothing.
+
+Markings satisfying an ``absorbing`` condition (e.g. ``Failed>0``) can be
+made absorbing in a second pass: the probability absorbed by time ``t`` is the
+distribution of the time to reach them (e.g. the time to the first failure).
+"""
+import math
+import time
+import warnings
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve
+
+from .expr import MarkingExpr
+from .gspn import build_state_space
+
+# uniformization rate relative to the largest exit rate: every state keeps a self-loop in P
+UNIFORMIZATION_FACTOR = 1.02
+
+
+def fox_glynn(qt, epsilon=1e-12):
+    """Poisson(``qt``) probabilities from ``left`` on, leaving out less than ``epsilon`` in the two tails
+
+    Returns ``(left, weights)``. Weights are accumulated outwards from the
+    mode relative to its value (no underflow or overflow for any ``qt``) and
+    normalized at the end; each tail is cut once a geometric bound on what is
+    left falls below ``epsilon / 2`` of the total.
+    """
+    if qt <= 0:
+        return 0, np.ones(1)
+    mode = int(math.floor(qt))
+    tail = epsilon / 2
+    upper, total, weight, k = [1.], 1., 1., mode
+    while True:
+        ratio = qt / (k + 1)
+        if weight * ratio / (1 - ratio) <= tail * total:
+            break
+        k += 1
+        weight *= ratio
+        upper.append(weight)
+        total += weight
+    lower, weight, k = [], 1., mode
+    while k > 0:
+        ratio = k / qt
+        if ratio < 1 and weight * ratio / (1 - ratio) <= tail * total:
+            break
+        weight *= ratio
+        k -= 1
+        lower.append(weight)
+        total += weight
+    return k, np.array(lower[::-1] + upper) / total
+
+
+class TransientStats:
+    """Work done by a uniformization run"""
+
+    def __init__(self, rate, steps, products, seconds, stationary_from=None):
+        self.rate = rate
+        self.steps = steps
+        self.products = products
+        self.seconds = seconds
+        self.stationary_from = stationary_from
+
+    def __str__(self):
+        stationary = "" if self.stationary_from is None else f", stationary from t={self.stationary_from:g}"
+        return (f"q={self.rate:.4g}, {self.steps} steps, {self.products} matrix-vector products, "
+                f"{self.seconds:.3f} s{stationary}")
+
+
+def _step(pi, transposed, rate, dt, epsilon):
+    """``pi(dt)``, ``int_0^dt pi(s) ds``, products done and whether ``pi`` was already stationary"""
+    qt = rate * dt
+    left, weights = fox_glynn(qt, epsilon)
+    right = left + len(weights) - 1
+    # 1 - F(k): the weight of P^k in the integral, times q
+    survival = np.maximum(1 - np.cumsum(weights), 0.)
+    point = np.zeros_like(pi)
+    integral = np.zeros_like(pi)
+    accumulated = 0.
+    current = pi
+    for k in range(right + 1):
+        i = k - left
+        s = 1. if i < 0 else survival[i]
+        if i >= 0:
+            point += weights[i] * current
+        integral += s * current
+        accumulated += s
+        if k == right:
+            break
+        following = transposed @ current
+        # L1 differences of successive iterates never grow (P is stochastic), so the
+        # terms left differ from ``following`` by at most (right - k) * change each
+        change = np.abs(following - current).sum()
+        remaining = right - k
+        if change * remaining * max(1., remaining / max(qt, 1.)) <= epsilon:
+            point += s * following
+            integral += max(qt - accumulated, 0.) * following
+            return point, integral / rate, k + 1, k == 0
+        current = following
+    return point, integral / rate, right, False
+
+
+def uniformize(generator, initial, times, epsilon=1e-12, max_step=1000.):
+    """Transient probabilities and their integrals from 0 at every time of the increasing grid ``times``
+
+    Returns ``(probabilities, cumulative, stats)`` with one row per time.
+    """
+    start = time.perf_counter()
+    times = np.asarray(times, dtype=float)
+    if len(times) == 0 or times[0] < 0 or np.any(np.diff(times) < 0):
+        raise ValueError("Times must be non-negative and increasing")
+    n = generator.shape[0]
+    exit_rates = -generator.diagonal()
+    rate = UNIFORMIZATION_FACTOR * float(exit_rates.max()) if n and exit_rates.max() > 0 else 1.
+    # P^T = I + Q^T/q, applied to column vectors
+    transposed = (sp.identity(n, format="csr") + generator.T / rate).tocsr()
+
+    probabilities = np.empty((len(times), n))
+    cumulative = np.empty((len(times), n))
+    pi = np.asarray(initial, dtype=float)
+    integral = np.zeros(n)
+    steps = products = 0
+    stationary_from = None
+    previous = 0.
+    for index, t in enumerate(times):
+        interval = t - previous
+        if stationary_from is not None:
+            integral = integral + interval * pi
+        elif interval > 0:
+            count = max(1, math.ceil(rate * interval / max_step))
+            dt = interval / count
+            for _ in range(count):
+                pi, part, done, stationary = _step(pi, transposed, rate, dt, epsilon / count)
+                integral = integral + part
+                steps += 1
+                products += done
+                if stationary:
+                    stationary_from = previous
+                    integral = integral + (t - previous - dt) * pi
+                    break
+                previous += dt
+        previous = t
+        probabilities[index] = pi
+        cumulative[index] = integral
+    return probabilities, cumulative, TransientStats(rate, steps, products, time.perf_counter() - start,
+                                                     stationary_from)
+
+
+def absorbing_generator(generator, absorbing):
+    """``generator`` with the rows of the markings in the boolean mask ``absorbing`` set to zero"""
+    return (sp.diags((~absorbing).astype(float)) @ generator).tocsr()
+
+
+def mean_time_to_absorption(generator, absorbing, initial):
+    """Expected time to reach ``absorbing`` from the marking of index ``initial`` (inf if it may never)"""
+    if absorbing[initial]:
+        return 0.
+    transient = np.flatnonzero(~absorbing)
+    if len(transient) == len(absorbing):
+        return math.inf
+    rates = -generator[transient][:, transient].tocsc()
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore")
+        times = spsolve(rates, np.ones(len(transient)))
+    value = float(times[np.searchsorted(transient, initial)])
+    # a singular system (a closed class that never absorbs) gives nan or inf
+    return value if math.isfinite(value) and value >= 0 else math.inf
+
+
+class TransientSolution:
+    """Transient probabilities of the tangible markings on a time grid
+
+    ``probabilities[i]`` is ``pi(times[i])`` and ``cumulative[i]`` its integral
+    over ``[0, times[i]]``. With an absorbing condition, ``absorbed[i]`` is the
+    probability of having reached it by ``times[i]`` and
+    ``mean_time_to_absorption`` its expected time.
+    """
+
+    def __init__(self, times, markings, probabilities, cumulative, absorbed=None, mean_time_to_absorption=None,
+                 stats=None):
+        self.times = times
+        self.markings = markings
+        self.probabilities = probabilities
+        self.cumulative = cumulative
+        self.absorbed = absorbed
+        self.mean_time_to_absorption = mean_time_to_absorption
+        self.stats = stats
+
+    def interval_averages(self):
+        """Time-averaged probabilities over ``[0, t]`` (the instantaneous ones at ``t = 0``)"""
+        averages = self.probabilities.copy()
+        positive = self.times > 0
+        averages[positive] = self.cumulative[positive] / self.times[positive, None]
+        return averages
+
+
+class GSPNTransient:
+    """Transient probabilities of the tangible markings of a GSPN, started in its initial marking
+
+    ``epsilon`` bounds the probability left out by the truncations within
+    each interval of the time grid; ``max_step`` caps ``q dt`` of a step. Exploration
+    options and ``symmetry`` are those of ``GSPNSteadyState``; lumping is exact
+    for transient probabilities too, since the initial marking is symmetric.
+    The generator is kept in ``state_space`` and the work done in
+    ``state_space.stats.transient`` (and ``stats.absorbing`` for the absorbing pass).
+    """
+
+    def __init__(self, epsilon=1e-12, max_step=1000., on_the_fly=False, store=None):
+        self.epsilon = epsilon
+        self.max_step = max_step
+        self.on_the_fly = on_the_fly
+        self.store = store
+        self.state_space = None
+
+    def compute(self, net, marking, times, symmetry=None, absorbing=None):
+        self.state_space = build_state_space(net, marking, symmetry, self.on_the_fly, self.store)
+        space = self.state_space
+        if space.initial is None:
+            raise ValueError("Vanishing initial marking: use on_the_fly=True to start from its tangible successor")
+        times = np.asarray(times, dtype=float)
+        initial = np.zeros(len(space))
+        initial[space.initial] = 1.
+        probabilities, cumulative, space.stats.transient = uniformize(space.generator, initial, times,
+                                                                      self.epsilon, self.max_step)
+        solution = TransientSolution(times, space.markings, probabilities, cumulative)
+        if absorbing is not None:
+            markings = np.array(space.markings, dtype=np.int64).reshape(len(space), -1)
+            mask = MarkingExpr.from_string(absorbing, net).evaluate_all(markings) != 0
+            generator = absorbing_generator(space.generator, mask)
+            absorbed, _, space.stats.absorbing = uniformize(generator, initial, times, self.epsilon, self.max_step)
+            solution.absorbed = absorbed[:, mask].sum(axis=1)
+            solution.mean_time_to_absorption = mean_time_to_absorption(generator, mask, space.initial)
+        return solution
@@ -0,0 +1,173 @@
+"""Import of the Oris editor models (``.xpn``) as solvable ``PetriNet`` objects.
+
+The file is read with ``iterparse`` and every entity is discarded as soon as
+it has been recorded, so no DOM of the whole model is built. Arcs drawn
+through joints (bend points) are followed back to their place and
+transition.
+
+The models keep their parameters in places that no arc touches (e.g.
+``ArrivalRate1``, ``RateDiv``): their markings are substituted as constants
+in the rate and weight expressions, so the imported net only has the places
+that change and its reachability graph is the one of the builder net.
+Inhibitor arcs from a parameter place either disable their transition for
+good (it is left out of the net) or never apply.
+"""
+import re
+import xml.etree.ElementTree as ET
+
+from .endpoint import Endpoint
+from .model import ReplicaSetModel
+from .petrinet import PetriNet
+
+EXPONENTIAL_TYPE = "type.exponential"
+IMMEDIATE_TYPE = "type.immediate"
+
+_ENTITIES = ("place", "transition", "joint", "arc", "inhibitor-arc", "note")
+# transition properties whose non-empty value the solver cannot honour
+_UNSUPPORTED = {"enabling-function": "enabling function", "marking-update": "marking update",
+                "reset-transitions": "reset transitions"}
+
+
+def _parse(path):
+    """Places, transitions, joints, arcs and inhibitor arcs of the file, keyed by uuid"""
+    places, transitions, joints, arcs, inhibitors = {}, {}, set(), [], []
+    for _, elem in ET.iterparse(path, events=("end",)):
+        tag = elem.tag
+        if tag not in _ENTITIES:
+            continue
+        props = {}
+        for prop in elem.iter("property"):
+            props.update(prop.attrib)
+        uuid = elem.get("uuid")
+        if tag == "place":
+            places[uuid] = (props["name"], int(props.get("marking", 0)))
+        elif tag == "transition":
+            transitions[uuid] = props
+        elif tag == "joint":
+            joints.add(uuid)
+        elif tag == "arc":
+            arcs.append((elem.get("from"), elem.get("to"), int(props.get("multiplicity", 1))))
+        elif tag == "inhibitor-arc":
+            inhibitors.append((elem.get("from"), elem.get("to"), int(props.get("multiplicity", 1))))
+        elem.clear()
+    return places, transitions, joints, arcs, inhibitors
+
+
+def _resolve_joints(arcs, joints):
+    """Arcs between places and transitions, following the segments drawn through joints"""
+    following = {}
+    for source, target, multiplicity in arcs:
+        if source in joints:
+            if source in following:
+                raise ValueError(f"Joint with more than one outgoing segment: {source}")
+            following[source] = target
+    resolved = []
+    for source, target, multiplicity in arcs:
+        if source in joints:
+            continue
+        seen = set()
+        while target in joints:
+            if target in seen or target not in following:
+                raise ValueError(f"Arc from {source} does not reach a node through its joints")
+            seen.add(target)
+            target = following[target]
+        resolved.append((source, target, multiplicity))
+    return resolved
+
+
+def _substitute(text, values):
+    """``text`` with every parameter name replaced by its value"""
+    if not values:
+        return text
+    pattern = re.compile(r"\b(" + "|".join(re.escape(name) for name in values) + r")\b")
+    return pattern.sub(lambda match: f"({float(values[match.group(1)])!r})", text)
+
+
+class XpnModel:
+    """Net, initial marking and parameters read from an ``.xpn`` file
+
+    ``parameters`` maps the parameter places to the values used in the
+    expressions; ``disabled`` lists the transitions left out because a
+    parameter place inhibits them.
+    """
+
+    def __init__(self, net, marking, parameters, disabled):
+        self.net = net
+        self.marking = marking
+        self.parameters = parameters
+        self.disabled = disabled
+
+    def endpoints(self):
+        """Endpoints of the replica-set models, from the parameter places of endpoint ``<id>``:
+        ``ArrivalRate<id>/RateDiv``, ``ServiceRate<id>/RateDiv``, ``He2Ag<id>/WeightDiv`` and
+        ``Ag2Fa<id>/WeightDiv``; endpoints whose arrival is disabled are skipped"""
+        p = self.parameters
+        endpoints = []
+        for place in self.net.places:
+            if not place.startswith("Request"):
+                continue
+            endpoint_id = place[len("Request"):]
+            if f"arrival{endpoint_id}" in self.disabled:
+                continue
+            endpoints.append(Endpoint(endpoint_id, p[f"ArrivalRate{endpoint_id}"] / p["RateDiv"],
+                                      p[f"ServiceRate{endpoint_id}"] / p["RateDiv"],
+                                      p[f"He2Ag{endpoint_id}"] / p["WeightDiv"],
+                                      p[f"Ag2Fa{endpoint_id}"] / p["WeightDiv"]))
+        return endpoints
+
+    def replica_set_model(self):
+        """``ReplicaSetModel`` of the imported net, with the rewards of the Java analysis"""
+        return ReplicaSetModel(self.net, self.marking, self.endpoints())
+
+
+def load_xpn(path, parameters=None):
+    """Read an Oris ``.xpn`` model; ``parameters`` overrides the marking of parameter places"""
+    places, transitions, joints, arcs, inhibitors = _parse(path)
+    arcs = _resolve_joints(arcs, joints)
+    connected = {uuid for arc in arcs for uuid in arc[:2]}
+    values = {name: tokens for uuid, (name, tokens) in places.items() if uuid not in connected}
+    unknown = set(parameters or ()) - set(values)
+    if unknown:
+        raise ValueError(f"Not a parameter place of {path}: {', '.join(sorted(unknown))}")
+    values.update(parameters or {})
+
+    disabled = set()
+    for source, target, multiplicity in inhibitors:
+        if source not in connected and values[places[source][0]] >= multiplicity:
+            disabled.add(transitions[target]["name"])
+
+    net = PetriNet()
+    marking = {}
+    for uuid, (name, tokens) in places.items():
+        if uuid in connected:
+            marking[net.add_place(name)] = tokens
+    by_uuid = {}
+    for uuid, props in transitions.items():
+        name = props["name"]
+        for attribute, feature in _UNSUPPORTED.items():
+            if props.get(attribute):
+                raise ValueError(f"Unsupported {feature} on transition {name}")
+        if name in disabled:
+            continue
+        transition = by_uuid[uuid] = net.add_transition(name)
+        kind = props.get("property-data-type", "")
+        if kind.endswith(EXPONENTIAL_TYPE):
+            net.set_exponential(transition, _substitute(props["lambda"], values))
+        elif kind.endswith(IMMEDIATE_TYPE):
+            net.set_immediate(transition, _substitute(props["weight"], values), int(props.get("priority", 0)))
+        else:
+            raise ValueError(f"Transition without stochastic feature: {name}")
+
+    for source, target, multiplicity in arcs:
+        if source in places and target in transitions:
+            if target in by_uuid:
+                net.add_precondition(places[source][0], by_uuid[target], multiplicity)
+        elif source in transitions and target in places:
+            if source in by_uuid:
+                net.add_postcondition(by_uuid[source], places[target][0], multiplicity)
+        else:
+            raise ValueError(f"Arc must connect a place and a transition: {source} -> {target}")
+    for source, target, multiplicity in inhibitors:
+        if source in connected and target in by_uuid:
+            net.add_inhibitor_arc(places[source][0], by_uuid[target], multiplicity)
+    return XpnModel(net, marking, values, sorted(disabled))
@@ -0,0 +1 @@
+"""Shared helpers of the result scripts (loading, writing and rendering analysis results)."""
@@ -0,0 +1,288 @@
+"""``sar-results``: single entry point of the result scripts.
+
+Subcommands ``plot``, ``logplot``, ``table`` and ``aging2d`` do what
+``unreliability_unavailability_plot.py``, ``..._logscale.py``,
+``table_tex_generator.py`` and ``workload-aging2d.py`` do (those scripts now
+call the same functions); ``transient`` draws the curves written by
+``transient_analysis.py``, whose rows ``plot`` and ``logplot`` also accept,
+and ``pareto`` the policies evaluated by ``optimize_policy.py``; ``trace``
+summarizes the timing events written with ``--trace`` or ``-Dsar.trace``.
+pandas, NumPy and Matplotlib are only imported
+inside the subcommand that needs them, so ``--help`` and ``table`` on a CSV
+file start in the time of the interpreter itself; Matplotlib uses the
+non-interactive Agg backend unless ``--show`` is given.
+
+``startup`` times the ``--help`` of every subcommand and of the scripts that
+wrap them in fresh interpreters, and fails if one exceeds ``STARTUP_BUDGET`` seconds or imports a heavy library,
+for the hooks that call these tools after every experiment.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# seconds allowed to start a subcommand (interpreter start-up included)
+STARTUP_BUDGET = 0.3
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "scipy", "pyarrow")
+
+
+def _pyplot(show):
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def reliability_plot(csv_file, show=False, log=False, time=None, interval=False):
+    """Unreliability vs Unavailability (``log`` for the log-scale variant) saved next to ``csv_file``
+
+    On a transient result the pairs are taken at ``time`` (the end of the grid
+    by default), with the averages over [0, time] if ``interval`` is set.
+    """
+    from pathlib import Path
+    plt = _pyplot(show)
+    from .figures import RELIABILITY, RELIABILITY_LOG, at_time, reliability_pairs, render_figure
+    from .io import load_results
+
+    spec = RELIABILITY_LOG if log else RELIABILITY
+    if log:
+        import locale
+        locale.setlocale(locale.LC_NUMERIC, 'C')
+        plt.rcParams.update(spec.style)
+
+    csv_path = Path(csv_file).expanduser().resolve()
+    # Accoppia la configurazione joined e le configurazioni AxBy con un solo join sull'indice
+    df = load_results(csv_path)
+    if "Time" in df.columns:
+        df = at_time(df, time, interval)
+    pairs = reliability_pairs(df)
+    outpath = csv_path.parent / spec.output_name(csv_path.stem, "pdf")
+    render_figure(spec, pairs, plt.figure(), [outpath])
+    print(f"✓ Plot salvato in: {outpath}")
+    print(f"✓ Configurazioni generate:")
+    for p in pairs:
+        first, second = p["endpoints"]
+        print(f"  - {p['name']}: {first}{p['a_size']} + {second}{p['b_size']}")
+    if show:
+        plt.show()
+    return outpath
+
+
+def latex_table(csv_path):
+    """Tabella LaTeX dei risultati, scritta accanto al file con estensione .tex"""
+    from .tex import read_rows, render_table, row_line
+
+    base_dir = os.path.dirname(csv_path)
+    base_name = os.path.splitext(os.path.basename(csv_path))[0]
+    tex_out = os.path.join(base_dir, base_name + ".tex")
+
+    headers, rows = read_rows(csv_path)
+    latex_code = render_table(headers, [row_line(row, headers) for row in rows])
+    with open(tex_out, "w", encoding="utf-8") as f:
+        f.write(latex_code)
+    print(f"Table tex genereted at '{tex_out}'")
+    return tex_out
+
+
+def workload_plot(csv_path, heatmap=False, show=False):
+    """Unreliability vs workload per aging rate (o mappa di colore) nella cartella del CSV"""
+    plt = _pyplot(show)
+    from .figures import render_figure, workload_spec
+    from .io import load_results
+
+    df = load_results(csv_path)
+    spec = workload_spec(df, heatmap)
+    # Path della cartella dove si trova il file CSV
+    csv_dir = os.path.dirname(os.path.abspath(csv_path))
+    output_path = os.path.join(csv_dir, spec.output_name(None, "png"))
+    render_figure(spec, df, plt.figure(), [output_path])
+    print(f"Grafico salvato come: {output_path}")
+    if show:
+        plt.show()
+    return output_path
+
+
+def transient_plot(csv_path, configuration=None, show=False):
+    """Curve nel tempo di una configurazione di un risultato transitorio, accanto al file"""
+    from pathlib import Path
+    plt = _pyplot(show)
+    from .figures import TRANSIENT, render_figure, transient_configuration
+    from .io import load_results
+
+    path = Path(csv_path).expanduser().resolve()
+    rows = transient_configuration(load_results(path), configuration)
+    if rows.empty:
+        raise SystemExit(f"Configurazione non presente nel file: {configuration}")
+    outpath = path.parent / TRANSIENT.output_name(path.stem, "pdf")
+    render_figure(TRANSIENT, rows, plt.figure(), [outpath])
+    print(f"✓ Plot salvato in: {outpath}")
+    if show:
+        plt.show()
+    return outpath
+
+
+def pareto_plot(csv_path, show=False):
+    """Politiche valutate da optimize_policy.py e loro fronte di Pareto, accanto al file"""
+    from pathlib import Path
+    plt = _pyplot(show)
+    from .figures import PARETO, render_figure
+    from .io import load_results
+
+    path = Path(csv_path).expanduser().resolve()
+    outpath = path.parent / PARETO.output_name(path.stem, "pdf")
+    render_figure(PARETO, load_results(path), plt.figure(), [outpath])
+    print(f"✓ Plot salvato in: {outpath}")
+    if show:
+        plt.show()
+    return outpath
+
+
+def trace_summary(paths, by=(), folded=None, chrome=None):
+    """Riepilogo per fase degli eventi di temporizzazione (albero, totali per fase e contatori)"""
+    from .traces import counter_summary, flame_summary, folded_stacks, load_events, nest, phase_totals, render_tree
+
+    events = load_events(paths)
+    spans = nest(events)
+    if not spans:
+        raise SystemExit("Nessuno span nei file di trace")
+    summary = flame_summary(spans, by)
+    print("\n".join(render_tree(summary)))
+    totals = phase_totals(spans)
+    overall = sum(totals.values()) or 1.
+    print("Tempo proprio per fase:")
+    for name, seconds in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f"  {name:<24} {seconds / 1e6:>10.3f} s {seconds / overall:>7.1%}")
+    counters = counter_summary(events, by)
+    if counters:
+        print("Contatori (n, totale, massimo):")
+        for (group, name, key), (count, total, largest) in sorted(counters.items(), key=lambda item: item[0][1:]):
+            prefix = f"[{', '.join(group)}] " if group else ""
+            print(f"  {prefix}{name}.{key}: {count}, {total:.6g}, {largest:.6g}")
+    if folded:
+        with open(folded, "w", encoding="utf-8") as f:
+            f.write("\n".join(folded_stacks(summary)) + "\n")
+        print(f"Stack aggregati salvati in: {folded}")
+    if chrome:
+        from .traces import write_chrome
+        write_chrome(events, chrome)
+        print(f"Trace Chrome salvato in: {chrome}")
+    return summary
+
+
+SUBCOMMANDS = ("plot", "logplot", "table", "aging2d", "transient", "pareto", "trace")
+# scripts calling the subcommands, checked by startup as well
+SCRIPTS = ("table_tex_generator.py", "unreliability_unavailability_plot.py",
+           "unreliability_unavailability_plot_logscale.py", "workload-aging2d.py")
+
+
+def startup_check(repeat=5):
+    """Best start-up time of ``--help`` over ``repeat`` fresh interpreters
+
+    Every subcommand and every script of ``SCRIPTS`` is timed. Returns
+    ``{subcommand or script: (seconds, heavy modules imported)}``.
+    """
+    report = f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules), file=sys.stderr)"
+    probes = {"module": ("import sys, runpy; sys.argv = ['sar-results', sys.argv[1], '--help']\n"
+                         "try:\n    runpy.run_module('sarresults', run_name='__main__')\n"
+                         f"except SystemExit:\n    pass\n{report}"),
+              "script": ("import sys, runpy; sys.argv = [sys.argv[1], '--help']\n"
+                         "try:\n    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+                         f"except SystemExit:\n    pass\n{report}")}
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    targets = [(command, probes["module"]) for command in SUBCOMMANDS]
+    targets += [(script, probes["script"]) for script in SCRIPTS]
+    results = {}
+    for target, probe in targets:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            done = subprocess.run([sys.executable, "-c", probe, target], cwd=cwd, capture_output=True, text=True,
+                                  check=True)
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        heavy = [m for m in done.stderr.strip().split(",") if m]
+        results[target] = (best, heavy)
+    return results
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="sar-results", description="Grafici e tabelle dei risultati delle analisi")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("plot", "Unreliability vs Unavailability delle coppie Joined e AxBy"),
+                            ("logplot", "Come plot, con Unreliability in scala logaritmica")):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument("csv_file", help="Path al CSV di input")
+        command.add_argument("--show", action="store_true", help="Mostra il grafico a video (backend interattivo)")
+        command.add_argument("--time", type=float,
+                             help="Istante di un risultato transitorio (default: l'ultimo della griglia)")
+        command.add_argument("--interval", action="store_true",
+                             help="Su un risultato transitorio usa le medie su [0, time]")
+
+    command = commands.add_parser("table", help="Tabella LaTeX dei risultati",
+                                  description="Tabella LaTeX dei risultati")
+    command.add_argument("csv_path", help="File dei risultati (CSV, NDJSON, Parquet o Arrow)")
+
+    command = commands.add_parser("aging2d", help="Unreliability vs workload per aging rate",
+                                  description="Unreliability vs workload per aging rate")
+    command.add_argument("csv_path", help="Percorso al file CSV con i dati")
+    command.add_argument("--heatmap", action="store_true",
+                         help="Mappa di colore su arrival rate e aging rate (automatica con più di 10 aging rate)")
+    command.add_argument("--show", action="store_true", help="Mostra il grafico a video (backend interattivo)")
+
+    command = commands.add_parser("transient", help="Curve nel tempo di un risultato transitorio",
+                                  description="Unreliability, Unavailability e primo guasto nel tempo")
+    command.add_argument("csv_path", help="File transientResults (CSV, NDJSON, Parquet o Arrow)")
+    command.add_argument("--configuration",
+                         help="Configurazione da disegnare (default: quella con più endpoint, es. A+B)")
+    command.add_argument("--show", action="store_true", help="Mostra il grafico a video (backend interattivo)")
+
+    command = commands.add_parser("pareto", help="Fronte di Pareto delle politiche di ringiovanimento",
+                                  description="Unreliability vs Unavailability delle politiche valutate")
+    command.add_argument("csv_path", help="File policyResults (CSV, NDJSON, Parquet o Arrow)")
+    command.add_argument("--show", action="store_true", help="Mostra il grafico a video (backend interattivo)")
+
+    command = commands.add_parser("trace", help="Riepilogo per fase degli eventi di temporizzazione",
+                                  description="Albero delle fasi (tempo totale e proprio) dei file di trace "
+                                              "scritti con --trace o -Dsar.trace")
+    command.add_argument("trace_files", nargs="+", help="File di trace (JSON lines o Chrome trace)")
+    command.add_argument("--by", action="append", default=[],
+                         help="Etichetta per cui separare il riepilogo, es. replicas o configuration (ripetibile)")
+    command.add_argument("--folded", help="Scrive gli stack aggregati (flamegraph.pl, speedscope)")
+    command.add_argument("--chrome", help="Scrive gli eventi come un file per chrome://tracing o Perfetto")
+
+    command = commands.add_parser("startup", help=f"Misura l'avvio dei sottocomandi (budget {STARTUP_BUDGET} s)",
+                                  description="Misura l'avvio dei sottocomandi in interpreti nuovi")
+    command.add_argument("--budget", type=float, default=STARTUP_BUDGET,
+                         help=f"Secondi massimi per sottocomando (default: {STARTUP_BUDGET})")
+    command.add_argument("--repeat", type=int, default=5, help="Ripetizioni, si tiene la migliore (default: 5)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command in ("plot", "logplot"):
+        reliability_plot(args.csv_file, show=args.show, log=args.command == "logplot", time=args.time,
+                         interval=args.interval)
+    elif args.command == "table":
+        latex_table(args.csv_path)
+    elif args.command == "aging2d":
+        workload_plot(args.csv_path, heatmap=args.heatmap, show=args.show)
+    elif args.command == "transient":
+        transient_plot(args.csv_path, configuration=args.configuration, show=args.show)
+    elif args.command == "pareto":
+        pareto_plot(args.csv_path, show=args.show)
+    elif args.command == "trace":
+        trace_summary(args.trace_files, tuple(args.by), folded=args.folded, chrome=args.chrome)
+    else:
+        failed = False
+        for command, (seconds, heavy) in startup_check(args.repeat).items():
+            over = seconds > args.budget or bool(heavy)
+            failed = failed or over
+            imported = f", importa {', '.join(heavy)}" if heavy else ""
+            print(f"{command}: {seconds * 1000:.0f} ms{imported}{' (FUORI BUDGET)' if over else ''}")
+        print(f"Budget: {args.budget * 1000:.0f} ms")
+        return 1 if failed else 0
+    return 0
@@ -0,0 +1,305 @@
+"""Result figures, drawn into a caller-provided Matplotlib figure.
+
+Every figure is described by a ``FigureSpec`` (size, rc style, drawing
+function, ``savefig`` options and output name). ``render_figure`` clears the
+figure it is given, draws the data once and saves it in every requested
+format, so the plotting scripts and ``render_all.py`` produce the same files
+and a batch can keep reusing one figure per kind.
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
+from matplotlib.ticker import FixedLocator, FuncFormatter
+
+from .pairs import configuration_pairs, index_results, joined_configurations, pair_records
+
+# colors of the AxBy pairs in the log-scale plot (the joined pair is blue)
+LOG_PALETTE = [
+    "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728",
+    "#9467bd", "#8c564b", "#e377c2", "#7f7f7f",
+    "#bcbd22", "#17becf"
+]
+
+# above this many aging rates the workload curves are drawn as a heatmap
+MAX_WORKLOAD_CURVES = 10
+
+
+class FigureSpec:
+    """How to draw and save one kind of result figure"""
+
+    def __init__(self, name, output, figsize, draw, style=None, **savefig):
+        self.name = name
+        self.output = output
+        self.figsize = figsize
+        self.draw = draw
+        self.style = style or {}
+        self.savefig = savefig
+
+    def output_name(self, stem, fmt):
+        return f"{self.output.format(stem=stem)}.{fmt}"
+
+
+def reliability_pairs(df, joined=None):
+    """Joined and split pairs of ``joined`` (by default the first joined configuration of two
+    endpoints, e.g. 'A+B'), with 'Unreliability' in each endpoint row
+
+    Splits without single-endpoint rows are left out; raises ``ValueError`` if
+    there is no joined configuration.
+    """
+    df = df.copy()
+    df['Unreliability'] = df['Reliability']
+    indexed = index_results(df)
+    if joined is None:
+        joined = next(iter(joined_configurations(indexed)), None)
+    try:
+        if joined is None:
+            raise KeyError(joined)
+        return pair_records(configuration_pairs(indexed, joined), joined)
+    except KeyError:
+        raise ValueError("CSV deve contenere una configurazione congiunta di due endpoint (es. 'A+B').")
+
+
+def sparse_ticks(values, max_ticks):
+    """Every N-th of the sorted ``values`` (always keeping the last) if there are more than ``max_ticks``"""
+    values = sorted(values)
+    if len(values) <= max_ticks:
+        return values
+    ticks = values[::max(1, len(values) // max_ticks)]
+    if values[-1] not in ticks:
+        ticks.append(values[-1])
+    return ticks
+
+
+def pick_sparse_ticks(values, min_distance=0.15):
+    """Restituisce solo i valori abbastanza lontani (scala logaritmica) per asse X"""
+    sparse = []
+    last = None
+    for v in sorted(values):
+        if last is None or abs(np.log10(v) - np.log10(last)) > min_distance:
+            sparse.append(v)
+            last = v
+    return sparse
+
+
+def _pair_values(pairs):
+    x_values, y_values = set(), set()
+    for p in pairs:
+        for endpoint in p["endpoints"]:
+            x_values.add(p[endpoint]["Unreliability"])
+            y_values.add(p[endpoint]["Unavailability"])
+    return x_values, y_values
+
+
+def _draw_pairs(ax, pairs, colors, linewidth, label_size, label_offset):
+    """Segments between the two endpoints of every pair, their points and labels; returns the legend
+    handles and labels"""
+    for p, c in zip(pairs, colors):
+        a, b = (p[endpoint] for endpoint in p["endpoints"])
+        ax.plot([a["Unreliability"], b["Unreliability"]], [a["Unavailability"], b["Unavailability"]],
+                color=c, linewidth=linewidth, alpha=0.5, zorder=1)
+    for p, c in zip(pairs, colors):
+        a, b = (p[endpoint] for endpoint in p["endpoints"])
+        ax.scatter(a["Unreliability"], a["Unavailability"],
+                   color=c, s=120, zorder=5, edgecolors='white', linewidth=1)
+        ax.scatter(b["Unreliability"], b["Unavailability"],
+                   color=c, facecolors='none', edgecolors=c, s=120, linewidth=2.5, zorder=5)
+    legend_handles, legend_labels = [], []
+    for p, c in zip(pairs, colors):
+        first, second = p["endpoints"]
+        for endpoint, size, offset in ((first, p["a_size"], label_offset), (second, p["b_size"], (6, 6))):
+            ax.annotate(f"{endpoint}{size}", (p[endpoint]["Unreliability"], p[endpoint]["Unavailability"]),
+                        color=c, fontsize=label_size, fontweight="bold", zorder=10,
+                        xytext=offset, textcoords="offset points",
+                        bbox=dict(boxstyle="round,pad=0.2", facecolor="white", alpha=0.9,
+                                  edgecolor=c, linewidth=1.2))
+        legend_handles.append(Line2D([0], [0], marker='o', color=c, linestyle='-',
+                                     markersize=8, linewidth=1))
+        legend_labels.append(p["name"])
+    return legend_handles, legend_labels
+
+
+def draw_reliability(fig, pairs):
+    """Unreliability vs Unavailability of the pairs (``unreliability_unavailability_plot.py``)"""
+    colors = plt.cm.tab10(np.linspace(0, 1, pairs[0]["a_size"]))
+    colors = ["blue"] + [colors[i % len(colors)] for i in range(len(pairs) - 1)]
+    x_values, y_values = _pair_values(pairs)
+
+    ax = fig.subplots()
+    legend_handles, legend_labels = _draw_pairs(ax, pairs, colors, 1.0, 10, (-8, -6))
+    ax.set_xlabel("Unreliability", fontsize=13, fontweight="bold")
+    ax.set_ylabel("Unavailability", fontsize=13, fontweight="bold")
+    ax.grid(True, linestyle="--", alpha=0.2, zorder=0)
+
+    x_ticks = sparse_ticks(x_values, 6)
+    y_ticks = sparse_ticks(y_values, 5)
+    ax.set_xticks(x_ticks)
+    ax.set_yticks(y_ticks)
+    ax.set_xticklabels([f"{x:.5f}" for x in x_ticks], fontsize=9, rotation=45, ha='right')
+    ax.set_yticklabels([f"{y:.5f}" for y in y_ticks], fontsize=9)
+
+    ax.legend(legend_handles, legend_labels,
+              loc="center left", bbox_to_anchor=(1.02, 0.5),
+              fontsize=11, frameon=True, fancybox=True, shadow=True)
+    fig.subplots_adjust(bottom=0.15, right=0.82, top=0.92)
+
+
+def draw_reliability_log(fig, pairs):
+    """Unreliability (log scale) vs Unavailability of the pairs (``unreliability_unavailability_plot_logscale.py``)"""
+    palette = LOG_PALETTE
+    while len(palette) < pairs[0]["a_size"]:
+        palette = palette + palette
+    palette = palette[:pairs[0]["a_size"]]
+    colors = ["blue"] + [palette[i % len(palette)] for i in range(len(pairs) - 1)]
+    x_values, y_values = _pair_values(pairs)
+    chosen_x_ticks = pick_sparse_ticks(x_values, min_distance=0.015)
+
+    ax = fig.subplots()
+    legend_handles, legend_labels = _draw_pairs(ax, pairs, colors, 2.5, 16, (-15, -15))
+
+    # Configura assi SOLO con i nostri tick!
+    ax.set_xscale('log')
+    ax.set_xticks(chosen_x_ticks, minor=False)
+    ax.set_xticks([], minor=True)
+    ax.xaxis.set_major_locator(FixedLocator(chosen_x_ticks))
+    ax.xaxis.set_major_formatter(FuncFormatter(lambda x, _: "{:.5f}".format(x) if x else ""))
+    ax.set_xticklabels([f"{x:.5f}" for x in chosen_x_ticks], rotation=45, ha='right')
+    ax.set_xlabel("Unreliability (Log Scale)", fontsize=18, fontweight="bold")
+    ax.set_ylabel("Unavailability", fontsize=18, fontweight="bold")
+    ax.grid(True, which="both", linestyle="--", alpha=0.2, zorder=0)
+
+    y_ticks = sparse_ticks(y_values, 5)
+    ax.set_yticks(y_ticks)
+    ax.set_yticklabels([f"{y:.5f}" for y in y_ticks], fontsize=18)
+
+    ax.legend(legend_handles, legend_labels,
+              loc="center left", bbox_to_anchor=(1.02, 0.5),
+              fontsize=16, frameon=True, fancybox=True, shadow=True)
+    fig.subplots_adjust(bottom=0.20, right=0.82, top=0.95)
+
+
+def draw_workload(fig, df):
+    """Unreliability vs arrival rate, one curve per aging rate (``workload-aging2d.py``)"""
+    ax = fig.subplots()
+    for ar in sorted(df["Aging Rate"].unique()):
+        mask = df["Aging Rate"] == ar
+        ax.plot(df[mask]["Arrival Rate"], df[mask]["Unreliability"], marker="o", label=f"Aging Rate = {ar}")
+    ax.set_xlabel("Arrival Rate (Workload)")
+    ax.set_ylabel("Unreliability")
+    ax.set_title("Unreliability vs Workload for different Aging Rates")
+    ax.legend(title="Aging Rate")
+    ax.grid(True, which='both', linestyle='--', alpha=0.6)
+    fig.tight_layout()
+
+
+def draw_workload_heatmap(fig, df):
+    """Unreliability over arrival rate and aging rate (``workload-aging2d.py --heatmap``)"""
+    grid = df.pivot_table(index="Aging Rate", columns="Arrival Rate", values="Unreliability")
+    ax = fig.subplots()
+    mesh = ax.pcolormesh(grid.columns, grid.index, grid.values, shading="nearest")
+    fig.colorbar(mesh, ax=ax, label="Unreliability")
+    ax.set_xlabel("Arrival Rate (Workload)")
+    ax.set_ylabel("Aging Rate")
+    ax.set_title("Unreliability vs Workload and Aging Rate")
+    fig.tight_layout()
+
+
+def at_time(df, time=None, interval=False):
+    """Rows of a transient result at the grid time closest to ``time`` (the last one if None)
+
+    With ``interval=True`` Reliability and Unavailability are the averages over
+    ``[0, Time]``. The result has the analysisResults layout, so it can be
+    passed to ``reliability_pairs``.
+    """
+    times = df["Time"].unique()
+    chosen = times.max() if time is None else times[np.abs(times - time).argmin()]
+    rows = df[df["Time"] == chosen].drop(columns="Time")
+    if interval:
+        rows = rows.assign(Reliability=rows["Interval Reliability"], Unavailability=rows["Interval Unavailability"])
+    return rows.reset_index(drop=True)
+
+
+def transient_configuration(df, configuration=None):
+    """Rows of ``configuration`` (by default the one with most endpoints on the whole pool)"""
+    if configuration is None:
+        widest = df.assign(width=df["Configuration"].str.count(r"\+"))
+        widest = widest.sort_values(["width", "Pool Size"], kind="stable").iloc[-1]
+        configuration, pool_size = widest["Configuration"], widest["Pool Size"]
+    else:
+        pool_size = df.loc[df["Configuration"] == configuration, "Pool Size"].max()
+    return df[(df["Configuration"] == configuration) & (df["Pool Size"] == pool_size)]
+
+
+def draw_transient(fig, df):
+    """Unreliability and Unavailability over time per endpoint (dashed: averages over [0, t])
+    and probability of the first failure, for one configuration"""
+    axes = fig.subplots(3, 1, sharex=True)
+    title = f"{df['Configuration'].iloc[0]} ({df['Pool Size'].iloc[0]} replicas)"
+    for endpoint, rows in df.groupby("Endpoint", sort=True):
+        for ax, column in zip(axes, ("Reliability", "Unavailability")):
+            line, = ax.plot(rows["Time"], rows[column], label=f"{endpoint}")
+            ax.plot(rows["Time"], rows[f"Interval {column}"], linestyle="--", color=line.get_color(),
+                    label=f"{endpoint} (average over [0, t])")
+    first = df.drop_duplicates("Time")
+    axes[2].plot(first["Time"], first["First Failure"], color="black")
+    axes[0].set_ylabel("Unreliability")
+    axes[1].set_ylabel("Unavailability")
+    axes[2].set_ylabel("P(first failure ≤ t)")
+    axes[2].set_xlabel("Time")
+    axes[0].set_title(title)
+    axes[0].legend(fontsize=9)
+    for ax in axes:
+        ax.grid(True, linestyle="--", alpha=0.4)
+    fig.tight_layout()
+
+
+def draw_pareto(fig, df):
+    """Unreliability vs Unavailability of the evaluated policies, with their Pareto front and the best one"""
+    ax = fig.subplots()
+    feasible = df[df["Feasible"] == 1]
+    infeasible = df[df["Feasible"] == 0]
+    ax.scatter(feasible["Unreliability"], feasible["Unavailability"], color="gray", s=20, alpha=0.6,
+               label="Feasible policies")
+    if len(infeasible):
+        ax.scatter(infeasible["Unreliability"], infeasible["Unavailability"], color="gray", marker="x", s=20,
+                   alpha=0.6, label="Infeasible policies")
+    front = df[df["Pareto"] == 1].sort_values("Unreliability")
+    ax.plot(front["Unreliability"], front["Unavailability"], color="blue", marker="o", linewidth=1.5,
+            label="Pareto front")
+    if len(feasible):
+        best = feasible.loc[feasible["Objective"].idxmin()]
+        ax.scatter([best["Unreliability"]], [best["Unavailability"]], color="red", marker="*", s=250, zorder=5,
+                   label=(f"Best: repair {best['Repair Rate']:.3g}, rejuvenation {best['Rejuvenation Rate']:.3g}, "
+                          f"FP {best['False Positive Prob']:.3g}, FN {best['False Negative Prob']:.3g}"))
+    ax.set_xlabel("Unreliability", fontsize=13, fontweight="bold")
+    ax.set_ylabel("Unavailability", fontsize=13, fontweight="bold")
+    ax.grid(True, linestyle="--", alpha=0.2, zorder=0)
+    ax.legend(fontsize=10)
+    fig.tight_layout()
+
+
+RELIABILITY = FigureSpec("reliability", "{stem}_reliability_plot", (14, 9), draw_reliability,
+                         bbox_inches='tight', dpi=300, facecolor='white')
+RELIABILITY_LOG = FigureSpec("reliability-log", "{stem}_reliability_clean_plot", (14, 9), draw_reliability_log,
+                             style={'font.size': 18}, bbox_inches='tight', dpi=300, facecolor='white')
+WORKLOAD = FigureSpec("workload", "reliability_vs_workload", (10, 6), draw_workload, dpi=300)
+WORKLOAD_HEATMAP = FigureSpec("workload-heatmap", "reliability_heatmap", (10, 6), draw_workload_heatmap, dpi=300)
+PARETO = FigureSpec("pareto", "{stem}_pareto_plot", (10, 7), draw_pareto, bbox_inches='tight', dpi=300)
+TRANSIENT = FigureSpec("transient", "{stem}_transient_plot", (10, 10), draw_transient, bbox_inches='tight', dpi=300)
+
+
+def workload_spec(df, heatmap=False):
+    """Curves, or the heatmap if requested or with more than ``MAX_WORKLOAD_CURVES`` aging rates"""
+    if heatmap or df["Aging Rate"].nunique() > MAX_WORKLOAD_CURVES:
+        return WORKLOAD_HEATMAP
+    return WORKLOAD
+
+
+def render_figure(spec, data, fig, paths):
+    """Clear ``fig``, draw ``data`` as ``spec`` once and save it to every path in ``paths``"""
+    with plt.rc_context(spec.style):
+        fig.clear()
+        fig.set_size_inches(spec.figsize)
+        spec.draw(fig, data)
+        for path in paths:
+            fig.savefig(path, **spec.savefig)
+    return paths
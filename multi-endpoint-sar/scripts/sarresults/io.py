@@ -0,0 +1,150 @@
+"""Result files of the analyses: a buffered writer and a format-agnostic loader.
+
+CSV keeps the layout of the Java analyses. NDJSON (``.ndjson``/``.jsonl``)
+writes one JSON object per row. Both are line formats that can be followed
+while they grow (see ``stream.ResultTail``). Parquet (``.parquet``) and Arrow
+IPC (``.arrow``/``.feather``) files store typed columns plus the analysis
+parameters as schema metadata, and need ``pyarrow``.
+"""
+import csv
+import json
+from pathlib import Path
+
+ANALYSIS_SCHEMA = [("Endpoint", str), ("Configuration", str), ("Pool Size", int), ("Reliability", float),
+                   ("Unavailability", float), ("Aging Contribution", float), ("Resource Usage", float)]
+WORKLOAD_SCHEMA = [("Arrival Rate", float), ("Aging Rate", float), ("Unreliability", float)]
+# analysisResults rows at each time of the grid, plus averages over [0, Time] and P(first failure <= Time)
+TRANSIENT_SCHEMA = ([("Time", float)] + ANALYSIS_SCHEMA
+                    + [("Interval Reliability", float), ("Interval Unavailability", float), ("First Failure", float)])
+# analysisResults rows of the groups of each Pareto-optimal deployment, with the totals of the deployment
+PARTITION_SCHEMA = ([("Deployment", str)] + ANALYSIS_SCHEMA
+                    + [("Total Unreliability", float), ("Total Unavailability", float)])
+# one row per evaluated rejuvenation policy; Pareto marks the (Unreliability, Unavailability) front
+POLICY_SCHEMA = [("Repair Rate", float), ("Rejuvenation Rate", float), ("False Positive Prob", float),
+                 ("False Negative Prob", float), ("Unreliability", float), ("Unavailability", float),
+                 ("Resource Usage", float), ("Objective", float), ("Feasible", int), ("Pareto", int)]
+# half-widths of the confidence intervals of simulated analysisResults rows
+CONFIDENCE_SCHEMA = ANALYSIS_SCHEMA[:3] + [(f"{name} CI", float) for name, _ in ANALYSIS_SCHEMA[3:]]
+
+PARAMETERS_KEY = b"sar.parameters"
+
+_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".parquet": "parquet", ".arrow": "arrow",
+            ".feather": "arrow"}
+
+# formats whose rows are readable as soon as they are flushed
+STREAMABLE_FORMATS = ("csv", "ndjson")
+
+
+def result_format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix not in _FORMATS:
+        raise ValueError(f"Formato non supportato: {suffix} (usare .csv, .ndjson, .parquet o .arrow)")
+    return _FORMATS[suffix]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("pyarrow è necessario per i file Parquet/Arrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def _arrow_type(pa, python_type):
+    return {str: pa.string(), int: pa.int64(), float: pa.float64()}[python_type]
+
+
+class ResultSink:
+    """Writes result rows through one open handle, buffering ``batch_size`` rows at a time
+
+    ``schema`` is a list of ``(column, type)`` pairs; rows are sequences in the
+    same order. ``parameters`` are stored as metadata by the columnar formats.
+    """
+
+    def __init__(self, path, schema, parameters=None, batch_size=1024):
+        self.path = Path(path)
+        self.schema = schema
+        self.format = result_format(path)
+        self.batch_size = batch_size
+        self._buffer = []
+        if self.format == "csv":
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._csv = csv.writer(self._file, lineterminator="\n")
+            self._csv.writerow([name for name, _ in schema])
+            return
+        if self.format == "ndjson":
+            self._file = open(self.path, "w", encoding="utf-8")
+            return
+        pa = _require_pyarrow()
+        metadata = {PARAMETERS_KEY: json.dumps(parameters or {}).encode("utf-8")}
+        self._arrow_schema = pa.schema([(name, _arrow_type(pa, t)) for name, t in schema], metadata=metadata)
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, self._arrow_schema)
+        else:
+            self._writer = pa.ipc.new_file(str(self.path), self._arrow_schema)
+
+    def add_row(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def add_rows(self, rows):
+        for row in rows:
+            self.add_row(row)
+
+    def flush(self):
+        if self.format == "csv":
+            self._csv.writerows(self._buffer)
+            self._file.flush()
+        elif self.format == "ndjson":
+            names = [name for name, _ in self.schema]
+            self._file.writelines(json.dumps(dict(zip(names, row))) + "\n" for row in self._buffer)
+            self._file.flush()
+        elif self._buffer:
+            pa = _require_pyarrow()
+            columns = list(zip(*self._buffer))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, self._arrow_schema)],
+                schema=self._arrow_schema)
+            if self.format == "parquet":
+                self._writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                self._writer.write_batch(batch)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        if self.format in STREAMABLE_FORMATS:
+            self._file.close()
+        else:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_results(path):
+    """Load a result file as a DataFrame; columnar parameters go to ``df.attrs['parameters']``"""
+    import pandas as pd
+
+    fmt = result_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path)
+    if fmt == "ndjson":
+        return pd.read_json(path, lines=True, dtype=False)
+    pa = _require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    df = table.to_pandas()
+    metadata = table.schema.metadata or {}
+    if PARAMETERS_KEY in metadata:
+        df.attrs["parameters"] = json.loads(metadata[PARAMETERS_KEY])
+    return df
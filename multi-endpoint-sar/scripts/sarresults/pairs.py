@@ -0,0 +1,89 @@
+"""Pairing of split and joined replica-set configurations.
+
+For a joined configuration such as ``A+B`` on N replicas, the alternative
+deployments are the splits A{k}B{N-k}: endpoint A alone on k replicas and B
+alone on N-k replicas. The result set is indexed once by (Configuration,
+Endpoint, Pool Size) and all splits are found with one aligned lookup of the
+second endpoint at N - k, instead of filtering the whole table per pair.
+"""
+import pandas as pd
+
+KEY = ["Configuration", "Endpoint", "Pool Size"]
+
+
+def index_results(df):
+    """Result set indexed by (Configuration, Endpoint, Pool Size)"""
+    return df.set_index(KEY).sort_index()
+
+
+def joined_configurations(indexed):
+    """Joined configurations of two endpoints ('A+B') present in the result set"""
+    configurations = indexed.index.get_level_values("Configuration").unique()
+    return [c for c in configurations if len(c.split("+")) == 2]
+
+
+def joined_pool_size(indexed, joined="A+B"):
+    return int(indexed.loc[joined].index.get_level_values("Pool Size")[0])
+
+
+def _single_rows(indexed, endpoint):
+    """Rows of ``endpoint`` alone, by pool size (none if it was not run alone)"""
+    try:
+        rows = indexed.xs((endpoint, endpoint), level=("Configuration", "Endpoint"))
+    except KeyError:
+        return indexed.iloc[:0].droplevel(["Configuration", "Endpoint"])
+    return rows[~rows.index.duplicated()]
+
+
+def configuration_pairs(indexed, joined="A+B", pool_size=None, include_joined=True):
+    """One row per deployment of the two endpoints of ``joined`` on ``pool_size`` replicas
+
+    Rows are the joined deployment (named 'Joined', if ``include_joined``) and
+    the splits named e.g. 'A3B5', by increasing size of the first endpoint.
+    Columns are ``Pair`` and every result column suffixed with ``_<endpoint>``,
+    ``Pool Size_<endpoint>`` included. ``pool_size`` defaults to the one of
+    ``joined``; raises ``KeyError`` if ``joined`` is not in the result set.
+    Splits whose single-endpoint rows are missing are left out, e.g. all of
+    them for a result set of joined rows only.
+    """
+    first, second = joined.split("+")
+    if pool_size is None:
+        pool_size = joined_pool_size(indexed, joined)
+    rows_first = _single_rows(indexed, first)
+    rows_second = _single_rows(indexed, second)
+    rows_first = rows_first[(rows_first.index > 0) & (rows_first.index < pool_size)]
+    partners = rows_second.reindex(pool_size - rows_first.index)
+    found = partners.notna().all(axis=1).to_numpy()
+
+    def side(rows, endpoint):
+        rows = rows.reset_index()
+        return rows.add_suffix(f"_{endpoint}")
+
+    splits = pd.concat([side(rows_first[found], first), side(partners[found].rename_axis("Pool Size"), second)],
+                       axis=1)
+    splits.insert(0, "Pair", [f"{first}{a}{second}{b}" for a, b in
+                              zip(splits[f"Pool Size_{first}"], splits[f"Pool Size_{second}"])])
+    if not include_joined:
+        return splits
+    joined_rows = indexed.loc[joined].xs(pool_size, level="Pool Size")
+    joined_row = {"Pair": "Joined", f"Pool Size_{first}": pool_size, f"Pool Size_{second}": pool_size}
+    for endpoint in (first, second):
+        joined_row.update({f"{col}_{endpoint}": v for col, v in joined_rows.loc[endpoint].items()})
+    return pd.concat([pd.DataFrame([joined_row]), splits], ignore_index=True)[splits.columns]
+
+
+def pair_records(pairs, joined="A+B"):
+    """Pairs as dicts ``{'name', 'endpoints', 'a_size', 'b_size', <first>: {...}, <second>: {...}}``
+
+    ``endpoints`` is ``(first, second)`` and ``a_size``, ``b_size`` their pool sizes.
+    """
+    first, second = joined.split("+")
+    records = []
+    for row in pairs.to_dict("records"):
+        record = {"name": row["Pair"], "endpoints": (first, second), "a_size": int(row[f"Pool Size_{first}"]),
+                  "b_size": int(row[f"Pool Size_{second}"])}
+        for endpoint in (first, second):
+            suffix = f"_{endpoint}"
+            record[endpoint] = {col[:-len(suffix)]: v for col, v in row.items() if col.endswith(suffix)}
+        records.append(record)
+    return records
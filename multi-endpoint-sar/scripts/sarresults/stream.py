@@ -0,0 +1,63 @@
+"""Following result files while an analysis is still writing them.
+
+The Python analyses flush every row of CSV and NDJSON result files as soon
+as it is computed; the Java ones only write CSV, flushed in batches and at
+the end of every configuration (``ResultWriter``). ``ResultTail`` remembers
+how far it has read and on every ``poll`` returns only the complete rows
+appended since then, typed according to the result schemas of ``io``.
+"""
+import csv
+import json
+from pathlib import Path
+
+from .io import (ANALYSIS_SCHEMA, CONFIDENCE_SCHEMA, PARTITION_SCHEMA, POLICY_SCHEMA, STREAMABLE_FORMATS,
+                 TRANSIENT_SCHEMA, WORKLOAD_SCHEMA, result_format)
+
+COLUMN_TYPES = dict(ANALYSIS_SCHEMA + WORKLOAD_SCHEMA + TRANSIENT_SCHEMA + POLICY_SCHEMA + PARTITION_SCHEMA
+                    + CONFIDENCE_SCHEMA)
+
+
+def _typed(row):
+    return {col: COLUMN_TYPES.get(col, str)(value) for col, value in row.items()}
+
+
+class ResultTail:
+    """Incremental reader of a growing CSV or NDJSON result file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.format = result_format(path)
+        if self.format not in STREAMABLE_FORMATS:
+            raise ValueError(f"Solo i file CSV e NDJSON possono essere seguiti: {self.path}")
+        self.header = None
+        self.rows = 0
+        self._offset = 0
+        self._partial = b""
+
+    def poll(self):
+        """New complete rows since the last call (empty if the file did not grow)"""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return []
+        if size < self._offset:
+            # rewritten from scratch (e.g. a new run on the same path): start over
+            self.header, self.rows, self._offset, self._partial = None, 0, 0, b""
+        if size == self._offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = self._partial + f.read(size - self._offset)
+        self._offset = size
+        # the last line may still be half written
+        *lines, self._partial = data.split(b"\n")
+        lines = [line.decode("utf-8") for line in lines if line.strip()]
+        if self.format == "ndjson":
+            rows = [_typed(json.loads(line)) for line in lines]
+        else:
+            if self.header is None and lines:
+                self.header = next(csv.reader(lines[:1]))
+                lines = lines[1:]
+            rows = [_typed(dict(zip(self.header, values))) for values in csv.reader(lines)]
+        self.rows += len(rows)
+        return rows
@@ -0,0 +1,61 @@
+"""LaTeX rendering of result tables, shared by ``table_tex_generator.py``,
+``watch_results.py`` and ``render_all.py``."""
+import csv
+
+LATEX_TABLE_HEAD = r"""\begin{table}[htb]
+\centering
+\begin{tabular}{l c c c c c c}
+\toprule
+"""
+
+LATEX_TABLE_FOOT = r"""\bottomrule
+\end{tabular}
+\caption{Table generated from CSV.}
+\label{tab:model_params}
+\end{table}
+"""
+
+TRUNCATED_COLUMNS = ("Reliability", "Unavailability", "Aging Contribution", "Resource Usage")
+
+
+def truncate_float(val, digits=3):
+    """Restituisce il valore numerico troncato a 'digits' decimali."""
+    try:
+        f = float(val)
+        return f"{f:.{digits}f}"
+    except Exception:
+        return val
+
+
+def header_line(headers):
+    return ' & '.join(headers) + r' \\'
+
+
+def row_line(row, headers):
+    """Riga LaTeX di un risultato: le colonne numeriche sono troncate a 3 decimali"""
+    row_data = []
+    for col in headers:
+        if col in TRUNCATED_COLUMNS:
+            val = truncate_float(row[col], 3)
+        else:
+            val = str(row[col])
+        row_data.append(val)
+    return ' & '.join(row_data) + r" \\"
+
+
+def render_table(headers, row_lines):
+    """Tabella completa a partire dalle righe già renderizzate"""
+    return "\n".join([LATEX_TABLE_HEAD, header_line(headers), r"\midrule", *row_lines, LATEX_TABLE_FOOT])
+
+
+def read_rows(path):
+    """Header e righe del file dei risultati (CSV, oppure NDJSON/Parquet/Arrow via sarresults.io)"""
+    path = str(path)
+    if path.lower().endswith(".csv"):
+        with open(path, newline='', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile)
+            # Usa gli header esattamente come nel file
+            return reader.fieldnames, list(reader)
+    from .io import load_results
+    df = load_results(path)
+    return list(df.columns), [{col: str(val) for col, val in row.items()} for row in df.to_dict("records")]
@@ -0,0 +1,184 @@
+"""Per-phase summaries of the timing events of the analyses.
+
+The Python analyses (``replicaset.trace``, ``SAR_TRACE``/``--trace``) and the
+Java ones (``-Dsar.trace=...``) write Chrome trace events, one JSON object
+per line: ``"X"`` spans with their labels in ``args`` and ``"C"`` counters
+with their labels in ``labels``. Spans are nested by time containment within
+each process and thread, so every span gets its stack (``point;solve``) and
+its self time (duration minus that of its children). Summing the spans of a
+whole sweep by stack gives a flame summary, printed as a tree or written as
+folded stacks (``flamegraph.pl``, speedscope); ``--by`` splits it by labels
+such as ``replicas``. Only the standard library is used.
+"""
+import json
+from collections import defaultdict
+
+
+class Span:
+    __slots__ = ("name", "start", "duration", "process", "labels", "stack", "self_time")
+
+    def __init__(self, event):
+        self.name = event["name"]
+        self.start = float(event["ts"])
+        self.duration = float(event.get("dur", 0.))
+        self.process = (event.get("pid"), event.get("tid"))
+        self.labels = event.get("args") or {}
+        self.stack = (self.name,)
+        self.self_time = self.duration
+
+    @property
+    def end(self):
+        return self.start + self.duration
+
+
+def load_events(paths):
+    """Events of trace files: JSON lines, a JSON array or a ``{"traceEvents": [...]}`` object
+
+    A line cut by a process still writing (the last one) is skipped.
+    """
+    events = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        stripped = text.lstrip()
+        if stripped.startswith("[") or stripped.startswith("{\"traceEvents\""):
+            try:
+                data = json.loads(stripped)
+            except json.JSONDecodeError:
+                # Chrome allows an array without the closing bracket
+                data = json.loads(stripped.rstrip().rstrip(",") + "]")
+            events.extend(data["traceEvents"] if isinstance(data, dict) else data)
+            continue
+        for line in text.splitlines():
+            if line.strip():
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return events
+
+
+def nest(events):
+    """Spans of the ``"X"`` events, with their stack and self time"""
+    spans = [Span(event) for event in events if event.get("ph") == "X"]
+    by_process = defaultdict(list)
+    for span in spans:
+        by_process[span.process].append(span)
+    for process_spans in by_process.values():
+        # parents first: earlier start, then longer duration
+        process_spans.sort(key=lambda s: (s.start, -s.duration))
+        open_spans = []
+        for span in process_spans:
+            while open_spans and open_spans[-1].end <= span.start:
+                open_spans.pop()
+            if open_spans:
+                parent = open_spans[-1]
+                span.stack = parent.stack + (span.name,)
+                parent.self_time -= span.duration
+            open_spans.append(span)
+    return spans
+
+
+def _group(span, by):
+    return tuple(str(span.labels.get(label, "-")) for label in by)
+
+
+def _order(group):
+    # numeric labels (replicas) in numeric order
+    return tuple((0, float(value), "") if value.replace(".", "", 1).isdigit() else (1, 0., value) for value in group)
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def flame_summary(spans, by=()):
+    """``{group: {stack: stats}}`` with count, total, self, mean, p95 and max in microseconds
+
+    ``group`` holds the values of the ``by`` labels of the spans (``-`` if absent).
+    """
+    durations = defaultdict(lambda: defaultdict(list))
+    self_times = defaultdict(lambda: defaultdict(float))
+    for span in spans:
+        group = _group(span, by)
+        durations[group][span.stack].append(span.duration)
+        self_times[group][span.stack] += span.self_time
+    summary = {}
+    for group, stacks in durations.items():
+        summary[group] = {stack: {"count": len(values), "total": sum(values), "self": self_times[group][stack],
+                                  "mean": sum(values) / len(values), "p95": _percentile(values, 0.95),
+                                  "max": max(values)}
+                          for stack, values in stacks.items()}
+    return summary
+
+
+def phase_totals(spans):
+    """Self time of every span name, in microseconds, whatever the stack"""
+    totals = defaultdict(float)
+    for span in spans:
+        totals[span.name] += span.self_time
+    return dict(totals)
+
+
+def counter_summary(events, by=()):
+    """``{(group, counter, key): (count, total, max)}`` of the ``"C"`` events"""
+    summary = {}
+    for event in events:
+        if event.get("ph") != "C":
+            continue
+        labels = event.get("labels") or {}
+        group = tuple(str(labels.get(label, "-")) for label in by)
+        for key, value in (event.get("args") or {}).items():
+            if isinstance(value, (int, float)):
+                count, total, largest = summary.get((group, event["name"], key), (0, 0., value))
+                summary[(group, event["name"], key)] = (count + 1, total + value, max(largest, value))
+    return summary
+
+
+def render_tree(summary):
+    """Lines of the flame summary: one tree per group, children under their parent by total time"""
+    lines = []
+    header = (f"{'fase':<32} {'n':>6} {'totale s':>10} {'self s':>10} {'media ms':>10} {'p95 ms':>10} "
+              f"{'max ms':>10} {'quota':>7}")
+    for group in sorted(summary, key=_order):
+        stacks = summary[group]
+        if group:
+            lines.append("[" + ", ".join(group) + "]")
+        lines.append(header)
+        # share of the time spent in the spans of this group, counted once (self times)
+        overall = sum(stats["self"] for stats in stacks.values()) or 1.
+        # a stack whose parent is not in the group (e.g. split by a label the parent lacks) is a root
+        children = defaultdict(list)
+        for stack in stacks:
+            children[stack[:-1] if stack[:-1] in stacks else ()].append(stack)
+
+        def visit(parent, depth):
+            for stack in sorted(children[parent], key=lambda s: -stacks[s]["total"]):
+                stats = stacks[stack]
+                name = "  " * depth + (stack[-1] if depth else ";".join(stack))
+                lines.append(f"{name:<32} {stats['count']:>6} {stats['total'] / 1e6:>10.3f} "
+                             f"{stats['self'] / 1e6:>10.3f} {stats['mean'] / 1e3:>10.2f} {stats['p95'] / 1e3:>10.2f} "
+                             f"{stats['max'] / 1e3:>10.2f} {stats['self'] / overall:>7.1%}")
+                visit(stack, depth + 1)
+
+        visit((), 0)
+        lines.append("")
+    return lines
+
+
+def folded_stacks(summary):
+    """``frame;frame;... self-microseconds`` lines, groups as the outermost frames"""
+    lines = []
+    for group in sorted(summary, key=_order):
+        for stack, stats in sorted(summary[group].items()):
+            value = int(round(stats["self"]))
+            if value > 0:
+                lines.append(";".join(group + stack) + f" {value}")
+    return lines
+
+
+def write_chrome(events, path):
+    """Events as a ``{"traceEvents": [...]}`` file for chrome://tracing or Perfetto"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
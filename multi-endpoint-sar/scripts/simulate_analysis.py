@@ -0,0 +1,82 @@
+import argparse
+import os
+import time
+
+from replica_set_analysis import analysis_parameters, create_experiment_path, report, result_rows, save_endpoint_info
+from replicaset import Endpoint, ReplicaSetBuilder
+from replicaset.simulate import ReplicaSetTimings, SimulationOptions, simulate_points
+from replicaset.sweep import pool_size_sweep
+from sarresults.io import ANALYSIS_SCHEMA, CONFIDENCE_SCHEMA, ResultSink
+
+
+def confidence_rows(result):
+    """Half-widths of the confidence intervals, in the order of ``result_rows``"""
+    halfwidths = result.halfwidths
+    loads = "+".join(e.id for e in result.point.endpoints)
+    return [(e.id, loads, result.point.num_of_replicas, halfwidths["reliabilities"][e],
+             halfwidths["unavailabilities"][e], halfwidths["aging_contributions"][e], halfwidths["resource_usage"])
+            for e in result.point.endpoints]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulazione a eventi discreti delle configurazioni di ReplicaSetAnalysis, "
+                    "anche con tempi non esponenziali")
+    parser.add_argument("--replicas", type=int, default=8, help="Numero totale di repliche (default: 8)")
+    parser.add_argument("--service", metavar="DISTRIBUZIONE",
+                        help="Tempo di servizio delle richieste, con media 1/serviceRate "
+                             "(es. lognormal:cv=2, weibull:shape=0.5, pareto:alpha=2.5, deterministic; "
+                             "default: esponenziale)")
+    parser.add_argument("--repair", metavar="DISTRIBUZIONE", help="Tempo di riparazione (default: esponenziale)")
+    parser.add_argument("--rejuvenation", metavar="DISTRIBUZIONE",
+                        help="Tempo di ringiovanimento (default: esponenziale)")
+    parser.add_argument("--replications", type=int, default=8,
+                        help="Repliche indipendenti di ogni configurazione (default: 8)")
+    parser.add_argument("--batches", type=int, default=20, help="Batch per replica (default: 20)")
+    parser.add_argument("--batch-length", type=float, default=200., help="Durata di un batch (default: 200)")
+    parser.add_argument("--warmup", type=float, default=50., help="Durata del transitorio scartato (default: 50)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="Livello degli intervalli di confidenza (default: 0.95)")
+    parser.add_argument("--seed", type=int, default=0, help="Seme da cui derivano quelli delle repliche (default: 0)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Processi usati per le repliche (default: tutti i core)")
+    parser.add_argument("--output-dir", default="experiment-results", help="Cartella dei risultati")
+    parser.add_argument("--format", choices=["csv", "ndjson", "parquet", "arrow"], default="csv",
+                        help="Formato del file dei risultati (default: csv)")
+    args = parser.parse_args()
+
+    try:
+        timings = ReplicaSetTimings(args.service, args.repair, args.rejuvenation)
+    except (ValueError, TypeError) as e:
+        parser.error(str(e))
+    options = SimulationOptions(args.replications, args.warmup, args.batches, args.batch_length, args.seed,
+                                args.confidence)
+
+    experiment_path = create_experiment_path(args.output_dir)
+    endpoint_a = Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.)
+    endpoint_b = Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.)
+    endpoints = [endpoint_a, endpoint_b]
+    save_endpoint_info(experiment_path, endpoint_a, endpoint_b)
+    builder = ReplicaSetBuilder(repair_rate=10, rejuvenation_rate=10,
+                                false_positive_prob=25. / 100., false_negative_prob=25. / 100.)
+
+    parameters = {**analysis_parameters(builder, endpoints, args.replicas),
+                  "service": args.service or "exponential", "repair": args.repair or "exponential",
+                  "rejuvenation": args.rejuvenation or "exponential", **vars(options)}
+    result_file = experiment_path / f"analysisResults.{args.format}"
+    interval_file = experiment_path / f"confidenceIntervals.{args.format}"
+    start = time.perf_counter()
+    with ResultSink(result_file, ANALYSIS_SCHEMA, parameters) as sink, \
+            ResultSink(interval_file, CONFIDENCE_SCHEMA, parameters) as intervals:
+        def write(result):
+            report(result)
+            sink.add_rows(result_rows(result))
+            intervals.add_rows(confidence_rows(result))
+
+        simulate_points(pool_size_sweep(builder, endpoints, args.replicas), options, timings, args.workers, write)
+    print(f"Simulazione completata in {time.perf_counter() - start:.2f} s")
+    print(f"Risultati salvati in: {result_file}, intervalli di confidenza in: {interval_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the scripts import replicaset and sarresults from their own directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,42 @@
+from replicaset import Endpoint
+from replicaset.cache import ResultCache, point_key
+from replicaset.solvers import SolverOptions
+from replicaset.sweep import SweepPoint, SweepResult, run_sweep
+
+ENDPOINT = Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.)
+
+
+def _point(replicas=3):
+    return SweepPoint((ENDPOINT,), replicas, 10, 10, 25. / 100., 25. / 100.)
+
+
+def test_solver_settings_are_part_of_the_key():
+    point = _point()
+    keys = {point_key(point), point_key(point, SolverOptions()), point_key(point, SolverOptions("sor", tol=1e-2)),
+            point_key(point, SolverOptions("sor", tol=1e-12)), point_key(point, SolverOptions("gmres", tol=1e-12)),
+            point_key(point, SolverOptions("gmres", tol=1e-12, preconditioner="ilu"))}
+    # no solver means the default LU
+    assert len(keys) == 5
+    # LU ignores the tolerance, SOR the preconditioner
+    assert point_key(point, SolverOptions("lu", tol=1e-3)) == point_key(point)
+    assert point_key(point, SolverOptions("sor", tol=1e-2, preconditioner="ilu")) == \
+        point_key(point, SolverOptions("sor", tol=1e-2))
+
+
+def test_unconverged_solves_are_not_stored(tmp_path):
+    cache = ResultCache(tmp_path)
+    solver = SolverOptions("sor", tol=1e-15, maxiter=1, fallback=False)
+    result, = run_sweep([_point()], workers=1, cache=cache, solver=solver)
+    assert not result.stats.solve.converged
+    assert cache.get(_point(), solver) is None
+    run_sweep([_point()], workers=1, cache=cache)
+    assert cache.get(_point()) is not None
+
+
+def test_running_size_follows_puts_and_evictions(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=2000)
+    for replicas in list(range(1, 30)) + [29]:
+        cache.put(SweepResult(_point(replicas), {ENDPOINT: 1e-3}, {ENDPOINT: 1.}, {ENDPOINT: 1e-2}, 0.5))
+        sizes = [path.stat().st_size for path in tmp_path.glob("*.json")]
+        assert sum(sizes) == cache.size() <= 2000
+    assert ResultCache(tmp_path).size() == cache.size()
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from jointed_table_tex_generator import find_configuration_pairs
+from sarresults.figures import reliability_pairs
+from sarresults.pairs import configuration_pairs, index_results
+
+RESULTS = Path(__file__).resolve().parent / "reference" / "analysisResults.csv"
+
+
+def _results():
+    return pd.read_csv(RESULTS)
+
+
+def test_splits_of_the_joined_pool_size():
+    assert [p["name"] for p in reliability_pairs(_results())] == ["Joined", "A1B3", "A2B2", "A3B1"]
+
+
+@pytest.mark.parametrize("kept, names", [
+    (["A+B"], ["Joined"]),
+    (["A+B", "A"], ["Joined"]),
+])
+def test_splits_without_single_endpoint_rows_are_left_out(kept, names):
+    df = _results()
+    df = df[df.Configuration.isin(kept)]
+    assert [p["name"] for p in reliability_pairs(df)] == names
+    assert configuration_pairs(index_results(df), include_joined=False).empty
+
+
+def test_missing_joined_configuration_is_reported():
+    df = _results()
+    with pytest.raises(ValueError):
+        reliability_pairs(df[df.Configuration != "A+B"])
+
+
+def test_endpoint_names_come_from_the_data():
+    df = _results()
+    renamed = {"A": "C", "B": "D", "A+B": "C+D"}
+    df["Endpoint"] = df["Endpoint"].map(renamed)
+    df["Configuration"] = df["Configuration"].map(renamed)
+    pairs = find_configuration_pairs(df)
+    assert [p["pair_name"] for p in pairs] == ["C1D3", "C2D2", "C3D1"]
+    assert {p["config"] for p in pairs} == {"C"}
+    assert all(p["a_data"]["Pool Size"] + p["b_data"]["Pool Size"] == 4 for p in pairs)
@@ -0,0 +1,24 @@
+"""Place bound of the packed markings of ``MarkingStore.java``.
+
+``ReplicaSetBuilder`` gives ``MarkingStore`` the number of replicas as the
+bound of every place, and packing a marking above it fails. The tangible
+markings of the same nets built here must therefore never exceed it.
+"""
+import numpy as np
+import pytest
+
+from replicaset import Endpoint, ReplicaSetBuilder
+
+ENDPOINT_A = Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.)
+ENDPOINT_B = Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.)
+
+
+@pytest.mark.parametrize("endpoints", [(ENDPOINT_A,), (ENDPOINT_B,), (ENDPOINT_A, ENDPOINT_B)], ids=["A", "B", "A+B"])
+@pytest.mark.parametrize("replicas", [1, 2, 5])
+def test_tangible_markings_stay_within_the_replicas(endpoints, replicas):
+    model = ReplicaSetBuilder(num_of_replicas=replicas, repair_rate=10, rejuvenation_rate=10,
+                              false_positive_prob=25. / 100., false_negative_prob=25. / 100.).build(*endpoints)
+    model.analyze()
+    markings = np.array(list(model.steady_state))
+    assert markings.min() >= 0
+    assert markings.max() <= replicas
@@ -0,0 +1,88 @@
+"""Steady-state rewards of ``ReplicaSetModel.analyze`` against a reference result set.
+
+``reference/`` holds the ``analysisResults.csv`` and ``endpointInfo.csv`` of a
+4-replica run of the Python solver (``replica_set_analysis.py --replicas 4``
+at the first revision of the ``replicaset`` package), so these tests guard
+the Python analyses against regressions. The Java analysis is checked against
+the same files by ``ReplicaSetModelTest`` (``mvn test``).
+
+Every row is solved again, with the exact and the alternative analyses.
+"""
+import csv
+from pathlib import Path
+
+import pytest
+
+from replicaset import Endpoint, ReplicaSetBuilder
+from replicaset.gspn import GSPNSteadyState
+from replicaset.solvers import SolverOptions
+from replicaset.sweep import SweepPoint, run_sweep
+
+REFERENCE = Path(__file__).resolve().parent / "reference"
+# builder parameters of ReplicaSetAnalysis
+BUILDER = dict(repair_rate=10, rejuvenation_rate=10, false_positive_prob=25. / 100., false_negative_prob=25. / 100.)
+METRICS = ("Reliability", "Unavailability", "Aging Contribution", "Resource Usage")
+
+
+def _endpoints():
+    with open(REFERENCE / "endpointInfo.csv", newline="") as f:
+        return {row["id"]: Endpoint(row["id"], float(row["arrivalRate"]), float(row["serviceRate"]),
+                                    float(row["healthyToAgedTendency"]), float(row["agedToFailedTendency"]))
+                for row in csv.DictReader(f)}
+
+
+def _rows():
+    with open(REFERENCE / "analysisResults.csv", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _configurations():
+    """(endpoints, pool size) -> {endpoint id: {metric: value}} of the reference"""
+    endpoints = _endpoints()
+    configurations = {}
+    for row in _rows():
+        key = (tuple(endpoints[i] for i in row["Configuration"].split("+")), int(row["Pool Size"]))
+        configurations.setdefault(key, {})[row["Endpoint"]] = {metric: float(row[metric]) for metric in METRICS}
+    return configurations
+
+
+def _metrics(model, endpoint):
+    return {"Reliability": model.get_steady_state_endpoints_reliabilities()[endpoint],
+            "Unavailability": model.get_steady_state_endpoints_unavailabilities()[endpoint],
+            "Aging Contribution": model.get_steady_state_aging_contributions()[endpoint],
+            "Resource Usage": model.get_steady_state_resource_usage()}
+
+
+def _check(expected, actual, rel):
+    for metric in METRICS:
+        assert actual[metric] == pytest.approx(expected[metric], rel=rel, abs=1e-15), metric
+
+
+@pytest.mark.parametrize("analysis, lumping, rel", [
+    (None, False, 1e-9),
+    (None, True, 1e-9),
+    (lambda: GSPNSteadyState(on_the_fly=True), False, 1e-9),
+    (lambda: GSPNSteadyState(solver=SolverOptions("gmres", tol=1e-14, fallback=False)), False, 1e-7),
+    (lambda: GSPNSteadyState(solver=SolverOptions("sor", tol=1e-14, maxiter=100000, fallback=False)), False, 1e-7),
+], ids=["lu", "lumping", "on-the-fly", "gmres", "sor"])
+def test_analyze_matches_reference(analysis, lumping, rel):
+    for (endpoints, replicas), expected in _configurations().items():
+        model = ReplicaSetBuilder(num_of_replicas=replicas, **BUILDER).build(*endpoints)
+        model.analyze(analysis() if analysis else None, lumping=lumping)
+        for endpoint in endpoints:
+            _check(expected[endpoint.id], _metrics(model, endpoint), rel)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_sweep_matches_reference(incremental):
+    configurations = _configurations()
+    points = [SweepPoint(endpoints, replicas, **BUILDER) for endpoints, replicas in configurations]
+    solver = SolverOptions("bicgstab", tol=1e-14) if incremental else None
+    for result in run_sweep(points, workers=1, solver=solver, incremental=incremental):
+        expected = configurations[(result.point.endpoints, result.point.num_of_replicas)]
+        for endpoint in result.point.endpoints:
+            actual = {"Reliability": result.reliabilities[endpoint],
+                      "Unavailability": result.unavailabilities[endpoint],
+                      "Aging Contribution": result.aging_contributions[endpoint],
+                      "Resource Usage": result.resource_usage}
+            _check(expected[endpoint.id], actual, 1e-7)
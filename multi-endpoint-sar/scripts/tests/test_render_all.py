@@ -0,0 +1,24 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from render_all import _render_job, report
+
+RESULTS = Path(__file__).resolve().parent / "reference" / "analysisResults.csv"
+
+
+def test_a_failing_experiment_does_not_stop_the_others(tmp_path, capsys):
+    experiments = [tmp_path / f"exp-{i}" for i in range(3)]
+    for experiment in experiments:
+        experiment.mkdir()
+    shutil.copy(RESULTS, experiments[0] / RESULTS.name)
+    # no joined configuration: this one cannot be paired
+    df = pd.read_csv(RESULTS)
+    df[df.Configuration == "A"].to_csv(experiments[1] / RESULTS.name, index=False)
+    shutil.copy(RESULTS, experiments[2] / RESULTS.name)
+
+    rendered, failed = report(map(_render_job, [(experiment, ["png"], True, False) for experiment in experiments]))
+    assert (rendered, failed) == (2, 1)
+    assert "exp-1: ERRORE, ValueError" in capsys.readouterr().out
+    assert (experiments[2] / "analysisResults.tex").exists()
@@ -0,0 +1,9 @@
+from sarresults.cli import SCRIPTS, STARTUP_BUDGET, SUBCOMMANDS, startup_check
+
+
+def test_help_starts_within_budget_without_heavy_imports():
+    results = startup_check(repeat=2)
+    assert set(results) == set(SUBCOMMANDS) | set(SCRIPTS)
+    for target, (seconds, heavy) in results.items():
+        assert not heavy, target
+        assert seconds <= STARTUP_BUDGET, target
@@ -0,0 +1,108 @@
+"""``sar-results trace`` on the events of ``Trace.java`` and ``replicaset.trace``.
+
+``mvn test`` writes real Java events to ``target/sar-trace.jsonl`` (surefire
+sets ``-Dsar.trace``); ``JAVA_TRACE`` is a hand-written copy of their format
+for two configurations of ``ReplicaSetAnalysis``, for runs without Maven:
+epoch timestamps and durations in microseconds with three decimals, integer
+labels, and the ``state_space`` counter with the labels of its enclosing span.
+"""
+from pathlib import Path
+
+import pytest
+
+from replicaset import Endpoint, ReplicaSetBuilder, trace
+from replicaset.parametric import ParametricSteadyState
+from sarresults.cli import trace_summary
+from sarresults.traces import counter_summary, flame_summary, load_events, nest
+
+MAVEN_TRACE = Path(__file__).resolve().parents[2] / "target" / "sar-trace.jsonl"
+
+JAVA_TRACE = """\
+{"name":"build","cat":"sar","ph":"X","ts":1760700000001000.125,"pid":4242,"tid":1,"dur":2500.500,"args":{"configuration":"A+B","replicas":4}}
+{"name":"steady_state","cat":"sar","ph":"X","ts":1760700000004000.000,"pid":4242,"tid":1,"dur":90000.007,"args":{"configuration":"A+B","replicas":4}}
+{"name":"pack","cat":"sar","ph":"X","ts":1760700000094500.000,"pid":4242,"tid":1,"dur":1200.040,"args":{"configuration":"A+B","replicas":4}}
+{"name":"state_space","cat":"sar","ph":"C","ts":1760700000095800.300,"pid":4242,"tid":1,"args":{"tangible":1050,"bytes":25200},"labels":{"configuration":"A+B","replicas":4}}
+{"name":"rewards","cat":"sar","ph":"X","ts":1760700000096000.000,"pid":4242,"tid":1,"dur":300.900,"args":{"configuration":"A+B","replicas":4}}
+{"name":"write","cat":"sar","ph":"X","ts":1760700000096400.000,"pid":4242,"tid":1,"dur":80.000,"args":{"configuration":"A+B","replicas":4}}
+{"name":"point","cat":"sar","ph":"X","ts":1760700000000000.000,"pid":4242,"tid":1,"dur":97000.000,"args":{"configuration":"A+B","replicas":4}}
+{"name":"build","cat":"sar","ph":"X","ts":1760700000097100.000,"pid":4242,"tid":1,"dur":500.000,"args":{"configuration":"A","replicas":1}}
+{"name":"steady_state","cat":"sar","ph":"X","ts":1760700000097700.000,"pid":4242,"tid":1,"dur":3000.000,"args":{"configuration":"A","replicas":1}}
+{"name":"pack","cat":"sar","ph":"X","ts":1760700000100800.000,"pid":4242,"tid":1,"dur":100.000,"args":{"configuration":"A","replicas":1}}
+{"name":"state_space","cat":"sar","ph":"C","ts":1760700000100950.000,"pid":4242,"tid":1,"args":{"tangible":5,"bytes":120},"labels":{"configuration":"A","replicas":1}}
+{"name":"rewards","cat":"sar","ph":"X","ts":1760700000101000.000,"pid":4242,"tid":1,"dur":50.000,"args":{"configuration":"A","replicas":1}}
+{"name":"write","cat":"sar","ph":"X","ts":1760700000101100.000,"pid":4242,"tid":1,"dur":40.000,"args":{"configuration":"A","replicas":1}}
+{"name":"point","cat":"sar","ph":"X","ts":1760700000097000.000,"pid":4242,"tid":1,"dur":4200.000,"args":{"configuration":"A","replicas":1}}
+"""
+PHASES = ("build", "steady_state", "pack", "rewards", "write")
+
+
+def test_java_trace_is_nested_per_point(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text(JAVA_TRACE)
+    events = load_events([path])
+    summary = flame_summary(nest(events), by=("replicas",))
+    assert set(summary) == {("1",), ("4",)}
+    for group in summary.values():
+        assert set(group) == {("point",)} | {("point", phase) for phase in PHASES}
+    point = summary[("4",)][("point",)]
+    assert point["total"] == pytest.approx(97000.)
+    assert point["self"] == pytest.approx(97000. - 2500.5 - 90000.007 - 1200.04 - 300.9 - 80.)
+    counters = counter_summary(events, by=("configuration",))
+    assert counters[(("A+B",), "state_space", "tangible")] == (1, 1050, 1050)
+    assert counters[(("A",), "state_space", "bytes")] == (1, 120, 120)
+
+
+def test_java_and_python_traces_share_the_summary(tmp_path, monkeypatch, capsys):
+    java, python = tmp_path / "java.jsonl", tmp_path / "python.jsonl"
+    java.write_text(JAVA_TRACE)
+    monkeypatch.setattr(trace.TRACER, "path", str(python))
+    endpoint = Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.)
+    with trace.span("point", **trace.configuration_labels((endpoint,), 2)):
+        ReplicaSetBuilder(num_of_replicas=2).build(endpoint).analyze()
+    summary = trace_summary([java, python], by=("configuration",))
+    assert ("point", "build") in summary[("A+B",)]
+    assert summary[("A",)][("point",)]["count"] == 2
+    assert "state_space.tangible" in capsys.readouterr().out
+
+
+@pytest.mark.skipif(not MAVEN_TRACE.exists(), reason="no Java trace: run mvn test first")
+def test_maven_trace_is_summarized(capsys):
+    events = load_events([MAVEN_TRACE])
+    summary = flame_summary(nest(events))
+    names = {name for stacks in summary.values() for stack in stacks for name in stack}
+    assert {"build", "steady_state", "pack", "rewards", "point", "write"} <= names
+    assert any(name == "state_space" for _, name, _ in counter_summary(events))
+    trace_summary([MAVEN_TRACE], by=("replicas",))
+    assert "steady_state" in capsys.readouterr().out
+
+
+def test_enable_switches_the_trace_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAR_TRACE", "")
+    monkeypatch.setattr(trace.TRACER, "path", None)
+    first, second = tmp_path / "t1.jsonl", tmp_path / "t2.jsonl"
+    trace.enable(first)
+    with trace.span("first"):
+        pass
+    trace.enable(second)
+    with trace.span("second"):
+        trace.counter("state_space", tangible=3)
+    assert [event["name"] for event in load_events([first])] == ["first"]
+    assert [event["name"] for event in load_events([second])] == ["state_space", "second"]
+
+
+def test_parametric_solves_are_traced_like_the_others(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(trace.TRACER, "path", str(path))
+    analysis = ParametricSteadyState()
+    builder = ReplicaSetBuilder(repair_rate=10, rejuvenation_rate=10, false_positive_prob=25. / 100.,
+                                false_negative_prob=25. / 100., num_of_replicas=2)
+    for arrival in (10., 12.):
+        builder.build(Endpoint("A", arrival, 25. / 10., 10. / 100., 10. / 100.)).analyze(analysis)
+    events = load_events([path])
+    assert analysis.explorations == 1
+    assert [event["args"]["method"] for event in events if event["name"] == "solve" and event["ph"] == "X"] == \
+        ["lu", "gmres"]
+    counters = counter_summary(events)
+    assert counters[((), "state_space", "tangible")][0] == 2
+    assert counters[((), "solve", "iterations")][0] == 2
+    assert sum(event["name"] == "explore" for event in events) == 2
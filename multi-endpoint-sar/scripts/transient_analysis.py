@@ -0,0 +1,100 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from replica_set_analysis import analysis_parameters, create_experiment_path, save_endpoint_info
+from replicaset import Endpoint, GSPNTransient, ReplicaSetBuilder
+from replicaset.graphstore import GraphStore
+from replicaset.sweep import pool_size_sweep
+from sarresults.io import STREAMABLE_FORMATS, TRANSIENT_SCHEMA, ResultSink, result_format
+
+
+def solve_transient(point, times, epsilon, max_step, on_the_fly, lumping, graph_dir):
+    """Righe di una configurazione (una per istante e endpoint) e tempo medio al primo guasto"""
+    model = point.build()
+    store = GraphStore(graph_dir) if graph_dir is not None else None
+    model.analyze_transient(times, GSPNTransient(epsilon, max_step, on_the_fly=on_the_fly, store=store),
+                            lumping=lumping)
+    reliabilities = model.get_transient_endpoints_reliabilities()
+    unavailabilities = model.get_transient_endpoints_unavailabilities()
+    aging = model.get_transient_aging_contributions()
+    usage = model.get_transient_resource_usage()
+    interval_reliabilities = model.get_transient_endpoints_reliabilities(interval=True)
+    interval_unavailabilities = model.get_transient_endpoints_unavailabilities(interval=True)
+    first_failure = model.get_first_failure_probabilities()
+
+    loads = "+".join(e.id for e in point.endpoints)
+    rows = []
+    for i, t in enumerate(times):
+        for e in point.endpoints:
+            rows.append((float(t), e.id, loads, point.num_of_replicas, float(reliabilities[e][i]),
+                         float(unavailabilities[e][i]), float(aging[e][i]), float(usage[i]),
+                         float(interval_reliabilities[e][i]), float(interval_unavailabilities[e][i]),
+                         float(first_failure[i])))
+    return point, rows, model.get_mean_time_to_first_failure(), model.transient_analysis.state_space.stats
+
+
+def _solve_job(job):
+    return solve_transient(*job)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analisi transitoria del replica set dalla marcatura iniziale (tutte le repliche Healthy)")
+    parser.add_argument("--replicas", type=int, default=6, help="Numero totale di repliche (default: 6)")
+    parser.add_argument("--horizon", type=float, default=24., help="Fine della finestra osservata (default: 24)")
+    parser.add_argument("--points", type=int, default=49,
+                        help="Istanti equispaziati in [0, horizon], estremi inclusi (default: 49)")
+    parser.add_argument("--epsilon", type=float, default=1e-12,
+                        help="Probabilità trascurata dal troncamento di Fox-Glynn per intervallo (default: 1e-12)")
+    parser.add_argument("--max-step", type=float, default=1000.,
+                        help="Massimo q*dt di un passo di uniformizzazione (default: 1000)")
+    parser.add_argument("--output-dir", default="experiment-results", help="Cartella dei risultati")
+    parser.add_argument("--on-the-fly", action="store_true",
+                        help="Elimina le marcature vanishing durante l'esplorazione senza memorizzarle")
+    parser.add_argument("--lumping", action="store_true",
+                        help="Aggrega gli endpoint con parametri identici (lumping esatto)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Processi usati per risolvere le configurazioni (default: tutti i core)")
+    parser.add_argument("--graph-dir",
+                        help="Cartella in cui salvare e riusare i grafi di raggiungibilità esplorati")
+    parser.add_argument("--format", choices=["csv", "ndjson", "parquet", "arrow"], default="csv",
+                        help="Formato del file dei risultati (default: csv)")
+    args = parser.parse_args()
+    if args.points < 2 or args.horizon <= 0:
+        parser.error("Servono almeno 2 istanti e un orizzonte positivo")
+
+    experiment_path = create_experiment_path(args.output_dir)
+    endpoint_a = Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.)
+    endpoint_b = Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.)
+    endpoints = [endpoint_a, endpoint_b]
+    save_endpoint_info(experiment_path, endpoint_a, endpoint_b)
+
+    builder = ReplicaSetBuilder(repair_rate=10, rejuvenation_rate=10,
+                                false_positive_prob=25. / 100., false_negative_prob=25. / 100.)
+    points = pool_size_sweep(builder, endpoints, args.replicas)
+    times = np.linspace(0., args.horizon, args.points)
+
+    result_file = experiment_path / f"transientResults.{args.format}"
+    parameters = analysis_parameters(builder, endpoints, args.replicas)
+    parameters.update({"horizon": args.horizon, "points": args.points, "epsilon": args.epsilon})
+    batch_size = len(times) * len(endpoints) if result_format(result_file) in STREAMABLE_FORMATS else 1024
+    jobs = [(point, times, args.epsilon, args.max_step, args.on_the_fly, args.lumping, args.graph_dir)
+            for point in points]
+    workers = max(1, min(args.workers or 1, len(jobs)))
+    with ResultSink(result_file, TRANSIENT_SCHEMA, parameters, batch_size=batch_size) as sink:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for point, rows, mean_time, stats in executor.map(_solve_job, jobs):
+                loads = "+".join(e.id for e in point.endpoints)
+                mttf = "mai" if math.isinf(mean_time) else f"{mean_time:.4g}"
+                print(f"Replica set {loads} ({point.num_of_replicas} repliche): {stats.transient}; "
+                      f"P(guasto entro {args.horizon:g}) = {rows[-1][-1]:.6g}, tempo medio al primo guasto {mttf}")
+                sink.add_rows(rows)
+    print(f"Risultati salvati in: {result_file}")
+
+
+if __name__ == "__main__":
+    main()
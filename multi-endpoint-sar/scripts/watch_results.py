@@ -0,0 +1,151 @@
+import argparse
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from sarresults.figures import RELIABILITY, WORKLOAD, at_time, reliability_pairs, render_figure
+from sarresults.stream import ResultTail
+from sarresults.tex import render_table, row_line
+
+
+class TablePane:
+    """Tabella LaTeX (come table_tex_generator.py): le righe già renderizzate non vengono rifatte"""
+
+    def __init__(self, result_path):
+        self.output = result_path.with_suffix(".tex")
+        self.headers = None
+        self.lines = []
+
+    def update(self, rows, header):
+        self.headers = self.headers or header
+        self.lines += [row_line(row, self.headers) for row in rows]
+        self.output.write_text(render_table(self.headers, self.lines), encoding="utf-8")
+        return [self.output]
+
+
+class ReliabilityPane:
+    """Unreliability vs Unavailability delle coppie Joined e AxBy (come unreliability_unavailability_plot.py)
+
+    Le coppie sono quelle di sarresults.pairs per la prima configurazione congiunta di due endpoint,
+    qualunque siano gli endpoint; la figura è ridisegnata da sarresults.figures, in tutti i formati
+    richiesti, solo quando si completa una nuova coppia.
+    """
+
+    def __init__(self, result_path, formats):
+        self.outputs = [result_path.parent / RELIABILITY.output_name(result_path.stem, fmt) for fmt in formats]
+        self.rows = []
+        self.drawn = set()
+        self.fig = plt.figure()
+
+    def update(self, rows, header):
+        self.rows += rows
+        df = pd.DataFrame(self.rows)
+        if "Time" in df.columns:
+            df = at_time(df, interval=True)
+        try:
+            pairs = reliability_pairs(df)
+        except ValueError:
+            # mancano ancora la configurazione congiunta o quelle separate
+            return []
+        names = {p["name"] for p in pairs}
+        if names <= self.drawn:
+            return []
+        self.drawn = names
+        return render_figure(RELIABILITY, pairs, self.fig, self.outputs)
+
+
+class WorkloadPane:
+    """Unreliability vs workload per aging rate (come workload-aging2d.py): si aggiornano solo le curve toccate"""
+
+    def __init__(self, result_path, formats):
+        self.outputs = [result_path.parent / WORKLOAD.output_name(result_path.stem, fmt) for fmt in formats]
+        self.points = {}
+        self.lines = {}
+        self.fig, self.ax = plt.subplots(figsize=(10, 6))
+        self.ax.set_xlabel("Arrival Rate (Workload)")
+        self.ax.set_ylabel("Unreliability")
+        self.ax.set_title("Unreliability vs Workload for different Aging Rates")
+        self.ax.grid(True, which='both', linestyle='--', alpha=0.6)
+
+    def update(self, rows, header):
+        touched = set()
+        for row in rows:
+            self.points.setdefault(row["Aging Rate"], {})[row["Arrival Rate"]] = row["Unreliability"]
+            touched.add(row["Aging Rate"])
+        for aging_rate in touched:
+            xs = sorted(self.points[aging_rate])
+            ys = [self.points[aging_rate][x] for x in xs]
+            if aging_rate in self.lines:
+                self.lines[aging_rate].set_data(xs, ys)
+            else:
+                self.lines[aging_rate], = self.ax.plot(xs, ys, marker="o", label=f"Aging Rate = {aging_rate}")
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.legend(handles=[self.lines[a] for a in sorted(self.lines)], title="Aging Rate")
+        self.fig.tight_layout()
+        for output in self.outputs:
+            self.fig.savefig(output, **WORKLOAD.savefig)
+        return self.outputs
+
+
+def make_panes(result_path, header, plot, table, formats):
+    panes = []
+    if "Arrival Rate" in header:
+        if plot:
+            panes.append(WorkloadPane(result_path, formats))
+    else:
+        if plot:
+            panes.append(ReliabilityPane(result_path, formats))
+        if table:
+            panes.append(TablePane(result_path))
+    return panes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Segue un file di risultati (CSV o NDJSON) mentre l'analisi lo scrive e aggiorna grafico e tabella")
+    parser.add_argument("result_file",
+                        help="File dei risultati (analysisResults.csv, workload_reliability.csv, .ndjson)")
+    parser.add_argument("--interval", type=float, default=2., help="Secondi tra due controlli del file (default: 2)")
+    parser.add_argument("--idle-timeout", type=float, default=0.,
+                        help="Termina dopo questi secondi senza nuove righe (default: 0, mai)")
+    parser.add_argument("--once", action="store_true", help="Elabora le righe presenti e termina")
+    parser.add_argument("--no-plot", action="store_true", help="Non aggiorna il grafico")
+    parser.add_argument("--no-table", action="store_true", help="Non aggiorna la tabella LaTeX")
+    parser.add_argument("--formats", default="pdf,png",
+                        help="Formati dei grafici separati da virgola (default: pdf,png)")
+    args = parser.parse_args()
+    formats = [fmt.strip().lower() for fmt in args.formats.split(",") if fmt.strip()]
+
+    result_path = Path(args.result_file).expanduser().resolve()
+    tail = ResultTail(result_path)
+    panes = None
+    last_update = time.monotonic()
+    print(f"In attesa di risultati in: {result_path}")
+    try:
+        while True:
+            rows = tail.poll()
+            if rows:
+                header = tail.header or list(rows[0])
+                if panes is None:
+                    panes = make_panes(result_path, header, not args.no_plot, not args.no_table, formats)
+                updated = [path for pane in panes for path in pane.update(rows, header)]
+                names = ", ".join(path.name for path in updated) or "nessun output"
+                print(f"{tail.rows} righe (+{len(rows)}): aggiornati {names}")
+                last_update = time.monotonic()
+            elif args.once or (args.idle_timeout and time.monotonic() - last_update > args.idle_timeout):
+                break
+            if not args.once:
+                time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    print(f"Righe elaborate: {tail.rows}")
+
+
+if __name__ == "__main__":
+    main()
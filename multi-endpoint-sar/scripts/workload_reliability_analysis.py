@@ -0,0 +1,92 @@
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from replicaset import Endpoint, ReplicaSetBuilder
+from replicaset.expr import PROFILE as EXPR_PROFILE
+from replicaset.graphstore import GraphStore
+from replicaset.parametric import ParametricSteadyState
+from replicaset.solvers import METHODS, SolverOptions
+from sarresults.io import WORKLOAD_SCHEMA, ResultSink
+
+
+def parse_values(spec):
+    """'1,5,10' -> [1, 5, 10]; 'start:stop:num' -> num punti equispaziati"""
+    try:
+        if ":" in spec:
+            start, stop, num = spec.split(":")
+            return [float(v) for v in np.linspace(float(start), float(stop), int(num))]
+        return [float(v) for v in spec.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Valori non validi: '{spec}' (usare '1,5,10' o 'start:stop:num')")
+
+
+def serpentine(num_rows, num_cols):
+    """Visita la griglia riga per riga alternando la direzione: punti consecutivi sono vicini"""
+    for i in range(num_rows):
+        cols = range(num_cols) if i % 2 == 0 else reversed(range(num_cols))
+        for j in cols:
+            yield i, j
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unreliability al variare di workload e aging rate (port di WorkloadReliabilityDependencyAnalysis)")
+    parser.add_argument("--replicas", type=int, default=6, help="Numero di repliche (default: 6)")
+    parser.add_argument("--arrival-rates", type=parse_values, default=parse_values("1,5,10,15,20,25,30,50,100"),
+                        help="Arrival rate: lista '1,5,10' oppure griglia 'start:stop:num'")
+    parser.add_argument("--aging-rates", type=parse_values, default=parse_values("0.01,0.1,0.3,0.5,0.8"),
+                        help="Aging rate: lista '0.01,0.1' oppure griglia 'start:stop:num'")
+    parser.add_argument("--output-dir", default="experiment-results", help="Cartella dei risultati")
+    parser.add_argument("--format", choices=["csv", "ndjson", "parquet", "arrow"], default="csv",
+                        help="Formato del file dei risultati (default: csv)")
+    parser.add_argument("--graph-dir",
+                        help="Cartella in cui salvare e riusare i grafi di raggiungibilità esplorati")
+    parser.add_argument("--no-warm-start", action="store_true",
+                        help="Risolve ogni punto da zero con LU invece di partire dal punto vicino")
+    parser.add_argument("--solver", choices=[m for m in METHODS if m != "lu"], default="gmres",
+                        help="Metodo iterativo usato partendo dal punto vicino (default: gmres)")
+    parser.add_argument("--tol", type=float, default=1e-12,
+                        help="Tolleranza del metodo iterativo, relativa al massimo exit rate (default: 1e-12)")
+    args = parser.parse_args()
+
+    path = Path(args.output_dir) / f"exp-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    path.mkdir(parents=True, exist_ok=True)
+    print(f"Experiment Directory: {path.resolve()}")
+
+    service_rate_a = 25. / 10.
+    builder = ReplicaSetBuilder(repair_rate=10, rejuvenation_rate=10, false_positive_prob=25. / 100.,
+                                false_negative_prob=25. / 100., num_of_replicas=args.replicas)
+
+    arrival_rates, aging_rates = args.arrival_rates, args.aging_rates
+    store = GraphStore(args.graph_dir) if args.graph_dir else None
+    analysis = ParametricSteadyState(warm_start=not args.no_warm_start, store=store,
+                                     solver=SolverOptions(args.solver, tol=args.tol, maxiter=500))
+    unreliability = np.empty((len(arrival_rates), len(aging_rates)))
+    start = time.perf_counter()
+    for i, j in serpentine(len(arrival_rates), len(aging_rates)):
+        endpoint = Endpoint("A", arrival_rates[i], service_rate_a, aging_rates[j], aging_rates[j])
+        model = builder.build(endpoint)
+        model.analyze(analysis)
+        unreliability[i, j] = model.get_steady_state_endpoints_reliabilities()[endpoint]
+    elapsed = time.perf_counter() - start
+    print(f"{unreliability.size} punti in {elapsed:.2f} s ({analysis.explorations} esplorazioni, "
+          f"{analysis.state_space.stats.tangible} stati tangibili)")
+    print(f"Espressioni: {EXPR_PROFILE}")
+
+    parameters = {"numOfReplicas": args.replicas, "serviceRate": service_rate_a, "repairRate": builder.repair_rate,
+                  "rejuvenationRate": builder.rejuvenation_rate, "falsePositiveProb": builder.false_positive_prob,
+                  "falseNegativeProb": builder.false_negative_prob}
+    result_file = path / f"workload_reliability.{args.format}"
+    with ResultSink(result_file, WORKLOAD_SCHEMA, parameters) as sink:
+        for i, workload in enumerate(arrival_rates):
+            for j, aging_rate in enumerate(aging_rates):
+                sink.add_row((workload, aging_rate, float(unreliability[i, j])))
+    print(f"Risultati salvati in: {result_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import time
+
+from replicaset import GSPNSteadyState
+from replicaset.solvers import METHODS, SolverOptions
+from replicaset.xpn import load_xpn
+
+
+def parse_assignment(text):
+    name, _, value = text.partition("=")
+    if not value:
+        raise argparse.ArgumentTypeError(f"Atteso NOME=VALORE: {text}")
+    return name.strip(), float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analisi stazionaria di un modello Oris (.xpn) senza riscriverlo nel builder")
+    parser.add_argument("model", help="File .xpn (es. ../models/final-single-endpoint.xpn)")
+    parser.add_argument("--set", dest="parameters", type=parse_assignment, action="append", default=[],
+                        metavar="NOME=VALORE", help="Valore di un posto parametro (es. ArrivalRate1=50, Off1=0)")
+    parser.add_argument("--replicas", type=int, help="Repliche iniziali (marcatura di Healthy)")
+    parser.add_argument("--on-the-fly", action="store_true",
+                        help="Elimina le marcature vanishing durante l'esplorazione senza memorizzarle")
+    parser.add_argument("--lumping", action="store_true",
+                        help="Aggrega gli endpoint con parametri identici (lumping esatto)")
+    parser.add_argument("--solver", choices=METHODS, default="lu",
+                        help="Metodo per la soluzione stazionaria (default: lu)")
+    parser.add_argument("--tol", type=float, default=1e-12,
+                        help="Tolleranza dei metodi iterativi, relativa al massimo exit rate (default: 1e-12)")
+    parser.add_argument("--maxiter", type=int, default=1000,
+                        help="Numero massimo di iterazioni dei metodi iterativi (default: 1000)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    xpn = load_xpn(args.model, dict(args.parameters))
+    print(f"Modello {args.model}: {len(xpn.net.places)} posti, {len(xpn.net.transitions)} transizioni, "
+          f"{len(xpn.parameters)} parametri, caricato in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if xpn.disabled:
+        print(f"Transizioni disabilitate da un inibitore: {', '.join(xpn.disabled)}")
+    if args.replicas is not None:
+        xpn.marking["Healthy"] = args.replicas
+
+    model = xpn.replica_set_model()
+    solver = SolverOptions(args.solver, tol=args.tol, maxiter=args.maxiter)
+    model.analyze(GSPNSteadyState(on_the_fly=args.on_the_fly, solver=solver), lumping=args.lumping)
+    print(f"Spazio degli stati: {model.analysis.state_space.stats}")
+
+    reliabilities = model.get_steady_state_endpoints_reliabilities()
+    unavailabilities = model.get_steady_state_endpoints_unavailabilities()
+    aging = model.get_steady_state_aging_contributions()
+    for endpoint in model.endpoints:
+        print(f"Endpoint {endpoint.id}: Reliability {reliabilities[endpoint]}, "
+              f"Unavailability {unavailabilities[endpoint]}, Aging Contribution {aging[endpoint]}")
+    print(f"Resource Usage: {model.get_steady_state_resource_usage()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+package it.unifi.dinfo.stlab;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.oristool.models.stpn.MarkingExpr;
+import org.oristool.petrinet.Marking;
+import org.oristool.petrinet.PetriNet;
+import org.oristool.petrinet.Place;
+
+/**
+ * Steady-state probabilities of the tangible markings of a net, without one
+ * object per state. Each marking is packed into fixed-width bit fields of a
+ * {@code long[]}, wide enough for the place bound (the number of replicas for
+ * the replica-set nets, whose tangible markings conserve the replicas); state
+ * numbers are indexed by an open-addressing hash table and probabilities are
+ * kept in a {@code double[]}. Rewards are evaluated on these arrays.
+ */
+public class MarkingStore {
+
+    private static final int EMPTY = -1;
+
+    private final PetriNet net;
+    private final Place[] places;
+    private final Map<String, Integer> placeIndex = new HashMap<>();
+    private final int maxTokens;
+    private final int bits;
+    private final long mask;
+    private final int fieldsPerWord;
+    private final int words;
+
+    private long[] packed;
+    private double[] probabilities;
+    private int[] table;
+    private int size;
+    private final long[] scratch;
+
+    public MarkingStore(PetriNet net, int maxTokens, int expectedStates) {
+        if (maxTokens < 1) {
+            throw new IllegalArgumentException("Place bound must be positive: " + maxTokens);
+        }
+        this.net = net;
+        this.places = net.getPlaces().toArray(new Place[0]);
+        for (int i = 0; i < places.length; i++) {
+            placeIndex.put(places[i].getName(), i);
+        }
+        this.maxTokens = maxTokens;
+        bits = 32 - Integer.numberOfLeadingZeros(maxTokens);
+        mask = (1L << bits) - 1;
+        fieldsPerWord = 64 / bits;
+        words = Math.max(1, (places.length + fieldsPerWord - 1) / fieldsPerWord);
+        int capacity = Math.max(16, expectedStates);
+        packed = new long[capacity * words];
+        probabilities = new double[capacity];
+        table = new int[tableSize(capacity)];
+        Arrays.fill(table, EMPTY);
+        scratch = new long[words];
+    }
+
+    /**
+     * Packs the solution of {@code GSPNSteadyState}; {@code maxTokens} bounds the
+     * tokens of every place (a non-positive value takes the largest in the markings).
+     */
+    public static MarkingStore of(PetriNet net, int maxTokens, Map<Marking, Double> steadyState) {
+        if (maxTokens < 1) {
+            maxTokens = 1;
+            for (Marking marking : steadyState.keySet()) {
+                for (Place place : net.getPlaces()) {
+                    maxTokens = Math.max(maxTokens, marking.getTokens(place));
+                }
+            }
+        }
+        MarkingStore store = new MarkingStore(net, maxTokens, steadyState.size());
+        for (Map.Entry<Marking, Double> entry : steadyState.entrySet()) {
+            store.put(entry.getKey(), entry.getValue());
+        }
+        return store;
+    }
+
+    private static int tableSize(int capacity) {
+        // load factor at most 1/2
+        return Integer.highestOneBit(Math.max(2, capacity) * 4 - 1);
+    }
+
+    private void pack(Marking marking, long[] target) {
+        Arrays.fill(target, 0L);
+        for (int i = 0; i < places.length; i++) {
+            int tokens = marking.getTokens(places[i]);
+            // the fields could hold up to mask tokens, but markings above the bound mean a wrong bound
+            if (tokens < 0 || tokens > maxTokens) {
+                throw new IllegalArgumentException(
+                        "Place " + places[i].getName() + " has " + tokens + " tokens, above the bound " + maxTokens);
+            }
+            target[i / fieldsPerWord] |= (long) tokens << ((i % fieldsPerWord) * bits);
+        }
+    }
+
+    private int hash(long[] key) {
+        long h = 0;
+        for (long word : key) {
+            h = (h + word) * 0x9E3779B97F4A7C15L;
+            h ^= h >>> 29;
+        }
+        return (int) (h ^ (h >>> 32));
+    }
+
+    private boolean matches(int state, long[] key) {
+        int offset = state * words;
+        for (int w = 0; w < words; w++) {
+            if (packed[offset + w] != key[w]) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    /** Slot of {@code key} in the hash table, or of the empty slot where it would go. */
+    private int slot(long[] key) {
+        int last = table.length - 1;
+        int slot = hash(key) & last;
+        while (table[slot] != EMPTY && !matches(table[slot], key)) {
+            slot = (slot + 1) & last;
+        }
+        return slot;
+    }
+
+    /** Sets the probability of {@code marking}, adding it if new; returns its state number. */
+    public int put(Marking marking, double probability) {
+        pack(marking, scratch);
+        int slot = slot(scratch);
+        if (table[slot] != EMPTY) {
+            probabilities[table[slot]] = probability;
+            return table[slot];
+        }
+        if (size == probabilities.length) {
+            grow();
+            slot = slot(scratch);
+        }
+        System.arraycopy(scratch, 0, packed, size * words, words);
+        probabilities[size] = probability;
+        table[slot] = size;
+        return size++;
+    }
+
+    private void grow() {
+        int capacity = probabilities.length * 2;
+        packed = Arrays.copyOf(packed, capacity * words);
+        probabilities = Arrays.copyOf(probabilities, capacity);
+        table = new int[tableSize(capacity)];
+        Arrays.fill(table, EMPTY);
+        long[] key = new long[words];
+        for (int state = 0; state < size; state++) {
+            System.arraycopy(packed, state * words, key, 0, words);
+            table[slot(key)] = state;
+        }
+    }
+
+    /** State number of {@code marking}, or -1 if it is not stored. */
+    public int indexOf(Marking marking) {
+        long[] key = new long[words];
+        pack(marking, key);
+        int state = table[slot(key)];
+        return state == EMPTY ? -1 : state;
+    }
+
+    public int size() {
+        return size;
+    }
+
+    public int getPlaceIndex(String place) {
+        Integer index = placeIndex.get(place);
+        if (index == null) {
+            throw new IllegalArgumentException("Unknown place: " + place);
+        }
+        return index;
+    }
+
+    public int getTokens(int state, int place) {
+        long word = packed[state * words + place / fieldsPerWord];
+        return (int) ((word >>> ((place % fieldsPerWord) * bits)) & mask);
+    }
+
+    public double getProbability(int state) {
+        return probabilities[state];
+    }
+
+    /** A new {@code Marking} equal to the stored state, for code that needs Oris objects. */
+    public Marking getMarking(int state) {
+        Marking marking = new Marking();
+        for (int i = 0; i < places.length; i++) {
+            marking.setTokens(places[i], getTokens(state, i));
+        }
+        return marking;
+    }
+
+    /** Bytes used by the packed markings, probabilities and hash table. */
+    public long getMemoryBytes() {
+        return 8L * packed.length + 8L * probabilities.length + 4L * table.length;
+    }
+
+    /**
+     * Value of a reward rate expression in every state. Weighted sums of places
+     * such as {@code Healthy+Aged} or {@code 2.5*AgedComputationA} are read from
+     * the packed fields; other expressions are evaluated by Oris on one reused
+     * {@code Marking}.
+     */
+    public double[] getRewardValues(String rewardRate) {
+        double[] values = new double[size];
+        LinearReward linear = LinearReward.parse(rewardRate, this);
+        if (linear != null) {
+            for (int state = 0; state < size; state++) {
+                values[state] = linear.evaluate(this, state);
+            }
+            return values;
+        }
+        MarkingExpr reward = MarkingExpr.from(rewardRate, net);
+        Marking marking = new Marking();
+        for (int state = 0; state < size; state++) {
+            for (int i = 0; i < places.length; i++) {
+                marking.setTokens(places[i], getTokens(state, i));
+            }
+            values[state] = reward.evaluate(marking);
+        }
+        return values;
+    }
+
+    /** Steady-state expectation of a reward rate expression, summed as {@code precision} says. */
+    public double expectation(String rewardRate, RewardPrecision precision) {
+        return precision.sum(probabilities, getRewardValues(rewardRate), size);
+    }
+
+    /** {@code constant + sum(coefficient * tokens)} over a few places. */
+    private record LinearReward(double constant, int[] places, double[] coefficients) {
+
+        /** The sum of {@code [number*]place} or number terms, or null for any other expression. */
+        static LinearReward parse(String expression, MarkingStore store) {
+            double constant = 0;
+            List<Integer> places = new ArrayList<>();
+            List<Double> coefficients = new ArrayList<>();
+            for (String term : expression.replace(" ", "").split("\\+", -1)) {
+                double coefficient = 1;
+                Integer place = null;
+                for (String factor : term.split("\\*", -1)) {
+                    if (store.placeIndex.containsKey(factor)) {
+                        if (place != null) {
+                            return null;
+                        }
+                        place = store.placeIndex.get(factor);
+                    } else {
+                        try {
+                            coefficient *= Double.parseDouble(factor);
+                        } catch (NumberFormatException e) {
+                            return null;
+                        }
+                    }
+                }
+                if (place == null) {
+                    constant += coefficient;
+                } else {
+                    places.add(place);
+                    coefficients.add(coefficient);
+                }
+            }
+            return new LinearReward(constant, places.stream().mapToInt(Integer::intValue).toArray(),
+                    coefficients.stream().mapToDouble(Double::doubleValue).toArray());
+        }
+
+        double evaluate(MarkingStore store, int state) {
+            double value = constant;
+            for (int i = 0; i < places.length; i++) {
+                value += coefficients[i] * store.getTokens(state, places[i]);
+            }
+            return value;
+        }
+    }
+}
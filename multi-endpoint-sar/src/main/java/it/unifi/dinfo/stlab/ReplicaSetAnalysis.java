@@ -1,8 +1,5 @@
 package it.unifi.dinfo.stlab;
 
-import java.io.BufferedWriter;
-import java.io.File;
-import java.io.FileWriter;
 import java.io.IOException;
 import java.math.BigDecimal;
 import java.nio.file.Files;
@@ -21,7 +18,7 @@ public class ReplicaSetAnalysis {
 
                 Path experimentPath = createExperimentPath();
 
-                int totalNumberOfReplicas = 8;
+                int totalNumberOfReplicas = args.length > 0 ? Integer.parseInt(args[0]) : 8;
 
                 double arrivalRateA = 100. / 10.;
                 double serviceRateA = 25. / 10.;
@@ -38,7 +35,6 @@ public class ReplicaSetAnalysis {
                 List<Endpoint> endpoints = List.of(endpointA, endpointB);
 
                 saveEndpointInfo(experimentPath, endpointA, endpointB);
-                String resultFilePath = initializeResultFile(experimentPath);
 
                 ReplicaSetBuilder builder = new ReplicaSetBuilder();
                 builder.setRepairRate(10);
@@ -46,18 +42,31 @@ public class ReplicaSetAnalysis {
                 builder.setFalsePositiveProb(25. / 100.);
                 builder.setFalseNegativeProb(25. / 100.);
 
-                builder.setNumOfReplicas(totalNumberOfReplicas);
-                ReplicaSetModel replicaSetModel = builder.build(endpointA, endpointB);
-                replicaSetModel.analyze();
+                try (ResultWriter resultWriter = initializeResultFile(experimentPath)) {
+                        builder.setNumOfReplicas(totalNumberOfReplicas);
+                        try (Trace.Span point = Trace.span("point", "configuration", Trace.configuration(endpoints),
+                                        "replicas", totalNumberOfReplicas)) {
+                                ReplicaSetModel replicaSetModel = builder.build(endpointA, endpointB);
+                                replicaSetModel.analyze();
 
-                saveModelResults(resultFilePath, replicaSetModel, totalNumberOfReplicas);
-
-                for (int singleEndpointReplicas = 1; singleEndpointReplicas < totalNumberOfReplicas; singleEndpointReplicas++) {
-                        for (Endpoint endpoint : endpoints) {
-                                builder.setNumOfReplicas(singleEndpointReplicas);
-                                ReplicaSetModel singleEndpointReplicaSetModel = builder.build(endpoint);
-                                singleEndpointReplicaSetModel.analyze();
-                                saveModelResults(resultFilePath, singleEndpointReplicaSetModel, singleEndpointReplicas);
+                                saveModelResults(resultWriter, replicaSetModel, totalNumberOfReplicas);
+                        }
+                        // checkpoint: the joined configuration
+                        resultWriter.flush();
+
+                        for (int singleEndpointReplicas = 1; singleEndpointReplicas < totalNumberOfReplicas; singleEndpointReplicas++) {
+                                for (Endpoint endpoint : endpoints) {
+                                        builder.setNumOfReplicas(singleEndpointReplicas);
+                                        try (Trace.Span point = Trace.span("point", "configuration", endpoint.id(),
+                                                        "replicas", singleEndpointReplicas)) {
+                                                ReplicaSetModel singleEndpointReplicaSetModel = builder.build(endpoint);
+                                                singleEndpointReplicaSetModel.analyze();
+                                                saveModelResults(resultWriter, singleEndpointReplicaSetModel,
+                                                                singleEndpointReplicas);
+                                        }
+                                }
+                                // checkpoint: every endpoint alone on this many replicas
+                                resultWriter.flush();
                         }
                 }
         }
@@ -73,15 +82,15 @@ public class ReplicaSetAnalysis {
                 return path;
         }
 
-        private static String initializeResultFile(Path basePath) {
-                String resultsFileName = "analysisResults.csv";
-                File file = new File(basePath.toFile(), resultsFileName);
-                String filePath = file.getPath();
-                createCsv(filePath, RESULT_COLS);
-                return filePath;
+        private static ResultWriter initializeResultFile(Path basePath) throws IOException {
+                // batched rows, flushed at the checkpoints of main so the file can be followed
+                // (watch_results.py) while the analysis is running. The Java stream is these CSV
+                // rows: NDJSON records are written only by replica_set_analysis.py --format ndjson
+                return new ResultWriter(basePath.resolve("analysisResults.csv"), RESULT_COLS);
         }
 
-        private static void saveModelResults(String filePath, ReplicaSetModel replicaSetModel, int poolSize) {
+        private static void saveModelResults(ResultWriter resultWriter, ReplicaSetModel replicaSetModel, int poolSize)
+                        throws IOException {
                 List<Endpoint> endpoints = replicaSetModel.getEndpoints();
                 String loads = "\"" + String.join("+", endpoints.stream().map(Endpoint::id).toList()) + "\"";
                 BigDecimal steadyStateResourceUsage = replicaSetModel.getSteadyStateResourceUsage();
@@ -94,45 +103,29 @@ public class ReplicaSetAnalysis {
                 Map<Endpoint, BigDecimal> steadyStateEndpointsAgingContributions = replicaSetModel
                                 .getSteadyStateAgingContributions();
 
-                for (Endpoint endpoint : endpoints) {
-                        String endpointId = endpoint.id();
-                        BigDecimal reliability = steadyStateEndpointsReliabilities.get(endpoint);
-                        BigDecimal unavailability = steadyStateEndpointsUnavailiabilities.get(endpoint);
-                        BigDecimal agingContribution = steadyStateEndpointsAgingContributions.get(endpoint);
-                        String rowToAdd = endpointId + "," + loads+ "," + poolSize + "," + reliability + "," + unavailability + "," + agingContribution + ","
-                                        + steadyStateResourceUsage;
-                        System.out.println("Unavailability of endpoint " + endpoint.id() + ": " + unavailability);
-                        System.out.println("Reliability of endpoint " + endpoint.id() + ": " + reliability);
-                        addRow(filePath, rowToAdd);
-                }
-
-        }
-
-        private static void saveEndpointInfo(Path basePath, Endpoint... endpoints) {
-                String endpointInfoFileName = "endpointInfo.csv";
-                File file = new File(basePath.toFile(), endpointInfoFileName);
-                String filePath = file.getPath();
-                createCsv(filePath, Endpoint.getAttributeOreder());
-                for (Endpoint endpoint : endpoints) {
-                        addRow(filePath, endpoint.toString());
+                try (Trace.Span span = Trace.span("write")) {
+                        for (Endpoint endpoint : endpoints) {
+                                String endpointId = endpoint.id();
+                                BigDecimal reliability = steadyStateEndpointsReliabilities.get(endpoint);
+                                BigDecimal unavailability = steadyStateEndpointsUnavailiabilities.get(endpoint);
+                                BigDecimal agingContribution = steadyStateEndpointsAgingContributions.get(endpoint);
+                                String rowToAdd = endpointId + "," + loads+ "," + poolSize + "," + reliability + "," + unavailability + "," + agingContribution + ","
+                                                + steadyStateResourceUsage;
+                                System.out.println("Unavailability of endpoint " + endpoint.id() + ": "
+                                                + unavailability);
+                                System.out.println("Reliability of endpoint " + endpoint.id() + ": " + reliability);
+                                resultWriter.addRow(rowToAdd);
+                        }
                 }
-        }
 
-        private static void createCsv(String filePath, String cols) {
-                try (BufferedWriter writer = new BufferedWriter(new FileWriter(filePath))) {
-                        writer.write(cols);
-                        writer.newLine();
-                } catch (IOException e) {
-                        e.printStackTrace();
-                }
         }
 
-        private static void addRow(String filePath, String row) {
-                try (BufferedWriter writer = new BufferedWriter(new FileWriter(filePath, true))) {
-                        writer.write(row);
-                        writer.newLine();
-                } catch (IOException e) {
-                        e.printStackTrace();
+        private static void saveEndpointInfo(Path basePath, Endpoint... endpoints) throws IOException {
+                try (ResultWriter writer = new ResultWriter(basePath.resolve("endpointInfo.csv"),
+                                Endpoint.getAttributeOreder())) {
+                        for (Endpoint endpoint : endpoints) {
+                                writer.addRow(endpoint.toString());
+                        }
                 }
         }
 
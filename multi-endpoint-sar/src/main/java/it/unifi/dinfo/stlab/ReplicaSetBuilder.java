@@ -3,6 +3,7 @@ package it.unifi.dinfo.stlab;
 import java.math.BigDecimal;
 import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.List;
 
 import org.oristool.models.pn.Priority;
 import org.oristool.models.stpn.MarkingExpr;
@@ -21,13 +22,17 @@ public class ReplicaSetBuilder {
   private int numOfReplicas;
 
   public ReplicaSetModel build(Endpoint... endpoints) {
-    PetriNet net = new PetriNet();
-    Marking marking = new Marking();
-    buildCoreModel(net, marking);
-    for (Endpoint endpoint : endpoints) {
-      attachEndpoint(net, marking, endpoint);
+    List<Endpoint> endpointList = new ArrayList<>(Arrays.asList(endpoints));
+    try (Trace.Span span = Trace.span("build", "configuration", Trace.configuration(endpointList),
+        "replicas", numOfReplicas)) {
+      PetriNet net = new PetriNet();
+      Marking marking = new Marking();
+      buildCoreModel(net, marking);
+      for (Endpoint endpoint : endpoints) {
+        attachEndpoint(net, marking, endpoint);
+      }
+      return new ReplicaSetModel(net, marking, endpointList, numOfReplicas);
     }
-    return new ReplicaSetModel(net, marking, new ArrayList<>(Arrays.asList(endpoints)));
   }
 
   private void buildCoreModel(PetriNet net, Marking marking) {
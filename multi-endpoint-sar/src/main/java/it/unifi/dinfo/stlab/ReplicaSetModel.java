@@ -1,135 +1,157 @@
 package it.unifi.dinfo.stlab;
 
 import java.math.BigDecimal;
+import java.util.Collections;
 import java.util.HashMap;
+import java.util.LinkedHashSet;
 import java.util.List;
 import java.util.Map;
+import java.util.Set;
 
 import org.oristool.models.gspn.GSPNSteadyState;
-import org.oristool.models.stpn.RewardRate;
-import org.oristool.models.stpn.SteadyStateSolution;
 import org.oristool.petrinet.Marking;
 import org.oristool.petrinet.PetriNet;
 
-// TODO: adding a new reward is complex
 public class ReplicaSetModel {
 
     private PetriNet net;
     private Marking marking;
 
     private List<Endpoint> endpoints;
-    private SteadyStateSolution<RewardRate> rewardsSolution;
+    // tokens a place can hold (the number of replicas); 0 if unknown
+    private int placeBound;
+    private RewardRegistry rewardRegistry = RewardRegistry.defaultRegistry();
+    // -Dsar.rewardPrecision=DECIMAL checks the double sums against the BigDecimal reference
+    private RewardPrecision rewardPrecision = RewardPrecision
+            .valueOf(System.getProperty("sar.rewardPrecision", RewardPrecision.KAHAN.name()));
+    private MarkingStore steadyState;
+    private Map<RewardKey, Double> rewardIndex;
+
+    private record RewardKey(Endpoint endpoint, String metric) {
+    }
 
     public ReplicaSetModel(PetriNet net, Marking marking, List<Endpoint> endpoints) {
+        this(net, marking, endpoints, 0);
+    }
+
+    public ReplicaSetModel(PetriNet net, Marking marking, List<Endpoint> endpoints, int placeBound) {
         this.net = net;
         this.marking = marking;
         this.endpoints = endpoints;
+        this.placeBound = placeBound;
     }
 
     public void analyze() {
-        GSPNSteadyState analysis = GSPNSteadyState.builder().build();
-        Map<Marking, Double> steadyStateMap = analysis.compute(net, marking);
-        Map<Marking, BigDecimal> convertedSteadyStateMap = new HashMap<>();
-        for (Map.Entry<Marking, Double> entry : steadyStateMap.entrySet()) {
-            convertedSteadyStateMap.put(entry.getKey(), BigDecimal.valueOf(entry.getValue()));
+        Map<Marking, Double> solution;
+        // Oris explores the reachability graph and solves the CTMC in one call
+        try (Trace.Span span = Trace.span("steady_state")) {
+            solution = GSPNSteadyState.builder().build().compute(net, marking);
+        }
+        // packed once, so the Oris markings can be collected as soon as analyze() returns
+        try (Trace.Span span = Trace.span("pack")) {
+            steadyState = MarkingStore.of(net, placeBound, solution);
         }
-        SteadyStateSolution<Marking> solution = new SteadyStateSolution<>(convertedSteadyStateMap);
+        Trace.counter("state_space", "tangible", steadyState.size(), "bytes", steadyState.getMemoryBytes());
         System.out.println(rewardOfInterest());
-        rewardsSolution = SteadyStateSolution.computeRewards(solution, rewardOfInterest());
+        try (Trace.Span span = Trace.span("rewards")) {
+            indexRewards();
+        }
     }
 
-    private String rewardOfInterest() {
-        String endpointsReliabilityRewards = getEndpointsReliabilityRewards();
-        String endpointsUnavailabilityRewards = getEndpointsUnavailabilityRewards();
-        String healthyComputationRewards = getEndpointsHealthyComputationReward();
-        String resourceUsageReward = getResourceUsageReward();
-        return endpointsReliabilityRewards + endpointsUnavailabilityRewards + healthyComputationRewards +
-                resourceUsageReward;
+    private void indexRewards() {
+        Map<String, Double> valuesByRewardRate = new HashMap<>();
+        for (String rewardRate : rewardOfInterest().split(";")) {
+            valuesByRewardRate.put(rewardRate, steadyState.expectation(rewardRate, rewardPrecision));
+        }
+        rewardIndex = new HashMap<>();
+        for (RewardMetric metric : rewardRegistry.getMetrics()) {
+            for (Endpoint endpoint : metricEndpoints(metric)) {
+                double value = valuesByRewardRate.get(metric.rewardRateOf(endpoint));
+                rewardIndex.put(new RewardKey(endpoint, metric.name()), metric.scale().apply(endpoint, value));
+            }
+        }
     }
 
-    public BigDecimal getSteadyStateResourceUsage() {
-        Map<RewardRate, BigDecimal> steadyState = rewardsSolution.getSteadyState();
-        BigDecimal resourceUsage = steadyState.entrySet().stream()
-                .filter(t -> t.getKey().toString().equals(getResourceUsageReward())).findFirst().get().getValue();
-        return resourceUsage;
+    private List<Endpoint> metricEndpoints(RewardMetric metric) {
+        return metric.perEndpoint() ? endpoints : Collections.singletonList(null);
     }
 
-    public Map<Endpoint, BigDecimal> getSteadyStateEndpointsReliabilities() {
-        Map<RewardRate, BigDecimal> steadyState = rewardsSolution.getSteadyState();
-        Map<Endpoint, BigDecimal> reliabilties = new HashMap<>();
-        for (Endpoint endpoint : endpoints) {
-            reliabilties.put(endpoint,
-                    steadyState.entrySet().stream()
-                            .filter(t -> t.getKey().toString().equals(getSingleEndpointReliabilityReward(endpoint)))
-                            .findFirst().get().getValue().multiply(BigDecimal.valueOf(endpoint.serviceRate()))
-                            .multiply(BigDecimal.valueOf(endpoint.agedToFailedTendency())));
+    private String rewardOfInterest() {
+        Set<String> rewardRates = new LinkedHashSet<>();
+        for (RewardMetric metric : rewardRegistry.getMetrics()) {
+            for (Endpoint endpoint : metricEndpoints(metric)) {
+                rewardRates.add(metric.rewardRateOf(endpoint));
+            }
         }
-        return reliabilties;
+        return String.join(";", rewardRates);
     }
 
-    public Map<Endpoint, BigDecimal> getSteadyStateEndpointsUnavailiabilities() {
-        Map<RewardRate, BigDecimal> steadyState = rewardsSolution.getSteadyState();
-        Map<Endpoint, BigDecimal> unavailabilities = new HashMap<>();
-        for (Endpoint endpoint : endpoints) {
-            unavailabilities.put(endpoint,
-                    steadyState.entrySet().stream()
-                            .filter(t -> t.getKey().toString().equals(getSingleEndpointUnavailabilityReward(endpoint)))
-                            .findFirst().get().getValue());
+    public BigDecimal getSteadyStateReward(Endpoint endpoint, RewardMetric metric) {
+        if (rewardIndex == null) {
+            throw new IllegalStateException("Model not analyzed");
         }
-        return unavailabilities;
+        Double reward = rewardIndex.get(new RewardKey(metric.perEndpoint() ? endpoint : null, metric.name()));
+        if (reward == null) {
+            if (metric.perEndpoint() && !endpoints.contains(endpoint)) {
+                throw new IllegalArgumentException("Endpoint not in the model: " + endpoint);
+            }
+            throw new IllegalArgumentException("Metric not registered: " + metric.name());
+        }
+        // rewards are doubles up to here: decimals only for the callers that print them
+        return BigDecimal.valueOf(reward);
     }
 
-    public String getEndpointsUnavailabilityRewards() {
-        String reward = "";
+    public Map<Endpoint, BigDecimal> getSteadyStateEndpointsRewards(RewardMetric metric) {
+        Map<Endpoint, BigDecimal> rewards = new HashMap<>();
         for (Endpoint endpoint : endpoints) {
-            reward += getSingleEndpointUnavailabilityReward(endpoint) + ";";
+            rewards.put(endpoint, getSteadyStateReward(endpoint, metric));
         }
-        return reward;
+        return rewards;
     }
 
-    public String getEndpointsHealthyComputationReward() {
-        String reward = "";
-        for (Endpoint endpoint : endpoints) {
-            reward += getSingleEndpointHealthyComputationReward(endpoint) + ";";
-        }
-        return reward;
+    public BigDecimal getSteadyStateResourceUsage() {
+        return getSteadyStateReward(null, RewardRegistry.RESOURCE_USAGE);
+    }
+
+    public Map<Endpoint, BigDecimal> getSteadyStateEndpointsReliabilities() {
+        return getSteadyStateEndpointsRewards(RewardRegistry.RELIABILITY);
+    }
+
+    public Map<Endpoint, BigDecimal> getSteadyStateEndpointsUnavailiabilities() {
+        return getSteadyStateEndpointsRewards(RewardRegistry.UNAVAILABILITY);
     }
 
     public Map<Endpoint, BigDecimal> getSteadyStateAgingContributions() {
-        Map<RewardRate, BigDecimal> steadyState = rewardsSolution.getSteadyState();
-        Map<Endpoint, BigDecimal> contributions = new HashMap<>();
-        for (Endpoint endpoint : endpoints) {
-            contributions.put(endpoint,
-                    steadyState.entrySet().stream()
-                            .filter(t -> t.getKey().toString().equals(getSingleEndpointReliabilityReward(endpoint)))
-                            .findFirst().get().getValue().multiply(BigDecimal.valueOf(endpoint.serviceRate()))
-                            .multiply(BigDecimal.valueOf(endpoint.healthyToAgedTendency())));
-        }
-        return contributions;
+        return getSteadyStateEndpointsRewards(RewardRegistry.AGING_CONTRIBUTION);
     }
 
-    private String getSingleEndpointUnavailabilityReward(Endpoint endpoint) {
-        return "If((Healthy+Aged)==0," + endpoint.arrivalRate() + ",0)";
+    public String getEndpointsUnavailabilityRewards() {
+        return getEndpointsRewards(RewardRegistry.UNAVAILABILITY);
     }
 
-    private String getSingleEndpointHealthyComputationReward(Endpoint endpoint) {
-        return "HealthyComputation" + endpoint.id();
+    public String getEndpointsHealthyComputationReward() {
+        return getEndpointsRewards(RewardRegistry.HEALTHY_COMPUTATION);
     }
 
     public String getEndpointsReliabilityRewards() {
+        return getEndpointsRewards(RewardRegistry.RELIABILITY);
+    }
+
+    private String getEndpointsRewards(RewardMetric metric) {
         String reward = "";
         for (Endpoint endpoint : endpoints) {
-            reward += getSingleEndpointReliabilityReward(endpoint) + ";";
+            reward += metric.rewardRateOf(endpoint) + ";";
         }
         return reward;
     }
 
-    private String getSingleEndpointReliabilityReward(Endpoint endpoint) {
-        return "AgedComputation" + endpoint.id();
+    public String getResourceUsageReward() {
+        return RewardRegistry.RESOURCE_USAGE.rewardRateOf(null);
     }
 
-    public String getResourceUsageReward() {
-        return "Healthy+Aged";
+    /** Tangible markings and their steady-state probabilities, once analyzed. */
+    public MarkingStore getSteadyState() {
+        return steadyState;
     }
 
     public List<Endpoint> getEndpoints() {
@@ -140,6 +162,22 @@ public class ReplicaSetModel {
         this.endpoints = endpoints;
     }
 
+    public RewardPrecision getRewardPrecision() {
+        return rewardPrecision;
+    }
+
+    public void setRewardPrecision(RewardPrecision rewardPrecision) {
+        this.rewardPrecision = rewardPrecision;
+    }
+
+    public RewardRegistry getRewardRegistry() {
+        return rewardRegistry;
+    }
+
+    public void setRewardRegistry(RewardRegistry rewardRegistry) {
+        this.rewardRegistry = rewardRegistry;
+    }
+
 
     @Deprecated
     private String getSingleEndpointReliabilityRewardOLD(Endpoint endpoint) {
@@ -0,0 +1,70 @@
+package it.unifi.dinfo.stlab;
+
+import java.io.BufferedWriter;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+
+/**
+ * CSV result file kept open for the whole analysis: rows are buffered and
+ * flushed every {@code flushEvery} rows, or with the first row written
+ * {@code flushMillis} after the previous flush, instead of reopening the file
+ * per row. The analyses also call {@link #flush} at their checkpoints (the end
+ * of a configuration or of a workload), so that {@code watch_results.py} can
+ * follow a running sweep a checkpoint at a time.
+ * <p>
+ * Only CSV is written from Java. The NDJSON, Parquet and Arrow result files
+ * are written by the Python analyses ({@code --format}); the Python readers
+ * take this CSV as it is.
+ */
+public class ResultWriter implements AutoCloseable {
+
+    private static final int DEFAULT_FLUSH_EVERY = 256;
+    private static final long DEFAULT_FLUSH_MILLIS = 2000;
+
+    private final BufferedWriter writer;
+    private final int flushEvery;
+    private final long flushNanos;
+    private int pendingRows;
+    private long lastFlush = System.nanoTime();
+
+    public ResultWriter(Path path, String cols) throws IOException {
+        this(path, cols, DEFAULT_FLUSH_EVERY, DEFAULT_FLUSH_MILLIS);
+    }
+
+    public ResultWriter(Path path, String cols, int flushEvery, long flushMillis) throws IOException {
+        if (flushEvery < 1 || flushMillis < 0) {
+            throw new IllegalArgumentException("Invalid flush policy: " + flushEvery + " rows, " + flushMillis + " ms");
+        }
+        this.writer = Files.newBufferedWriter(path, StandardCharsets.UTF_8);
+        this.flushEvery = flushEvery;
+        this.flushNanos = flushMillis * 1_000_000;
+        writer.write(cols);
+        writer.newLine();
+        // the header at once: followers know the columns before the first row
+        writer.flush();
+    }
+
+    public void addRow(String row) throws IOException {
+        writer.write(row);
+        writer.newLine();
+        if (++pendingRows >= flushEvery || System.nanoTime() - lastFlush >= flushNanos) {
+            flush();
+        }
+    }
+
+    /** Writes out the buffered rows; a no-op if there are none. */
+    public void flush() throws IOException {
+        if (pendingRows > 0) {
+            writer.flush();
+            pendingRows = 0;
+        }
+        lastFlush = System.nanoTime();
+    }
+
+    @Override
+    public void close() throws IOException {
+        writer.close();
+    }
+}
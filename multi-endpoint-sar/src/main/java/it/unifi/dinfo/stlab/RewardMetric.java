@@ -0,0 +1,39 @@
+package it.unifi.dinfo.stlab;
+
+import java.util.function.Function;
+
+/**
+ * A steady-state metric of a replica set: the reward rate expression to be
+ * evaluated by Oris and the scaling applied to its steady-state value, in
+ * double precision (results become decimals only when they are read).
+ * Per-endpoint metrics build their expression from the endpoint; global
+ * metrics receive {@code null} and are indexed with a {@code null} endpoint.
+ */
+public record RewardMetric(String name, boolean perEndpoint, Function<Endpoint, String> rewardRate, Scale scale) {
+
+    @FunctionalInterface
+    public interface Scale {
+        double apply(Endpoint endpoint, double value);
+    }
+
+    public static RewardMetric perEndpoint(String name, Function<Endpoint, String> rewardRate) {
+        return new RewardMetric(name, true, rewardRate, (endpoint, value) -> value);
+    }
+
+    public static RewardMetric perEndpoint(String name, Function<Endpoint, String> rewardRate, Scale scale) {
+        return new RewardMetric(name, true, rewardRate, scale);
+    }
+
+    public static RewardMetric global(String name, String rewardRate) {
+        return new RewardMetric(name, false, endpoint -> rewardRate, (endpoint, value) -> value);
+    }
+
+    public String rewardRateOf(Endpoint endpoint) {
+        return rewardRate.apply(endpoint);
+    }
+
+    @Override
+    public String toString() {
+        return name;
+    }
+}
@@ -0,0 +1,107 @@
+package it.unifi.dinfo.stlab;
+
+import java.math.BigDecimal;
+
+/**
+ * How {@link MarkingStore} sums probability times reward value over the states.
+ * Probabilities and reward values are doubles, so extended precision cannot
+ * improve on their accuracy: it only bounds the rounding of the sum itself.
+ * <ul>
+ * <li>{@code DOUBLE}: plain dot product, error at most
+ * {@code n u / (1 - n u) * sum|p r|} with {@code u = 2^-53};</li>
+ * <li>{@code KAHAN}: compensated (Neumaier) dot product, error at most
+ * {@code (3 u + 4 n u^2) * sum|p r|}, independent of {@code n} in practice;</li>
+ * <li>{@code DECIMAL}: the former {@code BigDecimal} path (exact sums of
+ * {@code BigDecimal.valueOf} products), kept as reference: it also computes
+ * the two double sums and fails if either is outside its bound.</li>
+ * </ul>
+ */
+public enum RewardPrecision {
+    DOUBLE, KAHAN, DECIMAL;
+
+    static final double UNIT_ROUNDOFF = Math.ulp(1.0) / 2;
+
+    public double sum(double[] probabilities, double[] values, int n) {
+        switch (this) {
+            case DOUBLE:
+                return plainSum(probabilities, values, n);
+            case KAHAN:
+                return compensatedSum(probabilities, values, n);
+            default:
+                return checkedDecimalSum(probabilities, values, n).doubleValue();
+        }
+    }
+
+    /** Largest rounding error of {@link #sum} for {@code n} terms with {@code sum|p r| = absoluteSum}. */
+    public double errorBound(int n, double absoluteSum) {
+        double u = UNIT_ROUNDOFF;
+        switch (this) {
+            case DOUBLE:
+                return n * u / (1 - n * u) * absoluteSum;
+            case KAHAN:
+                return (3 * u + 4 * n * u * u) * absoluteSum;
+            default:
+                return 0;
+        }
+    }
+
+    static double plainSum(double[] probabilities, double[] values, int n) {
+        double sum = 0;
+        for (int i = 0; i < n; i++) {
+            sum += probabilities[i] * values[i];
+        }
+        return sum;
+    }
+
+    static double compensatedSum(double[] probabilities, double[] values, int n) {
+        double sum = 0;
+        double compensation = 0;
+        for (int i = 0; i < n; i++) {
+            double term = probabilities[i] * values[i];
+            double next = sum + term;
+            if (Math.abs(sum) >= Math.abs(term)) {
+                compensation += (sum - next) + term;
+            } else {
+                compensation += (term - next) + sum;
+            }
+            sum = next;
+        }
+        return sum + compensation;
+    }
+
+    static BigDecimal decimalSum(double[] probabilities, double[] values, int n) {
+        BigDecimal sum = BigDecimal.ZERO;
+        for (int i = 0; i < n; i++) {
+            sum = sum.add(BigDecimal.valueOf(probabilities[i]).multiply(BigDecimal.valueOf(values[i])));
+        }
+        return sum;
+    }
+
+    /**
+     * {@link #decimalSum}, after checking the double sums against it. The
+     * reference is exact on the shortest decimal forms of the doubles, each
+     * within {@code u} of the binary value: its products may differ from the
+     * exact ones by {@code (2 u + u^2) |p r|}, and the double sum is converted too:
+     * {@code 4 u sum|p r|} widens the bounds.
+     */
+    static BigDecimal checkedDecimalSum(double[] probabilities, double[] values, int n) {
+        BigDecimal reference = decimalSum(probabilities, values, n);
+        double absoluteSum = 0;
+        for (int i = 0; i < n; i++) {
+            absoluteSum += Math.abs(probabilities[i] * values[i]);
+        }
+        // absoluteSum itself is rounded: (1 + 2 n u) covers it
+        absoluteSum *= 1 + 2 * n * UNIT_ROUNDOFF;
+        double representation = 4 * UNIT_ROUNDOFF * absoluteSum;
+        for (RewardPrecision precision : new RewardPrecision[] { DOUBLE, KAHAN }) {
+            double value = precision.sum(probabilities, values, n);
+            double error = BigDecimal.valueOf(value).subtract(reference).abs().doubleValue();
+            double bound = precision.errorBound(n, absoluteSum) + representation;
+            if (error > bound) {
+                throw new ArithmeticException(precision + " reward sum " + value + " differs from " + reference
+                        + " by " + error + ", above its bound " + bound);
+            }
+        }
+        return reference;
+    }
+}
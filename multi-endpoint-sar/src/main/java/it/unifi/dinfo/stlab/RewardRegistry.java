@@ -0,0 +1,62 @@
+package it.unifi.dinfo.stlab;
+
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Declares the metrics computed by {@link ReplicaSetModel#analyze()}. A new
+ * metric only needs to be registered here: the model evaluates every distinct
+ * reward expression once and indexes the results by (endpoint, metric).
+ */
+public class RewardRegistry {
+
+    public static final RewardMetric RELIABILITY = RewardMetric.perEndpoint("Reliability",
+            endpoint -> "AgedComputation" + endpoint.id(),
+            (endpoint, value) -> value * endpoint.serviceRate() * endpoint.agedToFailedTendency());
+
+    public static final RewardMetric UNAVAILABILITY = RewardMetric.perEndpoint("Unavailability",
+            endpoint -> "If((Healthy+Aged)==0," + endpoint.arrivalRate() + ",0)");
+
+    public static final RewardMetric AGING_CONTRIBUTION = RewardMetric.perEndpoint("Aging Contribution",
+            endpoint -> "AgedComputation" + endpoint.id(),
+            (endpoint, value) -> value * endpoint.serviceRate() * endpoint.healthyToAgedTendency());
+
+    public static final RewardMetric HEALTHY_COMPUTATION = RewardMetric.perEndpoint("Healthy Computation",
+            endpoint -> "HealthyComputation" + endpoint.id());
+
+    public static final RewardMetric RESOURCE_USAGE = RewardMetric.global("Resource Usage", "Healthy+Aged");
+
+    private final Map<String, RewardMetric> metrics = new LinkedHashMap<>();
+
+    public static RewardRegistry defaultRegistry() {
+        RewardRegistry registry = new RewardRegistry();
+        registry.register(RELIABILITY);
+        registry.register(UNAVAILABILITY);
+        registry.register(HEALTHY_COMPUTATION);
+        registry.register(AGING_CONTRIBUTION);
+        registry.register(RESOURCE_USAGE);
+        return registry;
+    }
+
+    public RewardRegistry register(RewardMetric metric) {
+        if (metrics.putIfAbsent(metric.name(), metric) != null) {
+            throw new IllegalArgumentException("Metric already registered: " + metric.name());
+        }
+        return this;
+    }
+
+    public RewardMetric get(String name) {
+        RewardMetric metric = metrics.get(name);
+        if (metric == null) {
+            throw new IllegalArgumentException("Unknown metric: " + name);
+        }
+        return metric;
+    }
+
+    public List<RewardMetric> getMetrics() {
+        return Collections.unmodifiableList(new ArrayList<>(metrics.values()));
+    }
+}
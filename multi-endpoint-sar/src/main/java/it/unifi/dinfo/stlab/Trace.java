@@ -0,0 +1,205 @@
+package it.unifi.dinfo.stlab;
+
+import java.io.IOException;
+import java.io.UncheckedIOException;
+import java.nio.ByteBuffer;
+import java.nio.CharBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Path;
+import java.nio.file.StandardOpenOption;
+import java.time.Instant;
+import java.util.ArrayDeque;
+import java.util.Deque;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.stream.Collectors;
+
+/**
+ * Timing spans and counters of the analysis phases, written as Chrome trace
+ * events ({@code "X"} and {@code "C"}, one JSON object per line) to the file
+ * named by {@code -Dsar.trace}. The format is the one of the Python
+ * {@code replicaset.trace}: every event is a single append, so several runs
+ * can share a file, and {@code sar-results trace} aggregates it per phase.
+ * Labels given to a span (configuration, replicas, ...) are inherited by the
+ * spans and counters opened inside it on the same thread.
+ * <p>
+ * Without the property {@link #span} returns a shared no-op span, so the
+ * hooks cost one field read and can stay in place.
+ */
+public final class Trace {
+
+    private static final FileChannel CHANNEL = open(System.getProperty("sar.trace"));
+    private static final long PID = ProcessHandle.current().pid();
+    // System.nanoTime() + EPOCH_NANOS is the wall clock, in nanoseconds since the epoch
+    private static final long EPOCH_NANOS = epochNanos();
+    private static final ThreadLocal<Deque<Map<String, Object>>> LABELS = ThreadLocal.withInitial(ArrayDeque::new);
+    private static final Span DISABLED = new Span(null, null, 0);
+
+    private Trace() {
+    }
+
+    private static FileChannel open(String path) {
+        if (path == null || path.isEmpty()) {
+            return null;
+        }
+        try {
+            return FileChannel.open(Path.of(path), StandardOpenOption.CREATE, StandardOpenOption.WRITE,
+                    StandardOpenOption.APPEND);
+        } catch (IOException e) {
+            throw new UncheckedIOException("Cannot open the trace file " + path, e);
+        }
+    }
+
+    private static long epochNanos() {
+        Instant now = Instant.now();
+        return now.getEpochSecond() * 1_000_000_000L + now.getNano() - System.nanoTime();
+    }
+
+    public static boolean isEnabled() {
+        return CHANNEL != null;
+    }
+
+    /** Label of a replica set as in the result files, e.g. {@code A+B}. */
+    public static String configuration(List<Endpoint> endpoints) {
+        return endpoints.stream().map(Endpoint::id).collect(Collectors.joining("+"));
+    }
+
+    /**
+     * Starts timing the phase {@code name}, to be closed by try-with-resources;
+     * {@code labels} are name, value pairs added to the inherited ones.
+     */
+    public static Span span(String name, Object... labels) {
+        if (CHANNEL == null) {
+            return DISABLED;
+        }
+        Deque<Map<String, Object>> stack = LABELS.get();
+        Map<String, Object> merged = stack.isEmpty() ? new LinkedHashMap<>() : new LinkedHashMap<>(stack.peek());
+        putPairs(merged, labels);
+        stack.push(merged);
+        return new Span(name, merged, System.nanoTime());
+    }
+
+    /** Numeric {@code values} (name, value pairs) at this instant, with the labels of the enclosing spans. */
+    public static void counter(String name, Object... values) {
+        if (CHANNEL == null) {
+            return;
+        }
+        Map<String, Object> args = new LinkedHashMap<>();
+        putPairs(args, values);
+        Deque<Map<String, Object>> stack = LABELS.get();
+        StringBuilder json = event(name, "C", System.nanoTime());
+        json.append(",\"args\":");
+        appendObject(json, args);
+        json.append(",\"labels\":");
+        appendObject(json, stack.isEmpty() ? Map.of() : stack.peek());
+        write(json.append("}\n"));
+    }
+
+    /** A running phase; closing it writes its event. */
+    public static final class Span implements AutoCloseable {
+
+        private final String name;
+        private final Map<String, Object> labels;
+        private final long start;
+
+        private Span(String name, Map<String, Object> labels, long start) {
+            this.name = name;
+            this.labels = labels;
+            this.start = start;
+        }
+
+        @Override
+        public void close() {
+            if (name == null) {
+                return;
+            }
+            long end = System.nanoTime();
+            LABELS.get().pop();
+            StringBuilder json = event(name, "X", start);
+            json.append(",\"dur\":");
+            appendMicros(json, end - start);
+            json.append(",\"args\":");
+            appendObject(json, labels);
+            write(json.append("}\n"));
+        }
+    }
+
+    private static void putPairs(Map<String, Object> target, Object[] pairs) {
+        if (pairs.length % 2 != 0) {
+            throw new IllegalArgumentException("Trace labels must be name, value pairs");
+        }
+        for (int i = 0; i < pairs.length; i += 2) {
+            target.put(String.valueOf(pairs[i]), pairs[i + 1]);
+        }
+    }
+
+    private static StringBuilder event(String name, String phase, long nanos) {
+        StringBuilder json = new StringBuilder(192);
+        json.append("{\"name\":");
+        appendString(json, name);
+        json.append(",\"cat\":\"sar\",\"ph\":\"").append(phase).append("\",\"ts\":");
+        appendMicros(json, nanos + EPOCH_NANOS);
+        json.append(",\"pid\":").append(PID).append(",\"tid\":").append(Thread.currentThread().threadId());
+        return json;
+    }
+
+    private static void appendMicros(StringBuilder json, long nanos) {
+        long fraction = nanos % 1000;
+        json.append(nanos / 1000).append('.');
+        if (fraction < 100) {
+            json.append(fraction < 10 ? "00" : "0");
+        }
+        json.append(fraction);
+    }
+
+    private static void appendObject(StringBuilder json, Map<String, Object> values) {
+        json.append('{');
+        boolean first = true;
+        for (Map.Entry<String, Object> entry : values.entrySet()) {
+            if (!first) {
+                json.append(',');
+            }
+            first = false;
+            appendString(json, entry.getKey());
+            json.append(':');
+            Object value = entry.getValue();
+            if (value instanceof Number number && Double.isFinite(number.doubleValue())) {
+                json.append(number);
+            } else if (value instanceof Boolean) {
+                json.append(value);
+            } else {
+                appendString(json, String.valueOf(value));
+            }
+        }
+        json.append('}');
+    }
+
+    private static void appendString(StringBuilder json, String text) {
+        json.append('"');
+        for (int i = 0; i < text.length(); i++) {
+            char c = text.charAt(i);
+            if (c == '"' || c == '\\') {
+                json.append('\\').append(c);
+            } else if (c < 0x20) {
+                json.append(String.format("\\u%04x", (int) c));
+            } else {
+                json.append(c);
+            }
+        }
+        json.append('"');
+    }
+
+    private static void write(CharSequence json) {
+        ByteBuffer buffer = StandardCharsets.UTF_8.encode(CharBuffer.wrap(json));
+        try {
+            // one write per event: appends of concurrent writers do not interleave
+            while (buffer.hasRemaining()) {
+                CHANNEL.write(buffer);
+            }
+        } catch (IOException e) {
+            throw new UncheckedIOException("Cannot write the trace file", e);
+        }
+    }
+}
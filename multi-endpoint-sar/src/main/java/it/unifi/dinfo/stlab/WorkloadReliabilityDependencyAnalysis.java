@@ -1,8 +1,5 @@
 package it.unifi.dinfo.stlab;
 
-import java.io.BufferedWriter;
-import java.io.File;
-import java.io.FileWriter;
 import java.io.IOException;
 import java.math.BigDecimal;
 import java.nio.file.Files;
@@ -20,7 +17,6 @@ public class WorkloadReliabilityDependencyAnalysis {
     public static void main(String[] args) throws IOException {
 
         Path experimentPath = createExperimentPath();
-        String resultFilePath = initializeResultFile(experimentPath);
 
         double serviceRateA = 25. / 10.;
 
@@ -37,25 +33,34 @@ public class WorkloadReliabilityDependencyAnalysis {
         List<Double> agingRates = List.of(0.01, 0.1, 0.3, 0.5, 0.8);
         List<Double> arrivalRates = List.of(1., 5., 10., 15., 20., 25., 30., 50., 100.);
 
-        for (Double workload : arrivalRates) {
-            for (Double agingRate : agingRates) {
+        try (ResultWriter resultWriter = initializeResultFile(experimentPath)) {
+            for (Double workload : arrivalRates) {
+                for (Double agingRate : agingRates) {
 
-                Endpoint endpoint = new Endpoint("A", workload, serviceRateA, agingRate,
-                        agingRate);
+                    Endpoint endpoint = new Endpoint("A", workload, serviceRateA, agingRate,
+                            agingRate);
 
-                ReplicaSetModel replicaSetModel = builder.build(endpoint);
-                replicaSetModel.analyze();
+                    try (Trace.Span point = Trace.span("point", "configuration", endpoint.id(),
+                            "replicas", numOfReplicas, "arrivalRate", workload, "agingRate", agingRate)) {
+                        ReplicaSetModel replicaSetModel = builder.build(endpoint);
+                        replicaSetModel.analyze();
 
 
-                Map<Endpoint, BigDecimal> steadyStateEndpointsReliabilities = replicaSetModel
-                                .getSteadyStateEndpointsReliabilities();
+                        Map<Endpoint, BigDecimal> steadyStateEndpointsReliabilities = replicaSetModel
+                                        .getSteadyStateEndpointsReliabilities();
 
-                BigDecimal reliability = steadyStateEndpointsReliabilities.get(endpoint);
+                        BigDecimal reliability = steadyStateEndpointsReliabilities.get(endpoint);
 
-                addRow(resultFilePath, workload + "," + agingRate + "," + reliability );
+                        try (Trace.Span span = Trace.span("write")) {
+                            resultWriter.addRow(workload + "," + agingRate + "," + reliability);
+                        }
+                    }
 
-            }
+                }
+                // checkpoint: every aging rate of this workload
+                resultWriter.flush();
 
+            }
         }
 
     }
@@ -71,40 +76,19 @@ public class WorkloadReliabilityDependencyAnalysis {
         return path;
     }
 
-    private static void saveEndpointInfo(Path basePath, Endpoint... endpoints) {
-        String endpointInfoFileName = "endpointInfo.csv";
-        File file = new File(basePath.toFile(), endpointInfoFileName);
-        String filePath = file.getPath();
-        createCsv(filePath, Endpoint.getAttributeOreder());
-        for (Endpoint endpoint : endpoints) {
-            addRow(filePath, endpoint.toString());
-        }
-    }
-
-    private static void createCsv(String filePath, String cols) {
-        try (BufferedWriter writer = new BufferedWriter(new FileWriter(filePath))) {
-            writer.write(cols);
-            writer.newLine();
-        } catch (IOException e) {
-            e.printStackTrace();
-        }
-    }
-
-    private static void addRow(String filePath, String row) {
-        try (BufferedWriter writer = new BufferedWriter(new FileWriter(filePath, true))) {
-            writer.write(row);
-            writer.newLine();
-        } catch (IOException e) {
-            e.printStackTrace();
+    private static void saveEndpointInfo(Path basePath, Endpoint... endpoints) throws IOException {
+        try (ResultWriter writer = new ResultWriter(basePath.resolve("endpointInfo.csv"),
+                Endpoint.getAttributeOreder())) {
+            for (Endpoint endpoint : endpoints) {
+                writer.addRow(endpoint.toString());
+            }
         }
     }
 
-    private static String initializeResultFile(Path basePath) {
-        String resultsFileName = "workload_reliability.csv";
-        File file = new File(basePath.toFile(), resultsFileName);
-        String filePath = file.getPath();
-        createCsv(filePath, RESULT_COLS);
-        return filePath;
+    private static ResultWriter initializeResultFile(Path basePath) throws IOException {
+        // batched rows, flushed at the checkpoints of main so the file can be followed
+        // (watch_results.py) while the analysis is running; the Java stream is plain CSV rows
+        return new ResultWriter(basePath.resolve("workload_reliability.csv"), RESULT_COLS);
     }
 
 }
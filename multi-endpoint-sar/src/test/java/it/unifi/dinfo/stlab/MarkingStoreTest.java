@@ -0,0 +1,110 @@
+package it.unifi.dinfo.stlab;
+
+import static org.junit.jupiter.api.Assertions.assertArrayEquals;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+
+import org.junit.jupiter.api.Test;
+import org.oristool.models.stpn.MarkingExpr;
+import org.oristool.petrinet.Marking;
+import org.oristool.petrinet.PetriNet;
+
+class MarkingStoreTest {
+
+    private static PetriNet net(int places) {
+        PetriNet net = new PetriNet();
+        for (int i = 0; i < places; i++) {
+            net.addPlace("P" + i);
+        }
+        return net;
+    }
+
+    private static Marking marking(PetriNet net, int... tokens) {
+        Marking marking = new Marking();
+        for (int i = 0; i < tokens.length; i++) {
+            marking.setTokens(net.getPlace("P" + i), tokens[i]);
+        }
+        return marking;
+    }
+
+    private static int[] tokens(MarkingStore store, PetriNet net, int state) {
+        int[] tokens = new int[net.getPlaces().size()];
+        for (int i = 0; i < tokens.length; i++) {
+            tokens[i] = store.getTokens(state, store.getPlaceIndex("P" + i));
+        }
+        return tokens;
+    }
+
+    @Test
+    void packsMarkingsAtTheBound() {
+        PetriNet net = net(3);
+        MarkingStore store = new MarkingStore(net, 4, 2);
+        int full = store.put(marking(net, 4, 4, 4), 0.75);
+        int empty = store.put(marking(net, 0, 0, 0), 0.25);
+        assertArrayEquals(new int[] { 4, 4, 4 }, tokens(store, net, full));
+        assertArrayEquals(new int[] { 0, 0, 0 }, tokens(store, net, empty));
+        assertEquals(full, store.indexOf(marking(net, 4, 4, 4)));
+        assertEquals(-1, store.indexOf(marking(net, 4, 0, 4)));
+        assertEquals(0.75, store.getProbability(full));
+        assertEquals(marking(net, 4, 4, 4), store.getMarking(full));
+        // putting a stored marking again replaces its probability
+        assertEquals(full, store.put(marking(net, 4, 4, 4), 0.5));
+        assertEquals(2, store.size());
+        assertEquals(0.5, store.getProbability(full));
+    }
+
+    @Test
+    void rejectsMarkingsBeyondTheBound() {
+        PetriNet net = net(3);
+        // 3-bit fields could hold 7 tokens, the bound is still 4
+        MarkingStore store = new MarkingStore(net, 4, 2);
+        assertThrows(IllegalArgumentException.class, () -> store.put(marking(net, 0, 5, 0), 1));
+        assertThrows(IllegalArgumentException.class, () -> store.indexOf(marking(net, 5, 0, 0)));
+        assertThrows(IllegalArgumentException.class, () -> new MarkingStore(net, 0, 2));
+        assertEquals(0, store.size());
+    }
+
+    @Test
+    void growsAcrossWordsAndKeepsEveryState() {
+        // 30 places of 3 bits need two words per marking
+        PetriNet net = net(30);
+        MarkingStore store = new MarkingStore(net, 7, 1);
+        List<int[]> stored = new ArrayList<>();
+        for (int state = 0; state < 1000; state++) {
+            // base-8 digits of the state number: every marking is new
+            int[] tokens = new int[30];
+            for (int i = 0; i < 30; i++) {
+                tokens[i] = (state >> (3 * (i % 4))) & 7;
+            }
+            assertEquals(state, store.put(marking(net, tokens), state));
+            stored.add(tokens);
+        }
+        assertEquals(1000, store.size());
+        for (int state = 0; state < stored.size(); state++) {
+            assertEquals(state, store.indexOf(marking(net, stored.get(state))));
+            assertArrayEquals(stored.get(state), tokens(store, net, state));
+        }
+    }
+
+    @Test
+    void rewardValuesMatchOris() {
+        PetriNet net = net(3);
+        MarkingStore store = MarkingStore.of(net, 0, Map.of(marking(net, 1, 2, 0), 0.5,
+                marking(net, 0, 0, 3), 0.3, marking(net, 2, 1, 1), 0.2));
+        // linear sums are read from the packed fields, the others are evaluated by Oris
+        for (String reward : List.of("P0+P1", "2.5*P2+1", "If((P0+P1)==0,10.0,0)", "P0*P1")) {
+            MarkingExpr expr = MarkingExpr.from(reward, net);
+            double[] values = store.getRewardValues(reward);
+            double expectation = 0;
+            for (int state = 0; state < store.size(); state++) {
+                assertEquals(expr.evaluate(store.getMarking(state)), values[state], 0, reward);
+                expectation += store.getProbability(state) * values[state];
+            }
+            assertEquals(expectation, store.expectation(reward, RewardPrecision.KAHAN), 1e-15, reward);
+        }
+    }
+}
@@ -0,0 +1,98 @@
+package it.unifi.dinfo.stlab;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+
+import java.io.IOException;
+import java.math.BigDecimal;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.junit.jupiter.api.Test;
+
+/**
+ * Steady-state rewards of {@link ReplicaSetModel#analyze} against the result
+ * set of the Python solver in {@code scripts/tests/reference} (4 replicas,
+ * the endpoints and builder parameters of {@link ReplicaSetAnalysis}): the
+ * Java and Python analyses must agree to a relative 1e-9.
+ */
+class ReplicaSetModelTest {
+
+    private static final Path REFERENCE = Path.of("scripts", "tests", "reference");
+    private static final double TOLERANCE = 1e-9;
+
+    private static ReplicaSetBuilder builder(int replicas) {
+        ReplicaSetBuilder builder = new ReplicaSetBuilder();
+        builder.setRepairRate(10);
+        builder.setRejuvenationRate(10);
+        builder.setFalsePositiveProb(25. / 100.);
+        builder.setFalseNegativeProb(25. / 100.);
+        builder.setNumOfReplicas(replicas);
+        return builder;
+    }
+
+    private static List<String[]> rows(String file) throws IOException {
+        List<String> lines = Files.readAllLines(REFERENCE.resolve(file));
+        List<String[]> rows = new ArrayList<>();
+        for (String line : lines.subList(1, lines.size())) {
+            rows.add(line.replace("\"", "").split(","));
+        }
+        return rows;
+    }
+
+    private static void assertClose(double expected, BigDecimal actual, String what) {
+        double tolerance = Math.max(TOLERANCE * Math.abs(expected), 1e-15);
+        assertEquals(expected, actual.doubleValue(), tolerance, what);
+    }
+
+    @Test
+    void analyzeMatchesReference() throws IOException {
+        Map<String, Endpoint> endpoints = new LinkedHashMap<>();
+        for (String[] row : rows("endpointInfo.csv")) {
+            endpoints.put(row[0], new Endpoint(row[0], Double.parseDouble(row[1]), Double.parseDouble(row[2]),
+                    Double.parseDouble(row[3]), Double.parseDouble(row[4])));
+        }
+        List<String[]> results = rows("analysisResults.csv");
+        assertFalse(results.isEmpty());
+        for (String[] row : results) {
+            Endpoint endpoint = endpoints.get(row[0]);
+            List<Endpoint> configuration = new ArrayList<>();
+            for (String id : row[1].split("\\+")) {
+                configuration.add(endpoints.get(id));
+            }
+            int replicas = Integer.parseInt(row[2]);
+            ReplicaSetModel model = builder(replicas).build(configuration.toArray(new Endpoint[0]));
+            model.analyze();
+
+            String what = row[0] + " in " + row[1] + " with " + replicas + " replicas: ";
+            assertClose(Double.parseDouble(row[3]), model.getSteadyStateEndpointsReliabilities().get(endpoint),
+                    what + "Reliability");
+            assertClose(Double.parseDouble(row[4]), model.getSteadyStateEndpointsUnavailiabilities().get(endpoint),
+                    what + "Unavailability");
+            assertClose(Double.parseDouble(row[5]), model.getSteadyStateAgingContributions().get(endpoint),
+                    what + "Aging Contribution");
+            assertClose(Double.parseDouble(row[6]), model.getSteadyStateResourceUsage(), what + "Resource Usage");
+        }
+    }
+
+    @Test
+    void unknownMetricsAndEndpointsAreRejected() {
+        Endpoint a = new Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.);
+        ReplicaSetModel model = builder(2).build(a);
+        RewardMetric unregistered = RewardMetric.global("Idle", "Idle");
+        assertThrows(IllegalStateException.class, () -> model.getSteadyStateReward(null, unregistered));
+        model.analyze();
+        IllegalArgumentException metric = assertThrows(IllegalArgumentException.class,
+                () -> model.getSteadyStateReward(null, unregistered));
+        assertEquals("Metric not registered: Idle", metric.getMessage());
+        Endpoint b = new Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.);
+        IllegalArgumentException endpoint = assertThrows(IllegalArgumentException.class,
+                () -> model.getSteadyStateReward(b, RewardRegistry.RELIABILITY));
+        assertEquals("Endpoint not in the model: " + b, endpoint.getMessage());
+    }
+}
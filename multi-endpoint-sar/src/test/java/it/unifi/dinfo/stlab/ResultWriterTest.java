@@ -0,0 +1,51 @@
+package it.unifi.dinfo.stlab;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.List;
+
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+class ResultWriterTest {
+
+    @TempDir
+    Path directory;
+
+    private List<String> lines(Path path) throws IOException {
+        return Files.readAllLines(path);
+    }
+
+    @Test
+    void flushesInBatchesAndAtCheckpoints() throws IOException {
+        Path path = directory.resolve("results.csv");
+        try (ResultWriter writer = new ResultWriter(path, "a,b", 3, 60_000)) {
+            assertEquals(List.of("a,b"), lines(path));
+            writer.addRow("1,2");
+            writer.addRow("3,4");
+            assertEquals(1, lines(path).size());
+            writer.addRow("5,6");
+            assertEquals(4, lines(path).size());
+            writer.addRow("7,8");
+            assertEquals(4, lines(path).size());
+            writer.flush();
+            assertEquals(5, lines(path).size());
+            writer.addRow("9,10");
+        }
+        assertEquals(List.of("a,b", "1,2", "3,4", "5,6", "7,8", "9,10"), lines(path));
+    }
+
+    @Test
+    void flushesEveryRowWithoutInterval() throws IOException {
+        Path path = directory.resolve("results.csv");
+        try (ResultWriter writer = new ResultWriter(path, "a", 100, 0)) {
+            writer.addRow("1");
+            assertEquals(List.of("a", "1"), lines(path));
+        }
+        assertThrows(IllegalArgumentException.class, () -> new ResultWriter(path, "a", 0, 0));
+    }
+}
@@ -0,0 +1,95 @@
+package it.unifi.dinfo.stlab;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+import java.math.BigDecimal;
+import java.util.LinkedHashSet;
+import java.util.Set;
+
+import org.junit.jupiter.api.Test;
+
+/**
+ * Rounding-error bounds of {@link RewardPrecision} on the steady state of a
+ * replica set, through {@link MarkingStore#expectation}.
+ */
+class RewardPrecisionTest {
+
+    private static ReplicaSetModel analyzed(int replicas, RewardPrecision precision) {
+        ReplicaSetBuilder builder = new ReplicaSetBuilder();
+        builder.setRepairRate(10);
+        builder.setRejuvenationRate(10);
+        builder.setFalsePositiveProb(25. / 100.);
+        builder.setFalseNegativeProb(25. / 100.);
+        builder.setNumOfReplicas(replicas);
+        ReplicaSetModel model = builder.build(new Endpoint("A", 100. / 10., 25. / 10., 10. / 100., 1. / 100.),
+                new Endpoint("B", 50. / 10., 50. / 10., 1. / 100., 10. / 100.));
+        model.setRewardPrecision(precision);
+        model.analyze();
+        return model;
+    }
+
+    private static Set<String> rewardRates(ReplicaSetModel model) {
+        Set<String> rates = new LinkedHashSet<>();
+        for (RewardMetric metric : model.getRewardRegistry().getMetrics()) {
+            if (metric.perEndpoint()) {
+                model.getEndpoints().forEach(endpoint -> rates.add(metric.rewardRateOf(endpoint)));
+            } else {
+                rates.add(metric.rewardRateOf(null));
+            }
+        }
+        return rates;
+    }
+
+    @Test
+    void doubleSumsStayWithinTheirBounds() {
+        ReplicaSetModel model = analyzed(7, RewardPrecision.DECIMAL);
+        MarkingStore store = model.getSteadyState();
+        int n = store.size();
+        double[] probabilities = new double[n];
+        for (int state = 0; state < n; state++) {
+            probabilities[state] = store.getProbability(state);
+        }
+        for (String rate : rewardRates(model)) {
+            double[] values = store.getRewardValues(rate);
+            BigDecimal reference = RewardPrecision.decimalSum(probabilities, values, n);
+            double absoluteSum = 0;
+            for (int state = 0; state < n; state++) {
+                absoluteSum += Math.abs(probabilities[state] * values[state]);
+            }
+            absoluteSum *= 1 + 2 * n * RewardPrecision.UNIT_ROUNDOFF;
+            double representation = 4 * RewardPrecision.UNIT_ROUNDOFF * absoluteSum;
+            for (RewardPrecision precision : new RewardPrecision[] { RewardPrecision.DOUBLE, RewardPrecision.KAHAN }) {
+                double value = store.expectation(rate, precision);
+                double error = BigDecimal.valueOf(value).subtract(reference).abs().doubleValue();
+                double bound = precision.errorBound(n, absoluteSum) + representation;
+                assertTrue(error <= bound, precision + " " + rate + ": error " + error + " above " + bound);
+            }
+            // DECIMAL returns the reference after its own check of both bounds
+            assertEquals(reference.doubleValue(), store.expectation(rate, RewardPrecision.DECIMAL), rate);
+        }
+    }
+
+    @Test
+    void precisionsGiveTheSameRewards() {
+        ReplicaSetModel decimal = analyzed(4, RewardPrecision.DECIMAL);
+        for (RewardPrecision precision : new RewardPrecision[] { RewardPrecision.DOUBLE, RewardPrecision.KAHAN }) {
+            ReplicaSetModel model = analyzed(4, precision);
+            for (Endpoint endpoint : model.getEndpoints()) {
+                double expected = decimal.getSteadyStateEndpointsReliabilities().get(endpoint).doubleValue();
+                double actual = model.getSteadyStateEndpointsReliabilities().get(endpoint).doubleValue();
+                assertEquals(expected, actual, 1e-14 * Math.abs(expected), precision + " " + endpoint.id());
+            }
+        }
+    }
+
+    @Test
+    void cancellationStaysWithinTheBounds() {
+        // the plain sum loses the small term entirely, the compensated one keeps it
+        double[] probabilities = { 1, 1, 1 };
+        double[] values = { 1, 1e-16, -1 };
+        assertEquals(0, RewardPrecision.plainSum(probabilities, values, 3));
+        assertEquals(1e-16, RewardPrecision.compensatedSum(probabilities, values, 3));
+        assertEquals(0, new BigDecimal("1E-16").compareTo(RewardPrecision.checkedDecimalSum(probabilities, values, 3)));
+    }
+}
@@ -0,0 +1,46 @@
+package it.unifi.dinfo.stlab;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.List;
+
+import org.junit.jupiter.api.Test;
+
+/**
+ * Events written by {@link Trace} to the file of {@code -Dsar.trace}, set by
+ * the surefire configuration; {@code scripts/tests/test_traces.py} reads the
+ * same file with {@code sar-results trace}.
+ */
+class TraceTest {
+
+    @Test
+    void writesNestedSpansAndCounters() throws IOException {
+        assertTrue(Trace.isEnabled(), "run with -Dsar.trace (mvn test sets it)");
+        Path path = Path.of(System.getProperty("sar.trace"));
+        long before = Files.exists(path) ? Files.readAllLines(path).size() : 0;
+        try (Trace.Span point = Trace.span("point", "configuration", "A", "replicas", 2)) {
+            try (Trace.Span inner = Trace.span("write", "note", "a \"quoted\" label")) {
+                Trace.counter("state_space", "tangible", 5, "bytes", 120L);
+            }
+        }
+        List<String> lines = Files.readAllLines(path);
+        List<String> events = lines.subList((int) before, lines.size());
+        assertEquals(3, events.size());
+        String header = "\\{\"name\":\"%s\",\"cat\":\"sar\",\"ph\":\"%s\",\"ts\":\\d+\\.\\d{3},"
+                + "\"pid\":\\d+,\"tid\":\\d+";
+        String labels = "{\"configuration\":\"A\",\"replicas\":2";
+        String counter = events.get(0);
+        assertTrue(counter.matches(String.format(header, "state_space", "C") + ",\"args\":.*"), counter);
+        assertTrue(counter.endsWith(",\"args\":{\"tangible\":5,\"bytes\":120},\"labels\":" + labels
+                + ",\"note\":\"a \\\"quoted\\\" label\"}}"), counter);
+        String inner = events.get(1);
+        assertTrue(inner.matches(String.format(header, "write", "X") + ",\"dur\":\\d+\\.\\d{3},\"args\":.*"), inner);
+        String outer = events.get(2);
+        assertTrue(outer.matches(String.format(header, "point", "X") + ",\"dur\":\\d+\\.\\d{3},\"args\":.*"), outer);
+        assertTrue(outer.endsWith(",\"args\":" + labels + "}}"), outer);
+    }
+}